@@ -0,0 +1,434 @@
+"""Benchmark suite for the loader, generator, interpreter, and evidence log.
+
+Usage:
+    python -m benchmarks.bench run --out results.json
+    python -m benchmarks.bench run --scale 0.01 --only load_profile --only interpret
+    python -m benchmarks.bench compare baseline.json results.json --tolerance 0.1
+
+``run`` generates the synthetic data sets it needs (see
+``benchmarks.synthetic``) under ``--data-dir``, reusing them on later runs,
+times each benchmark ``--repeat`` times, and writes the results as JSON.
+At ``--scale 1`` the data sets are a 1,000-endpoint profile, a 10,000-profile
+fleet, a 10M-row raw-samples file, k6 JSON output for 500k requests (4M
+lines), and a 5M-line evidence log; other scales shrink or grow every size
+proportionally.
+
+``compare`` matches benchmarks by name and exits non-zero if any best time
+is more than ``--tolerance`` slower than the baseline's.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+
+from benchmarks import synthetic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIR = os.path.join(REPO_ROOT, ".bench-data")
+
+# Data set sizes at --scale 1.
+FULL_SIZES = {
+    "profile_endpoints": 1_000,
+    "fleet_profiles": 10_000,
+    "metrics_files": 1_000,
+    "sample_rows": 10_000_000,
+    "k6_requests": 500_000,
+    "evidence_lines": 5_000_000,
+}
+
+DEFAULT_TOLERANCE = 0.10
+
+# (name, best seconds in baseline, best seconds now, current / baseline, verdict)
+Comparison = Tuple[str, Optional[float], Optional[float], Optional[float], str]
+
+
+class Datasets:
+    """Synthetic inputs at a given scale, generated on first use.
+
+    Files are named after their size, so data sets of different scales
+    coexist in ``data_dir`` and are never regenerated once complete.
+    """
+
+    def __init__(self, data_dir: str, scale: float = 1.0):
+        self.data_dir = data_dir
+        self.scale = scale
+        self.sizes = {name: max(1, int(n * scale)) for name, n in FULL_SIZES.items()}
+        os.makedirs(data_dir, exist_ok=True)
+
+    def profile(self) -> str:
+        n = self.sizes["profile_endpoints"]
+        return self._ensure(f"profile-{n}.yaml", lambda p: synthetic.write_profile(p, n))
+
+    def fleet(self) -> str:
+        n = self.sizes["fleet_profiles"]
+        return self._ensure(f"fleet-{n}", lambda p: synthetic.write_fleet(p, n))
+
+    def fleet_paths(self) -> List[str]:
+        fleet = self.fleet()
+        return sorted(os.path.join(fleet, name) for name in os.listdir(fleet))
+
+    def metrics(self) -> List[str]:
+        n = self.sizes["metrics_files"]
+        directory = self._ensure(f"metrics-{n}", lambda p: _write_metrics_dir(p, n))
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+    def samples(self) -> str:
+        n = self.sizes["sample_rows"]
+        return self._ensure(f"samples-{n}.csv", lambda p: synthetic.write_samples(p, n))
+
+    def k6_output(self) -> str:
+        n = self.sizes["k6_requests"]
+        return self._ensure(f"k6-{n}.json", lambda p: synthetic.write_k6_output(p, n))
+
+    def evidence(self) -> str:
+        n = self.sizes["evidence_lines"]
+        return self._ensure(f"evidence-{n}.jsonl", lambda p: synthetic.write_evidence_log(p, n))
+
+    def _ensure(self, name: str, write: Callable[[str], object]) -> str:
+        """Path of ``name`` in data_dir, written via a temporary name if missing."""
+        path = os.path.join(self.data_dir, name)
+        if not os.path.exists(path):
+            partial = path + ".partial"
+            if os.path.isdir(partial):
+                for leftover in os.listdir(partial):
+                    os.unlink(os.path.join(partial, leftover))
+                os.rmdir(partial)
+            elif os.path.exists(partial):
+                os.unlink(partial)
+            write(partial)
+            os.rename(partial, path)
+        return path
+
+
+# -- benchmarks ---------------------------------------------------------------
+#
+# Each factory prepares its inputs untimed and returns (thunk, items): the
+# thunk is what gets timed and ``items`` is how many units it processes.
+
+
+def _bench_load_profile(data: Datasets):
+    """Parse and validate the large profile (no parsed-profile cache)."""
+    from src.loader import load_profile
+
+    path = data.profile()
+    return (lambda: load_profile(path)), data.sizes["profile_endpoints"]
+
+
+def _bench_load_profile_fleet(data: Datasets):
+    """Parse and validate every fleet profile in turn."""
+    from src.loader import load_profile
+
+    paths = data.fleet_paths()
+    return (lambda: [load_profile(p) for p in paths]), len(paths)
+
+
+def _bench_generate_plan(data: Datasets):
+    """Generate a plan for every fleet profile."""
+    from src.generator import generate_plan
+    from src.loader import load_profile
+
+    profiles = [(load_profile(p), p) for p in data.fleet_paths()]
+    return (lambda: [generate_plan(profile, p) for profile, p in profiles]), len(profiles)
+
+
+def _bench_plan_to_json(data: Datasets):
+    """Serialize every fleet plan to JSON."""
+    from src.generator import generate_plan, plan_to_json
+    from src.loader import load_profile
+
+    plans = [generate_plan(load_profile(p), p) for p in data.fleet_paths()]
+    return (lambda: [plan_to_json(plan) for plan in plans]), len(plans)
+
+
+def _bench_load_metrics(data: Datasets):
+    """Load every metrics summary (half JSON, half CSV)."""
+    from src.interpreter import load_metrics
+
+    paths = data.metrics()
+    return (lambda: [load_metrics(p) for p in paths]), len(paths)
+
+
+def _bench_load_metrics_many(data: Datasets):
+    """Load every metrics summary concurrently with ``load_metrics_many``."""
+    from src.interpreter import load_metrics_many
+
+    paths = data.metrics()
+    return (lambda: load_metrics_many(paths)), len(paths)
+
+
+def _bench_load_raw_samples(data: Datasets):
+    """Stream the raw-samples CSV into a metrics summary."""
+    from src.samples import load_raw_samples
+
+    path = data.samples()
+    return (lambda: load_raw_samples(path)), data.sizes["sample_rows"]
+
+
+def _bench_load_k6(data: Datasets):
+    """Stream k6 JSON output (eight metric points per request) into a summary."""
+    from src.k6 import load_k6
+
+    path = data.k6_output()
+    return (lambda: load_k6(path)), data.sizes["k6_requests"]
+
+
+def _bench_merge_histograms(data: Datasets):
+    """Merge one latency histogram per load-generator node (one node per metrics file)."""
+    import numpy as np
+
+    from src.histogram import LatencyHistogram, merge_histograms
+
+    rng = np.random.default_rng(0)
+    nodes = []
+    for _ in range(data.sizes["metrics_files"]):
+        hist = LatencyHistogram()
+        hist.record(rng.lognormal(mean=5.0, sigma=0.6, size=2_000))
+        nodes.append(hist)
+    return (lambda: merge_histograms(nodes)), len(nodes)
+
+
+def _bench_interpret(data: Datasets):
+    """Interpret the metrics summaries against every fleet profile's SLO."""
+    from src.interpreter import interpret, load_metrics
+    from src.loader import load_profile
+
+    metrics = [load_metrics(p)[0] for p in data.metrics()]
+    slos = [load_profile(p).slo for p in data.fleet_paths()]
+    pairs = [(metrics[i % len(metrics)], slo) for i, slo in enumerate(slos)]
+    return (lambda: [interpret(m, slo) for m, slo in pairs]), len(pairs)
+
+
+def _bench_interpret_batch(data: Datasets):
+    """Re-score the metrics summaries (tiled to the fleet size) against one SLO."""
+    from src.interpreter import load_metrics
+    from src.loader import load_profile
+    from src.metrics_batch import MetricsBatch, interpret_batch
+
+    metrics = [load_metrics(p)[0] for p in data.metrics()]
+    count = len(data.fleet_paths())
+    batch = MetricsBatch.from_summaries(metrics[i % len(metrics)] for i in range(count))
+    slo = load_profile(data.profile()).slo
+    return (lambda: interpret_batch(batch, slo)), count
+
+
+def _bench_read_events(data: Datasets):
+    """Read the whole evidence log."""
+    from src.evidence import read_events
+
+    path = data.evidence()
+    return (lambda: read_events(path)), data.sizes["evidence_lines"]
+
+
+def _bench_query_events(data: Datasets):
+    """Query one service's events through the (pre-built) index."""
+    from src.evidence import query_events, sync_index
+
+    path = data.evidence()
+    sync_index(path)
+    return (lambda: query_events(path, service="svc-00007")), data.sizes["evidence_lines"]
+
+
+BENCHMARKS: Dict[str, Callable[[Datasets], Tuple[Callable[[], object], int]]] = {
+    "load_profile": _bench_load_profile,
+    "load_profile_fleet": _bench_load_profile_fleet,
+    "generate_plan": _bench_generate_plan,
+    "plan_to_json": _bench_plan_to_json,
+    "load_metrics": _bench_load_metrics,
+    "load_metrics_many": _bench_load_metrics_many,
+    "load_raw_samples": _bench_load_raw_samples,
+    "load_k6": _bench_load_k6,
+    "merge_histograms": _bench_merge_histograms,
+    "interpret": _bench_interpret,
+    "interpret_batch": _bench_interpret_batch,
+    "read_events": _bench_read_events,
+    "query_events": _bench_query_events,
+}
+
+
+def run_suite(
+    data: Datasets,
+    names: Optional[List[str]] = None,
+    repeat: int = 3,
+    progress: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """Run benchmarks and return a JSON-serializable results document.
+
+    Args:
+        data: Data sets to run against.
+        names: Benchmarks to run, in BENCHMARKS order; ``None`` runs all.
+        repeat: Timed runs per benchmark; the best is the headline figure.
+        progress: Called with each benchmark's name and result as it finishes.
+
+    Returns:
+        ``{"meta": {...}, "benchmarks": {name: {"best_s", "median_s",
+        "runs_s", "items", "items_per_s"}}}``.
+    """
+    selected = [n for n in BENCHMARKS if names is None or n in names]
+    results = {}
+    for name in selected:
+        thunk, items = BENCHMARKS[name](data)
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            thunk()
+            runs.append(time.perf_counter() - start)
+        best = min(runs)
+        results[name] = {
+            "best_s": best,
+            "median_s": sorted(runs)[len(runs) // 2],
+            "runs_s": runs,
+            "items": items,
+            "items_per_s": items / best if best > 0 else None,
+        }
+        if progress is not None:
+            progress(name, results[name])
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": data.scale,
+            "sizes": data.sizes,
+            "repeat": repeat,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Comparison]:
+    """Compare two results documents benchmark by benchmark.
+
+    A benchmark is ``"regressed"`` if its best time grew by more than
+    ``tolerance`` (a fraction), ``"improved"`` if it shrank by more than
+    that, ``"new"`` or ``"missing"`` if only one side ran it, else ``"ok"``.
+    """
+    base, cur = baseline["benchmarks"], current["benchmarks"]
+    rows = []
+    for name in list(base) + [n for n in cur if n not in base]:
+        before = base[name]["best_s"] if name in base else None
+        after = cur[name]["best_s"] if name in cur else None
+        if before is None or after is None:
+            rows.append((name, before, after, None, "missing" if after is None else "new"))
+            continue
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            verdict = "regressed"
+        elif ratio < 1 - tolerance:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append((name, before, after, ratio, verdict))
+    return rows
+
+
+# -- internal helpers ---------------------------------------------------------
+
+
+def _write_metrics_dir(directory: str, count: int) -> str:
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        ext = ".json" if i % 2 == 0 else ".csv"
+        synthetic.write_metrics_summary(os.path.join(directory, f"metrics-{i:05d}{ext}"), seed=i)
+    return directory
+
+
+def _fmt_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+# -- command line -------------------------------------------------------------
+
+
+@click.group()
+def bench():
+    """Run the benchmark suite and compare results."""
+
+
+@bench.command("run")
+@click.option(
+    "--scale",
+    default=1.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Multiplier on every data set size.",
+)
+@click.option("--repeat", default=3, show_default=True, type=click.IntRange(min=1), help="Timed runs per benchmark.")
+@click.option(
+    "--only",
+    multiple=True,
+    type=click.Choice(list(BENCHMARKS)),
+    help="Run only this benchmark (repeatable).",
+)
+@click.option(
+    "--data-dir",
+    default=DEFAULT_DATA_DIR,
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Where generated data sets are kept between runs.",
+)
+@click.option("--out", default=None, type=click.Path(dir_okay=False), help="Write results JSON here.")
+def run_cmd(scale, repeat, only, data_dir, out):
+    """Time the suite and report results."""
+    data = Datasets(data_dir, scale)
+
+    def progress(name, result):
+        click.echo(
+            f"{name:20s} {_fmt_seconds(result['best_s']):>12s}  "
+            f"({result['items']} items, {result['items_per_s']:,.0f}/s)",
+            err=True,
+        )
+
+    results = run_suite(data, names=list(only) or None, repeat=repeat, progress=progress)
+    if out:
+        with open(out, "w") as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"Results written to {out}", err=True)
+    else:
+        click.echo(json.dumps(results, indent=2))
+
+
+@bench.command("compare")
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--tolerance",
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Allowed slowdown as a fraction of the baseline time.",
+)
+def compare_cmd(baseline, current, tolerance):
+    """Flag benchmarks in CURRENT that regressed against BASELINE."""
+    with open(baseline) as f:
+        base = json.load(f)
+    with open(current) as f:
+        cur = json.load(f)
+    if base["meta"].get("sizes") != cur["meta"].get("sizes"):
+        click.echo("Warning: baseline and current runs used different data set sizes", err=True)
+
+    rows = compare(base, cur, tolerance)
+    click.echo(f"{'benchmark':20s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for name, before, after, ratio, verdict in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "-"
+        flag = "" if verdict == "ok" else f"  {verdict.upper()}"
+        click.echo(
+            f"{name:20s} {_fmt_seconds(before):>12s} {_fmt_seconds(after):>12s} {change:>8s}{flag}"
+        )
+    regressed = [row[0] for row in rows if row[4] == "regressed"]
+    if regressed:
+        click.echo(f"{len(regressed)} regression(s) over {tolerance:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,92 @@
+"""Measure CLI startup cost with ``python -X importtime``.
+
+Usage:
+    python -m benchmarks.bench_import_time --repeat 5
+
+Imports ``src.cli`` in fresh interpreters, reports the best cumulative
+import time and the heaviest imports, and exits non-zero if startup is over
+budget or a module that commands should load lazily was imported eagerly.
+The test suite enforces the same budget.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import click
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time of src.cli. Importing click is most of it; before
+# imports were made lazy the CLI took roughly five times as long.
+IMPORT_BUDGET_MS = float(os.environ.get("PERF_ASSISTANT_IMPORT_BUDGET_MS", 150))
+
+# Modules only the commands that need them may import.
+DEFERRED_MODULES = (
+    "asyncio",
+    "yaml",
+    "numpy",
+    "sqlite3",
+    "csv",
+    "src.batch",
+    "src.cache",
+    "src.evidence",
+    "src.evidence_store",
+    "src.exporters",
+    "src.generator",
+    "src.interpreter",
+    "src.k6",
+    "src.loader",
+    "src.profiling",
+    "src.server",
+)
+
+
+def measure_imports(statement: str = "import src.cli") -> Dict[str, int]:
+    """Run ``statement`` under ``-X importtime`` in a fresh interpreter.
+
+    Returns:
+        Cumulative import time in microseconds for every module imported.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_startup_ms(repeat: int, module: str = "src.cli") -> float:
+    """Best cumulative import time of ``module`` over ``repeat`` runs, in ms."""
+    return min(measure_imports(f"import {module}")[module] for _ in range(repeat)) / 1000
+
+
+@click.command()
+@click.option("--repeat", default=5, show_default=True, help="Fresh interpreters to time.")
+@click.option("--top", default=10, show_default=True, help="Heaviest imports to list.")
+def main(repeat, top):
+    times = measure_imports()
+    best = best_startup_ms(repeat)
+    click.echo(f"import src.cli: {best:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    heaviest = sorted((kv for kv in times.items() if kv[0] != "src.cli"), key=lambda kv: -kv[1])
+    for name, us in heaviest[:top]:
+        click.echo(f"  {us / 1000:8.1f} ms  {name}")
+
+    eager = [m for m in DEFERRED_MODULES if m in times]
+    if eager:
+        click.echo(f"imported eagerly: {', '.join(eager)}")
+    if eager or best > IMPORT_BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
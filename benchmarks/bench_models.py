@@ -0,0 +1,69 @@
+"""Measure memory per model instance, slotted versus plain dataclasses.
+
+Usage:
+    python -m benchmarks.bench_models --count 100000
+
+For each model, builds ``--count`` instances of the slotted class from
+``src.models`` and of an otherwise identical ``@dataclass`` without slots
+(the layout before models were slotted), and reports the bytes per
+instance that tracemalloc attributes to them. Field values are shared
+between the two runs, so only the instance layout differs.
+"""
+
+import dataclasses
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import click
+
+from src.models import Check, EvidenceEvent, MetricsSummary, Stage
+
+
+def unslotted(cls: type) -> type:
+    """A plain ``@dataclass`` with the same fields as ``cls`` (instances get a ``__dict__``)."""
+    fields = [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def _sample_args() -> Dict[type, Callable[[int], Tuple[tuple, dict]]]:
+    scenarios = ["steady", "burst", "soak"]
+    return {
+        Stage: lambda i: (("hold", 300), {"target_rps": 120}),
+        Check: lambda i: (("latency_p95", "<=", 400.0), {"description": "p95 within SLO"}),
+        EvidenceEvent: lambda i: (
+            ("2026-01-01T00:00:00+00:00", "checkout", "profiles/checkout.yaml"),
+            {"scenarios": scenarios},
+        ),
+        MetricsSummary: lambda i: ((), {"p50_ms": 120.0, "p95_ms": 340.0, "error_rate": 0.002}),
+    }
+
+
+def bytes_per_instance(cls: type, make_args: Callable[[int], Tuple[tuple, dict]], count: int) -> float:
+    """Bytes allocated per instance while building ``count`` of ``cls``."""
+    args = [make_args(i) for i in range(count)]
+    instances: List[object] = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances.extend(cls(*a, **kw) for a, kw in args)
+        # The list holding the instances is counted too; subtract its pointers.
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count - 8
+
+
+@click.command()
+@click.option("--count", default=100_000, show_default=True, help="Instances per model.")
+def main(count):
+    click.echo(f"{'model':16s} {'dict':>10s} {'slotted':>10s}  saved")
+    for cls, make_args in _sample_args().items():
+        plain = bytes_per_instance(unslotted(cls), make_args, count)
+        slotted = bytes_per_instance(cls, make_args, count)
+        click.echo(
+            f"{cls.__name__:16s} {plain:8.0f} B {slotted:8.0f} B  {1 - slotted / plain:5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
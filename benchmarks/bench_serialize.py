@@ -0,0 +1,135 @@
+"""Compare plan serialization paths on a synthetic plan with many stages.
+
+Usage:
+    python -m benchmarks.bench_serialize --stages 2000 --checks 2000 --repeat 5
+
+Times ``json.dumps(dataclasses.asdict(plan), indent=2)`` (the original
+``plan_to_json``) against ``src.serialize`` with the stdlib encoder and,
+when installed, orjson, in indented, compact, and streaming-to-file modes.
+Peak memory is measured separately under tracemalloc, which slows the code
+it traces, so it does not distort the timings.
+"""
+
+import dataclasses
+import json
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import click
+
+from benchmarks.synthetic import make_profile
+from src import serialize
+from src.generator import generate_plan
+from src.loader import build_profile
+from src.models import Check, Stage
+
+
+def make_plan(stages: int, checks: int):
+    """The generated plan of a synthetic profile, padded to the given sizes per scenario."""
+    plan = generate_plan(build_profile(make_profile(20)), "profiles/bench-svc.yaml")
+    scenarios = [
+        dataclasses.replace(
+            scenario,
+            stages=[
+                Stage(name=f"step-{i}", duration_seconds=30, target_rps=10 * i)
+                for i in range(stages)
+            ],
+            checks=[
+                Check(
+                    metric=f"latency_p{i % 100}",
+                    operator="<=",
+                    threshold=100.0 + i / 3,
+                    description=f"step {i} latency within budget",
+                )
+                for i in range(checks)
+            ],
+        )
+        for scenario in plan.scenarios
+    ]
+    return dataclasses.replace(plan, scenarios=scenarios)
+
+
+def _to_file(write: Callable) -> Callable[[], None]:
+    def run():
+        with tempfile.TemporaryFile("w") as f:
+            write(f)
+    return run
+
+
+def candidates(plan) -> Dict[str, Callable[[], object]]:
+    """Serialization paths to compare, keyed by label."""
+    paths = {
+        "asdict + json.dumps(indent=2)": lambda: json.dumps(dataclasses.asdict(plan), indent=2),
+        "asdict + json.dump to file": _to_file(
+            lambda f: json.dump(dataclasses.asdict(plan), f, indent=2)
+        ),
+    }
+    for backend in ("stdlib", "orjson"):
+        module, name = serialize._select_backend(backend)
+        if name != backend:
+            continue
+
+        def use(fn, module=module):
+            def run():
+                saved = serialize._orjson
+                serialize._orjson = module
+                try:
+                    return fn()
+                finally:
+                    serialize._orjson = saved
+            return run
+
+        paths[f"{backend}: dumps(indent=2)"] = use(lambda: serialize.dumps(plan))
+        paths[f"{backend}: dumps(compact)"] = use(lambda: serialize.dumps(plan, indent=None))
+        paths[f"{backend}: dump to file"] = use(_to_file(lambda f: serialize.dump(plan, f)))
+    return paths
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated while ``fn`` runs (its result included)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@click.command()
+@click.option("--stages", default=2000, show_default=True, help="Stages per scenario.")
+@click.option("--checks", default=2000, show_default=True, help="Checks per scenario.")
+@click.option("--repeat", default=5, show_default=True, help="Timed runs per path.")
+def main(stages, checks, repeat):
+    plan = make_plan(stages, checks)
+    size = len(json.dumps(dataclasses.asdict(plan), indent=2))
+    click.echo(
+        f"plan: {len(plan.scenarios)} scenarios x {stages} stages + {checks} checks, "
+        f"{size / 2**20:.1f} MiB indented JSON"
+    )
+    if serialize._select_backend("orjson")[1] != "orjson":
+        click.echo("orjson not installed; only the stdlib encoder was measured.")
+
+    baseline = None
+    for label, fn in candidates(plan).items():
+        seconds = best_time(fn, repeat)
+        peak = peak_memory(fn)
+        baseline = baseline or seconds
+        click.echo(
+            f"{label:32s} {seconds * 1000:9.1f} ms  {baseline / seconds:5.1f}x  "
+            f"peak {peak / 2**20:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare YAML parsing backends on large synthetic profiles.
+
+Usage:
+    python -m benchmarks.bench_yaml_loader --endpoints 500 --repeat 20
+"""
+
+import time
+
+import click
+import yaml
+
+from benchmarks.synthetic import make_profile_yaml
+from src.loader import build_profile
+
+
+def time_backend(loader, content: bytes, repeat: int) -> float:
+    """Return the best wall time (seconds) to parse and validate `content`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_profile(yaml.load(content, Loader=loader))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option("--endpoints", default=500, show_default=True, help="Endpoints per profile.")
+@click.option("--repeat", default=10, show_default=True, help="Timed runs per backend.")
+def main(endpoints, repeat):
+    content = make_profile_yaml(endpoints).encode()
+    backends = [("python", yaml.SafeLoader)]
+    if getattr(yaml, "CSafeLoader", None) is not None:
+        backends.append(("libyaml", yaml.CSafeLoader))
+    else:
+        click.echo("libyaml not available; only the pure-Python loader was measured.")
+
+    click.echo(f"profile: {endpoints} endpoints, {len(content) / 1024:.0f} KiB")
+    results = {name: time_backend(loader, content, repeat) for name, loader in backends}
+    for name, seconds in results.items():
+        click.echo(f"{name:>8}: {seconds * 1000:8.2f} ms")
+    if "libyaml" in results:
+        click.echo(f" speedup: {results['python'] / results['libyaml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Synthetic data sets for the benchmark suite.
+
+Every generator is deterministic for a given size and seed and writes in
+bounded-size chunks, so the largest data sets (millions of sample rows or
+evidence lines) never have to fit in memory.
+"""
+
+import json
+import os
+
+import numpy as np
+import yaml
+
+_CHUNK_ROWS = 500_000
+_OUTCOMES = ("plan-generated", "plan-and-interpretation-generated", "issues-detected")
+
+# One event as src.evidence writes it (json.dumps of event_to_dict).
+_EVIDENCE_LINE = (
+    '{{"ts": "{ts}Z", "service": "svc-{svc:05d}", "profile": "profiles/svc-{svc:05d}.yaml", '
+    '"scenarios": ["steady", "burst", "soak"], "interpretation": {interpretation}, '
+    '"outcome": "{outcome}"}}\n'
+)
+
+
+# The lines k6 --out json writes for one request and its iteration.
+_K6_TAGS = (
+    '"tags":{{"expected_response":"true","group":"","method":"GET","name":"{url}",'
+    '"proto":"HTTP/1.1","scenario":"default","status":"{status}","url":"{url}"}}'
+)
+_K6_POINT = '{{"type":"Point","data":{{"time":"{ts}","value":{value},' + _K6_TAGS + '}},"metric":"{metric}"}}\n'
+_K6_HEADER = "".join(
+    '{{"type":"Metric","data":{{"name":"{0}","type":"{1}","contains":"{2}","thresholds":[],'
+    '"submetrics":null}},"metric":"{0}"}}\n'.format(*m)
+    for m in (
+        ("http_reqs", "counter", "default"),
+        ("http_req_duration", "trend", "time"),
+        ("http_req_blocked", "trend", "time"),
+        ("http_req_waiting", "trend", "time"),
+        ("http_req_failed", "rate", "default"),
+        ("data_received", "counter", "data"),
+        ("iterations", "counter", "default"),
+        ("iteration_duration", "trend", "time"),
+    )
+)
+
+
+def make_profile(endpoints: int, service: str = "bench-svc", seed: int = 0) -> dict:
+    """A valid service profile mapping with ``endpoints`` endpoint entries."""
+    rng = np.random.default_rng(seed)
+    baseline = int(rng.integers(20, 500))
+    return {
+        "service": service,
+        "summary": "Synthetic profile for benchmarks.",
+        "traffic": {
+            "baseline_rps": baseline,
+            "peak_rps": baseline * 4,
+            "burst_factor": 3,
+        },
+        "slo": {
+            "latency_ms": {"p95": 400, "p99": 800},
+            "error_rate": 0.01,
+        },
+        "endpoints": [
+            {
+                "path": f"/api/v1/resource-{i}",
+                "method": ("GET", "POST", "PUT", "DELETE")[i % 4],
+                "critical": i % 10 == 0,
+            }
+            for i in range(endpoints)
+        ],
+        "dependencies": [f"dep-{i}" for i in range(20)],
+        "data": {"uses_production_data": False, "notes": "synthetic"},
+    }
+
+
+def make_profile_yaml(endpoints: int, service: str = "bench-svc", seed: int = 0) -> str:
+    """``make_profile`` rendered as YAML."""
+    return yaml.safe_dump(make_profile(endpoints, service, seed), sort_keys=False)
+
+
+def write_profile(path: str, endpoints: int, service: str = "bench-svc", seed: int = 0) -> str:
+    """Write a YAML profile with ``endpoints`` endpoints to ``path``."""
+    with open(path, "w") as f:
+        f.write(make_profile_yaml(endpoints, service, seed))
+    return path
+
+
+def write_fleet(directory: str, profiles: int, endpoints: int = 8) -> str:
+    """Write ``profiles`` small YAML profiles (``svc-00000.yaml``, ...) into ``directory``."""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(profiles):
+        service = f"svc-{i:05d}"
+        write_profile(os.path.join(directory, f"{service}.yaml"), endpoints, service, seed=i)
+    return directory
+
+
+def write_metrics_summary(path: str, seed: int = 0) -> str:
+    """Write a complete metrics summary (JSON or CSV, by extension)."""
+    rng = np.random.default_rng(seed)
+    p50 = float(rng.uniform(80, 200))
+    summary = {
+        "p50_ms": round(p50, 1),
+        "p90_ms": round(p50 * 2.2, 1),
+        "p95_ms": round(p50 * 2.8, 1),
+        "p99_ms": round(p50 * 4.5, 1),
+        "error_rate": round(float(rng.uniform(0, 0.02)), 4),
+        "throughput_rps": round(float(rng.uniform(50, 500)), 1),
+        "cpu_percent": round(float(rng.uniform(30, 90)), 1),
+        "memory_percent": round(float(rng.uniform(30, 90)), 1),
+        "gc_pause_ms": round(float(rng.uniform(5, 150)), 1),
+    }
+    with open(path, "w") as f:
+        if path.endswith(".csv"):
+            f.write(",".join(summary) + "\n")
+            f.write(",".join(str(v) for v in summary.values()) + "\n")
+        else:
+            json.dump(summary, f, indent=2)
+    return path
+
+
+def write_samples(path: str, rows: int, seed: int = 0) -> str:
+    """Write a raw-samples CSV (``ts,latency_ms,error``) with ``rows`` requests.
+
+    Latencies are log-normal around 120 ms, about 0.5% of requests fail, and
+    timestamps advance at roughly 2000 requests per second.
+    """
+    rng = np.random.default_rng(seed)
+    ts0 = 1_700_000_000.0
+    with open(path, "w") as f:
+        f.write("ts,latency_ms,error\n")
+        for start in range(0, rows, _CHUNK_ROWS):
+            n = min(_CHUNK_ROWS, rows - start)
+            block = np.empty((n, 3))
+            block[:, 0] = ts0 + (start + np.arange(n)) / 2000.0
+            block[:, 1] = rng.lognormal(np.log(120), 0.5, n)
+            block[:, 2] = rng.random(n) < 0.005
+            np.savetxt(f, block, fmt=("%.4f", "%.2f", "%d"), delimiter=",")
+    return path
+
+
+def write_evidence_log(path: str, lines: int, services: int = 200, seed: int = 0) -> str:
+    """Write an evidence log of ``lines`` events, one per minute, across ``services``."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01T00:00:00")
+    with open(path, "w") as f:
+        for offset in range(0, lines, _CHUNK_ROWS):
+            n = min(_CHUNK_ROWS, lines - offset)
+            stamps = np.datetime_as_string(
+                start + np.arange(offset, offset + n).astype("timedelta64[m]"), unit="s"
+            )
+            picks = rng.integers(0, services, n)
+            outcomes = rng.integers(0, len(_OUTCOMES), n)
+            f.write("".join(
+                _EVIDENCE_LINE.format(
+                    ts=ts, svc=svc, interpretation="true" if outcome else "false",
+                    outcome=_OUTCOMES[outcome],
+                )
+                for ts, svc, outcome in zip(stamps, picks.tolist(), outcomes.tolist())
+            ))
+    return path
+
+
+def write_k6_output(path: str, requests: int, rps: int = 500, seed: int = 0) -> str:
+    """Write k6 ``--out json`` output for ``requests`` requests at ``rps`` per second.
+
+    Each request produces eight Point lines, as a one-request iteration
+    does in k6; about 1% of requests fail.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01T00:00:00", "ns")
+    with open(path, "w") as f:
+        f.write(_K6_HEADER)
+        for offset in range(0, requests, _CHUNK_ROWS // 8):
+            n = min(_CHUNK_ROWS // 8, requests - offset)
+            nanos = ((offset + np.arange(n)) * (1e9 / rps)).astype("timedelta64[ns]")
+            stamps = np.datetime_as_string(start + nanos, unit="ns")
+            latency = rng.lognormal(np.log(120), 0.5, n)
+            failed = rng.random(n) < 0.01
+            lines = []
+            for ts, ms, fail, i in zip(stamps, latency.tolist(), failed.tolist(), range(offset, offset + n)):
+                common = {"ts": ts + "Z", "url": f"https://svc.test/api/{i % 20}",
+                          "status": 500 if fail else 200}
+                for metric, value in (
+                    ("http_reqs", 1),
+                    ("http_req_duration", f"{ms:.6f}"),
+                    ("http_req_blocked", "0.004"),
+                    ("http_req_waiting", f"{ms * 0.9:.6f}"),
+                    ("http_req_failed", int(fail)),
+                    ("data_received", 1320),
+                    ("iterations", 1),
+                    ("iteration_duration", f"{ms + 1:.6f}"),
+                ):
+                    lines.append(_K6_POINT.format(metric=metric, value=value, **common))
+            f.write("".join(lines))
+    return path
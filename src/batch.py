@@ -0,0 +1,222 @@
+"""Generate plans for many service profiles in parallel."""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.cache import ProfileCache
+from src.exporters import export_filename, export_plan
+from src.generator import generate_plan, write_plan_json
+from src.loader import ProfileValidationError, load_profile, load_profiles_stream
+from src.models import BatchFailure, BatchItem, BatchReport
+
+PROFILE_EXTENSIONS = (".yaml", ".yml", ".json")
+
+
+def discover_profiles(source: str) -> List[str]:
+    """Resolve a directory or glob pattern to a sorted list of profile paths.
+
+    Args:
+        source: A directory (searched non-recursively for YAML/JSON files)
+            or a glob pattern such as ``profiles/**/*.yaml``.
+
+    Returns:
+        Sorted list of matching file paths.
+    """
+    if os.path.isdir(source):
+        candidates = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        candidates = glob.glob(source, recursive=True)
+    return sorted(
+        p for p in candidates
+        if os.path.isfile(p) and os.path.splitext(p)[1].lower() in PROFILE_EXTENSIONS
+    )
+
+
+def plan_batch(
+    profile_paths: Iterable[str],
+    out_dir: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+    cache_dir: Optional[str] = None,
+    exports: Sequence[str] = (),
+    compact: bool = False,
+) -> BatchReport:
+    """Load, plan, and write one plan per profile using a process pool.
+
+    A profile that cannot be loaded or planned, for any reason, is recorded
+    as a failure and does not stop the batch. So is a profile whose service
+    name (and hence plan file) is already taken by an earlier profile; the
+    earlier profile's plan is kept.
+
+    Args:
+        profile_paths: Profile files to process.
+        out_dir: Directory that receives ``<service>.json`` plans.
+        workers: Number of worker processes. ``None`` uses the CPU count;
+            ``1`` runs in the current process without a pool.
+        chunk_size: Number of profiles handed to a worker per task.
+        cache_dir: Parsed-profile cache directory shared by the workers, or
+            ``None`` to parse every profile.
+        exports: Exporter names (e.g. ``"k6"``); each plan is also written
+            as ``<service><extension>`` for every listed tool.
+        compact: Write plans without indentation.
+
+    Returns:
+        A BatchReport listing written plans, failures, and elapsed time.
+    """
+    paths = list(profile_paths)
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(p, out_dir, cache_dir, tuple(exports), compact) for p in paths]
+
+    start = time.perf_counter()
+    if workers == 1 or len(paths) <= 1:
+        results = [_plan_one(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_plan_one, jobs, chunksize=max(1, chunk_size)))
+
+    report = BatchReport()
+    owners: Dict[str, Tuple[BatchItem, tuple]] = {}
+    overwritten = []
+    for job, result in zip(jobs, results):
+        if isinstance(result, BatchFailure):
+            report.failures.append(result)
+            continue
+        owner = owners.get(result.plan_path)
+        if owner is not None:
+            report.failures.append(BatchFailure(
+                profile=result.profile,
+                error=f"service {result.service!r} is already planned from {owner[0].profile}",
+            ))
+            overwritten.append(owner[1])
+            continue
+        owners[result.plan_path] = (result, job)
+        report.planned.append(result)
+    # A clashing profile may have written its plan after the owner's.
+    for job in dict.fromkeys(overwritten):
+        _plan_one(job)
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
+
+
+def _plan_one(
+    job: Tuple[str, str, Optional[str], Tuple[str, ...], bool]
+) -> Union[BatchItem, BatchFailure]:
+    """Worker: load, plan, and write a single profile."""
+    path, out_dir, cache_dir, exports, compact = job
+    cache = _worker_cache(cache_dir)
+    try:
+        profile = load_profile(path, cache=cache)
+        plan = generate_plan(profile, path)
+        plan_path = os.path.join(out_dir, _plan_filename(profile.service))
+        _write_plan(plan, plan_path, compact)
+        _write_exports(plan, profile, out_dir, exports)
+    except (ProfileValidationError, OSError) as exc:
+        return BatchFailure(profile=path, error=str(exc))
+    except Exception as exc:  # one bad profile must not take down the pool
+        return BatchFailure(profile=path, error=f"{type(exc).__name__}: {exc}")
+    return BatchItem(
+        profile=path,
+        service=profile.service,
+        plan_path=plan_path,
+        scenarios=[s.name for s in plan.scenarios],
+    )
+
+
+def plan_bundle(
+    bundle_path: str, out_dir: str, exports: Sequence[str] = (), compact: bool = False
+) -> BatchReport:
+    """Plan every document of a multi-document YAML bundle in constant memory.
+
+    Documents are streamed and planned one at a time in the current process.
+    Invalid documents are reported as failures named ``<bundle>#<index>``;
+    documents that fail to plan, or repeat an earlier document's service,
+    as ``<bundle>[<service>]``.
+
+    Args:
+        bundle_path: Path to a YAML file with one profile per ``---`` document.
+        out_dir: Directory that receives ``<service>.json`` plans.
+        exports: Exporter names to write alongside each plan.
+        compact: Write plans without indentation.
+
+    Returns:
+        A BatchReport listing written plans, failures, and elapsed time.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    report = BatchReport()
+    errors: List[ProfileValidationError] = []
+    start = time.perf_counter()
+    owners: Dict[str, str] = {}
+    try:
+        for profile in load_profiles_stream(bundle_path, errors=errors):
+            name = f"{bundle_path}[{profile.service}]"
+            plan_path = os.path.join(out_dir, _plan_filename(profile.service))
+            if plan_path in owners:
+                report.failures.append(BatchFailure(
+                    profile=name,
+                    error=f"service {profile.service!r} is already planned from {owners[plan_path]}",
+                ))
+                continue
+            try:
+                plan = generate_plan(profile, bundle_path)
+                _write_plan(plan, plan_path, compact)
+                _write_exports(plan, profile, out_dir, exports)
+            except OSError:
+                raise
+            except Exception as exc:
+                report.failures.append(
+                    BatchFailure(profile=name, error=f"{type(exc).__name__}: {exc}")
+                )
+                continue
+            owners[plan_path] = name
+            report.planned.append(BatchItem(
+                profile=bundle_path,
+                service=profile.service,
+                plan_path=plan_path,
+                scenarios=[s.name for s in plan.scenarios],
+            ))
+    except (ProfileValidationError, OSError) as exc:
+        errors.append(exc)
+    report.elapsed_seconds = time.perf_counter() - start
+
+    for err in errors:
+        index = getattr(err, "document_index", None)
+        name = bundle_path if index is None else f"{bundle_path}#{index}"
+        report.failures.append(BatchFailure(profile=name, error=str(err)))
+    return report
+
+
+_worker_caches = {}
+
+
+def _worker_cache(cache_dir: Optional[str]) -> Optional[ProfileCache]:
+    """Reuse one ProfileCache per directory within each worker process."""
+    if cache_dir is None:
+        return None
+    cache = _worker_caches.get(cache_dir)
+    if cache is None:
+        cache = _worker_caches[cache_dir] = ProfileCache(cache_dir)
+    return cache
+
+
+def _write_plan(plan, plan_path: str, compact: bool) -> None:
+    with open(plan_path, "w") as f:
+        write_plan_json(plan, f, indent=None if compact else 2)
+        f.write("\n")
+
+
+def _write_exports(plan, profile, out_dir: str, exports: Sequence[str]) -> None:
+    for fmt in exports:
+        script = export_plan(plan, fmt, profile.endpoints)
+        with open(os.path.join(out_dir, export_filename(_safe_name(profile.service), fmt)), "w") as f:
+            f.write(script)
+
+
+def _safe_name(service: str) -> str:
+    return service.replace(os.sep, "_").replace("/", "_") or "unnamed"
+
+
+def _plan_filename(service: str) -> str:
+    return f"{_safe_name(service)}.json"
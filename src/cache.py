@@ -0,0 +1,171 @@
+"""On-disk cache of validated service profiles, keyed by content hash."""
+
+import hashlib
+import marshal
+import os
+import tempfile
+from typing import Optional
+
+from src.models import (
+    DataConstraints,
+    Endpoint,
+    SLO,
+    ServiceProfile,
+    TrafficShape,
+)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_DIR_ENV = "PERF_ASSISTANT_CACHE_DIR"
+
+# Eviction scans the cache directory, so only run it every N writes.
+_EVICT_EVERY = 64
+
+
+def default_cache_dir() -> str:
+    """Return the cache directory, honouring ``PERF_ASSISTANT_CACHE_DIR``."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "perf-assistant", "profiles")
+
+
+class ProfileCache:
+    """Size-bounded LRU cache of parsed profiles stored as marshal blobs.
+
+    Entries are named by the SHA-256 of the loader version, file extension,
+    and raw file bytes, so an edited profile or a loader upgrade never hits
+    a stale entry. Recency is tracked through file mtimes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._writes = 0
+
+    def key(self, content: bytes, ext: str, version: str) -> str:
+        h = hashlib.sha256()
+        h.update(version.encode())
+        h.update(b"\0")
+        h.update(ext.encode())
+        h.update(b"\0")
+        h.update(content)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[ServiceProfile]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        try:
+            profile = _decode(marshal.loads(blob))
+        except (ValueError, EOFError, TypeError, IndexError):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return profile
+
+    def put(self, key: str, profile: ServiceProfile) -> None:
+        try:
+            blob = marshal.dumps(_encode(profile))
+        except ValueError:
+            return  # profile holds values marshal cannot encode
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._entry_path(key))
+        except OSError:
+            return  # caching is best-effort
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+        self._writes += 1
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until under ``max_bytes``."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".bin"):
+                        continue
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return 0
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Delete every cache entry. Returns the number of entries removed."""
+        removed = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith((".bin", ".tmp")) and self._remove(entry.path):
+                        removed += 1
+        except OSError:
+            pass
+        return removed
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".bin")
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+# -- compact encoding ---------------------------------------------------------
+#
+# Profiles are flattened to tuples of builtins so the cache never unpickles
+# arbitrary objects.
+
+
+def _encode(p: ServiceProfile) -> tuple:
+    data = None
+    if p.data is not None:
+        data = (p.data.uses_production_data, p.data.notes)
+    return (
+        p.service,
+        p.summary,
+        (p.traffic.baseline_rps, p.traffic.peak_rps, p.traffic.burst_factor),
+        (dict(p.slo.latency_ms), p.slo.error_rate),
+        [(e.path, e.method, e.critical, e.weight) for e in p.endpoints],
+        list(p.dependencies),
+        data,
+    )
+
+
+def _decode(raw: tuple) -> ServiceProfile:
+    service, summary, traffic, slo, endpoints, dependencies, data = raw
+    return ServiceProfile(
+        service=service,
+        summary=summary,
+        traffic=TrafficShape(*traffic),
+        slo=SLO(*slo),
+        endpoints=[Endpoint(*e) for e in endpoints],
+        dependencies=dependencies,
+        data=DataConstraints(*data) if data is not None else None,
+    )
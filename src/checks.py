@@ -0,0 +1,150 @@
+"""Compile plan Checks into vectorized comparisons over metric columns.
+
+A check list is compiled once: each Check is bound to the index of the
+metrics column it reads (``latency_p95`` reads ``p95_ms``) and grouped by
+operator. Evaluating the compiled checks against one summary, a stage-by-
+column matrix, or thousands of runs then costs one NumPy comparison per
+operator rather than one Python branch per field.
+"""
+
+import dataclasses
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models import Check, MetricsSummary
+
+SUMMARY_COLUMNS = tuple(f.name for f in dataclasses.fields(MetricsSummary))
+
+OPERATORS = {
+    "<=": np.less_equal,
+    "<": np.less,
+    ">=": np.greater_equal,
+    ">": np.greater,
+}
+
+
+def metric_column(metric: str) -> str:
+    """Map a Check metric name to its metrics column (``latency_p95`` -> ``p95_ms``)."""
+    if metric.startswith("latency_"):
+        return metric[len("latency_"):] + "_ms"
+    return metric
+
+
+def summary_row(metrics: MetricsSummary, columns: Sequence[str] = SUMMARY_COLUMNS) -> np.ndarray:
+    """Flatten a MetricsSummary into a float row with NaN for missing values."""
+    return np.array(
+        [np.nan if getattr(metrics, c, None) is None else getattr(metrics, c) for c in columns],
+        dtype=np.float64,
+    )
+
+
+class CompiledChecks:
+    """A check list bound to column indices, ready for array evaluation."""
+
+    def __init__(self, checks: Sequence[Check], columns: Sequence[str] = SUMMARY_COLUMNS):
+        self.checks = list(checks)
+        self.columns = tuple(columns)
+        index = []
+        for check in self.checks:
+            if check.operator not in OPERATORS:
+                raise ValueError(f"unsupported check operator: {check.operator!r}")
+            if check.threshold is None:
+                raise ValueError(f"check on {check.metric} has no threshold")
+            col = metric_column(check.metric)
+            index.append(self.columns.index(col) if col in self.columns else -1)
+        self.column_index = np.array(index, dtype=np.intp)
+        self.thresholds = np.array([c.threshold for c in self.checks], dtype=np.float64)
+        ops = np.array([c.operator for c in self.checks], dtype=object)
+        self._groups = [
+            (ufunc, np.flatnonzero(ops == op))
+            for op, ufunc in OPERATORS.items()
+            if np.any(ops == op)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.checks)
+
+    def select(self, values: np.ndarray) -> np.ndarray:
+        """Pick each check's input column from ``(..., columns)`` values."""
+        values = np.asarray(values, dtype=np.float64)
+        picked = np.take(values, np.maximum(self.column_index, 0), axis=-1)
+        picked[..., self.column_index < 0] = np.nan
+        return picked
+
+    def evaluate(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate every check against rows of metric values.
+
+        Args:
+            values: Array shaped ``(..., len(columns))``; NaN marks a missing
+                value. A single summary row or a whole batch both work.
+
+        Returns:
+            ``(passed, present, picked)`` arrays shaped ``(..., len(checks))``:
+            whether each check passed, whether its metric was present (a
+            missing metric is neither passed nor failed), and the value each
+            check read.
+        """
+        picked = self.select(values)
+        present = ~np.isnan(picked)
+        passed = np.zeros(picked.shape, dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for ufunc, sel in self._groups:
+                passed[..., sel] = ufunc(picked[..., sel], self.thresholds[sel])
+        passed &= present
+        return passed, present, picked
+
+    def results(
+        self, passed: np.ndarray, present: np.ndarray, picked: np.ndarray
+    ) -> List[dict]:
+        """Render one row of ``evaluate`` output as interpreter check dicts."""
+        out = []
+        for i, check in enumerate(self.checks):
+            if not present[i]:
+                out.append({
+                    "metric": check.metric,
+                    "result": "skip",
+                    "detail": f"{_label(check.metric)} not provided in metrics",
+                })
+            else:
+                out.append({
+                    "metric": check.metric,
+                    "result": "pass" if passed[i] else "fail",
+                    "detail": describe(check, float(picked[i])),
+                })
+        return out
+
+    def evaluate_summary(self, metrics: MetricsSummary) -> List[dict]:
+        """Evaluate against a single MetricsSummary and return check dicts."""
+        return self.results(*self.evaluate(summary_row(metrics, self.columns)))
+
+
+def compile_checks(
+    checks: Sequence[Check], columns: Optional[Sequence[str]] = None
+) -> CompiledChecks:
+    """Compile ``checks`` against ``columns`` (default: MetricsSummary fields)."""
+    return CompiledChecks(checks, SUMMARY_COLUMNS if columns is None else columns)
+
+
+def describe(check: Check, value: float) -> str:
+    """Human-readable detail line for an evaluated check."""
+    op = "" if check.operator == "<=" else f"{check.operator} "
+    if check.metric.startswith("latency_"):
+        return (
+            f"{_label(check.metric)}: {value:.1f} ms "
+            f"(threshold: {op}{check.threshold:g} ms)"
+        )
+    if check.metric == "error_rate":
+        return (
+            f"error rate: {value * 100:.2f}% "
+            f"(threshold: {op}{check.threshold * 100:.1f}%)"
+        )
+    return f"{check.metric}: {value:g} (threshold: {check.operator} {check.threshold:g})"
+
+
+def _label(metric: str) -> str:
+    if metric.startswith("latency_"):
+        return f"{metric[len('latency_'):]} latency"
+    if metric == "error_rate":
+        return "error rate"
+    return metric
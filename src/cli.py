@@ -1,19 +1,138 @@
-"""CLI entry point for the performance load testing assistant."""
+"""CLI entry point for the performance load testing assistant.
+
+The CLI runs tens of thousands of times a day from CI hooks, so startup
+matters: this module imports only click at the top level, and each command
+imports the modules it needs (PyYAML and NumPy included) when it runs.
+``benchmarks/bench_import_time.py`` measures this and the test suite
+enforces its budget.
+"""
 
-import json
 import sys
 
 import click
 
-from src.evidence import append_event, create_event
-from src.generator import generate_plan, plan_to_json
-from src.interpreter import interpret, load_metrics
-from src.loader import ProfileValidationError, load_profile
+# Mirror src.evidence.DURABILITY_MODES and src.profiling.TIMINGS_FORMATS so
+# that building the command line does not import those modules.
+DURABILITY_CHOICES = ("none", "flush", "fsync")
+TIMINGS_FORMATS = ("text", "json")
+
+
+def _check_export_formats(ctx, param, value):
+    """Validate ``--format``/``--export`` against the exporter registry.
+
+    The registry is read when the option is parsed rather than when the
+    command line is built, which keeps ``src.exporters`` out of startup and
+    accepts every exporter registered by then with ``register_exporter``.
+    """
+    if value is None:
+        return value
+    from src.exporters import EXPORTERS
+
+    for fmt in value if isinstance(value, tuple) else (value,):
+        if fmt not in EXPORTERS:
+            raise click.BadParameter(
+                f"{fmt!r} is not one of {', '.join(map(repr, sorted(EXPORTERS)))}."
+            )
+    return value
+
+
+_compact_option = click.option(
+    "--compact",
+    is_flag=True,
+    default=False,
+    help="Write plan JSON without indentation.",
+)
+
+
+_no_cache_option = click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Parse the profile from scratch instead of using the parsed-profile cache.",
+)
+
+
+def _profile_cache(no_cache: bool):
+    if no_cache:
+        return None
+    from src.cache import ProfileCache
+
+    return ProfileCache()
+
+
+def _print_loader_info(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return
+    from src.loader import loader_info
+
+    for key, val in loader_info().items():
+        click.echo(f"{key}: {val}")
+    ctx.exit()
 
 
 @click.group()
-def main():
+@click.option(
+    "--loader-info",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_loader_info,
+    help="Show which YAML parsing backend is active and exit.",
+)
+@click.option(
+    "--profile-cpu",
+    "cpu_out",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Run the command under cProfile and write the stats to this file.",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    default=False,
+    help="Trace allocations and report the peak and top allocation sites on stderr.",
+)
+@click.option(
+    "--trace-memory-top",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Allocation sites reported by --trace-memory.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Report per-phase timings (load, validate, generate, ...) on stderr.",
+)
+@click.option(
+    "--timings-format",
+    default="text",
+    show_default=True,
+    type=click.Choice(TIMINGS_FORMATS),
+    help="Report --timings (and --trace-memory) as text or as one line of JSON.",
+)
+@click.pass_context
+def main(ctx, cpu_out, trace_memory, trace_memory_top, timings, timings_format):
     """Performance & Load Testing Assistant -- generate load test plans from service profiles."""
+    if not (cpu_out or trace_memory or timings):
+        return
+    from src.profiling import ProfileSession
+
+    session = ProfileSession(
+        ctx.invoked_subcommand or "",
+        timings=timings_format if timings else None,
+        cpu_out=cpu_out,
+        trace_memory=trace_memory,
+        memory_top=trace_memory_top,
+    )
+    session.start()
+
+    def report():
+        for line in session.finish():
+            click.echo(line, err=True)
+
+    ctx.call_on_close(report)
 
 
 @main.command()
@@ -34,7 +153,10 @@ def main():
     "log_path",
     default=None,
     type=click.Path(),
-    help="Optional path to the evidence log (JSONL). Appends an entry when provided.",
+    help=(
+        "Optional path to the evidence log (JSONL, or SQLite for .db/.sqlite). "
+        "Appends an entry when provided."
+    ),
 )
 @click.option(
     "--metrics",
@@ -42,23 +164,31 @@ def main():
     type=click.Path(exists=True),
     help="Optional path to a metrics summary (JSON or CSV) for interpretation.",
 )
-def plan(profile, out, log_path, metrics):
+@_compact_option
+@_no_cache_option
+def plan(profile, out, log_path, metrics, compact, no_cache):
     """Generate a load test plan from a service profile."""
+    from src.generator import generate_plan, plan_to_json, write_plan_json
+    from src.loader import ProfileValidationError, load_profile
+    from src.profiling import phase
+
     try:
-        svc_profile = load_profile(profile)
+        svc_profile = load_profile(profile, cache=_profile_cache(no_cache))
     except ProfileValidationError as exc:
         click.echo(f"Error: {exc}", err=True)
         sys.exit(1)
 
-    test_plan = generate_plan(svc_profile, profile)
-    plan_json = plan_to_json(test_plan)
-
-    if out:
-        with open(out, "w") as f:
-            f.write(plan_json + "\n")
-        click.echo(f"Plan written to {out}")
-    else:
-        click.echo(plan_json)
+    with phase("generate"):
+        test_plan = generate_plan(svc_profile, profile)
+    indent = None if compact else 2
+    with phase("serialize"):
+        if out:
+            with open(out, "w") as f:
+                write_plan_json(test_plan, f, indent=indent)
+                f.write("\n")
+            click.echo(f"Plan written to {out}")
+        else:
+            click.echo(plan_to_json(test_plan, indent=indent))
 
     # Determine outcome and handle optional interpretation
     interpretation_ran = False
@@ -66,10 +196,14 @@ def plan(profile, out, log_path, metrics):
 
     if metrics:
         try:
-            metrics_data, warnings = load_metrics(metrics)
+            from src.interpreter import interpret, load_metrics
+
+            with phase("load"):
+                metrics_data, warnings = load_metrics(metrics)
             for w in warnings:
                 click.echo(f"Warning: {w}", err=True)
-            result = interpret(metrics_data, svc_profile.slo)
+            with phase("interpret"):
+                result = interpret(metrics_data, svc_profile.slo)
             interpretation_ran = True
             click.echo("\n--- Metrics Interpretation ---")
             click.echo(f"Status: {result.status.upper()}")
@@ -82,6 +216,9 @@ def plan(profile, out, log_path, metrics):
             click.echo(f"Warning: could not interpret metrics: {exc}", err=True)
 
     if log_path:
+        from src.evidence import create_event
+        from src.evidence_store import open_store
+
         scenario_names = [s.name for s in test_plan.scenarios]
         event = create_event(
             service=svc_profile.service,
@@ -90,16 +227,45 @@ def plan(profile, out, log_path, metrics):
             interpretation=interpretation_ran,
             outcome=outcome,
         )
-        append_event(event, log_path)
+        with phase("log"), open_store(log_path) as store:
+            store.append(event)
         click.echo(f"Evidence logged to {log_path}")
 
 
 @main.command()
 @click.option(
     "--metrics",
-    required=True,
+    default=None,
     type=click.Path(exists=True),
-    help="Path to a metrics summary file (JSON or CSV).",
+    help="Path to a metrics summary file (JSON or CSV) or k6 --out json results.",
+)
+@click.option(
+    "--samples",
+    default=None,
+    type=click.Path(exists=True),
+    help="Path to a raw per-request samples CSV (latency_ms[, error][, ts]).",
+)
+@click.option(
+    "--metrics-glob",
+    default=None,
+    help="Glob of metrics summaries (quote it), e.g. 'run-42/*.json'; each file is judged.",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Threads/processes for loading --metrics-glob files (1 loads serially).",
+)
+@click.option(
+    "--histograms",
+    default=None,
+    help="Glob of per-node histogram dumps (quote it); judged as one merged fleet-wide run.",
+)
+@click.option(
+    "--save-histogram",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="With --samples, also write a mergeable histogram dump to this path.",
 )
 @click.option(
     "--profile",
@@ -107,16 +273,98 @@ def plan(profile, out, log_path, metrics):
     type=click.Path(exists=True),
     help="Path to the service profile to evaluate against.",
 )
-def interpret_cmd(metrics, profile):
+@click.option(
+    "--window",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Treat a --metrics CSV as a time series and evaluate every window of this many seconds.",
+)
+@click.option(
+    "--scenario",
+    "scenario_name",
+    default=None,
+    type=click.Choice(["steady", "burst", "soak"]),
+    help="Treat a --metrics CSV as a time series and judge each stage of this scenario.",
+)
+@click.option(
+    "--start-ts",
+    default=None,
+    type=float,
+    help="Epoch seconds at which the scenario started (defaults to the first row).",
+)
+@click.option(
+    "--include-ramps",
+    is_flag=True,
+    default=False,
+    help="Also judge ramp-up/ramp-down stages with --scenario.",
+)
+@_no_cache_option
+def interpret_cmd(
+    metrics, samples, metrics_glob, workers, histograms, save_histogram, profile, window,
+    scenario_name, start_ts, include_ramps, no_cache,
+):
     """Interpret a metrics summary against a service profile's SLOs."""
+    sources = (metrics, samples, metrics_glob, histograms)
+    if sum(source is not None for source in sources) != 1:
+        click.echo(
+            "Error: pass exactly one of --metrics, --samples, --metrics-glob or --histograms",
+            err=True,
+        )
+        sys.exit(1)
+    if save_histogram is not None and samples is None:
+        click.echo("Error: --save-histogram requires --samples", err=True)
+        sys.exit(1)
+    if window is not None and scenario_name is not None:
+        click.echo("Error: --window and --scenario are mutually exclusive", err=True)
+        sys.exit(1)
+    time_series = window is not None or scenario_name is not None
+    if time_series and not (metrics and metrics.lower().endswith(".csv")):
+        click.echo("Error: --window/--scenario require a --metrics CSV file", err=True)
+        sys.exit(1)
+
+    import json
+
+    from src.interpreter import interpret, load_metrics
+    from src.loader import ProfileValidationError, load_profile
+    from src.profiling import phase
+
     try:
-        svc_profile = load_profile(profile)
+        svc_profile = load_profile(profile, cache=_profile_cache(no_cache))
     except ProfileValidationError as exc:
         click.echo(f"Error: {exc}", err=True)
         sys.exit(1)
 
+    if scenario_name is not None:
+        _interpret_stages(svc_profile, profile, metrics, scenario_name, start_ts, include_ramps)
+        return
+    if metrics_glob is not None:
+        _interpret_many(svc_profile, metrics_glob, workers)
+        return
+
+    windowed = None
     try:
-        metrics_data, warnings = load_metrics(metrics)
+        with phase("load"):
+            if samples:
+                from src.samples import load_raw_samples
+
+                metrics_data, warnings = load_raw_samples(samples, histogram_out=save_histogram)
+            elif histograms:
+                import glob
+
+                from src.samples import load_merged_histograms
+
+                histogram_paths = sorted(glob.glob(histograms, recursive=True))
+                if not histogram_paths:
+                    click.echo(f"Error: no histogram files match {histograms}", err=True)
+                    sys.exit(1)
+                metrics_data, warnings = load_merged_histograms(histogram_paths)
+            elif window is not None:
+                from src.timeseries import load_metrics_timeseries
+
+                windowed = load_metrics_timeseries(metrics, window_seconds=window)
+                metrics_data, warnings = windowed.overall, windowed.warnings
+            else:
+                metrics_data, warnings = load_metrics(metrics)
     except Exception as exc:
         click.echo(f"Error: {exc}", err=True)
         sys.exit(1)
@@ -124,7 +372,8 @@ def interpret_cmd(metrics, profile):
     for w in warnings:
         click.echo(f"Warning: {w}", err=True)
 
-    result = interpret(metrics_data, svc_profile.slo)
+    with phase("interpret"):
+        result = interpret(metrics_data, svc_profile.slo)
     click.echo(f"Status: {result.status.upper()}")
     click.echo(result.narrative)
 
@@ -133,7 +382,567 @@ def interpret_cmd(metrics, profile):
         "checks": result.checks,
         "risks": result.risks,
     }
-    click.echo("\n" + json.dumps(output, indent=2))
+
+    if windowed is not None:
+        from src.timeseries import interpret_windows
+
+        with phase("interpret"):
+            _, per_window = interpret_windows(windowed, svc_profile.slo)
+        starts = windowed.window_starts()
+        flagged = [i for i, r in enumerate(per_window) if r.status != "pass"]
+        click.echo(
+            f"\nWindows: {len(per_window)} x {window:g}s evaluated, "
+            f"{len(flagged)} not passing"
+        )
+        for i in flagged[:10]:
+            reasons = [c["detail"] for c in per_window[i].checks if c["result"] == "fail"]
+            reasons += per_window[i].risks
+            click.echo(
+                f"  +{starts[i]:.0f}s: {per_window[i].status.upper()} ({'; '.join(reasons)})"
+            )
+        if len(flagged) > 10:
+            click.echo(f"  ... and {len(flagged) - 10} more")
+        output["windows"] = [
+            {"start_s": float(starts[i]), "status": r.status}
+            for i, r in enumerate(per_window)
+        ]
+
+    with phase("serialize"):
+        click.echo("\n" + json.dumps(output, indent=2))
+
+
+def _interpret_many(svc_profile, pattern, workers):
+    """Judge every metrics summary matching ``pattern``, loading them concurrently."""
+    import glob
+    import json
+    import os
+
+    from src.interpreter import load_metrics_many
+    from src.metrics_batch import MetricsBatch, interpret_batch
+    from src.profiling import phase
+
+    paths = sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    if not paths:
+        click.echo(f"Error: no metrics files match {pattern}", err=True)
+        sys.exit(1)
+    try:
+        with phase("load"):
+            loaded = load_metrics_many(paths, workers=workers)
+    except Exception as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    for path, (_, warnings) in zip(paths, loaded):
+        for w in warnings:
+            click.echo(f"Warning: {path}: {w}", err=True)
+
+    with phase("interpret"):
+        batch = MetricsBatch.from_summaries((m for m, _ in loaded), labels=paths)
+        scored = interpret_batch(batch, svc_profile.slo)
+    counts = scored.status_counts()
+    status = next((s for s in ("fail", "warning") if counts[s]), "pass")
+    click.echo(
+        f"Status: {status.upper()} ({len(paths)} file(s): {counts['pass']} pass, "
+        f"{counts['warning']} warning, {counts['fail']} fail)"
+    )
+    flagged = [i for i in range(len(paths)) if scored.status[i] != "pass"]
+    for i in flagged[:10]:
+        click.echo(f"\n[{paths[i]}] {scored.status[i].upper()}")
+        click.echo(scored.narrative(i))
+    if len(flagged) > 10:
+        click.echo(f"\n... and {len(flagged) - 10} more")
+
+    output = {
+        "status": status,
+        "files": [
+            {
+                "path": path,
+                "status": str(scored.status[i]),
+                "checks": scored.checks(i),
+                "risks": scored.risks(i),
+            }
+            for i, path in enumerate(paths)
+        ],
+    }
+    with phase("serialize"):
+        click.echo("\n" + json.dumps(output, indent=2))
+
+
+def _interpret_stages(svc_profile, profile_path, metrics, scenario_name, start_ts, include_ramps):
+    """Judge each stage of one generated scenario against time-series metrics."""
+    import json
+
+    from src.generator import generate_plan
+    from src.profiling import phase
+    from src.timeseries import evaluate_stages, load_metrics_series
+
+    try:
+        with phase("load"):
+            series = load_metrics_series(metrics)
+    except Exception as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    with phase("generate"):
+        test_plan = generate_plan(svc_profile, profile_path)
+    scenario = next(s for s in test_plan.scenarios if s.name == scenario_name)
+    with phase("interpret"):
+        stages = evaluate_stages(
+            scenario, series, start_ts=start_ts, include_ramps=include_ramps
+        )
+
+    order = {"pass": 0, "warning": 1, "fail": 2}
+    status = max((s.result.status for s in stages), key=order.get, default="pass")
+    click.echo(f"Status: {status.upper()} ({scenario_name}, {len(stages)} stage(s) judged)")
+    for s in stages:
+        click.echo(
+            f"\n[{s.stage}] {s.start_s}-{s.end_s}s, {s.samples} sample(s): "
+            f"{s.result.status.upper()}"
+        )
+        click.echo(s.result.narrative)
+
+    output = {
+        "status": status,
+        "scenario": scenario_name,
+        "stages": [
+            {
+                "stage": s.stage,
+                "start_s": s.start_s,
+                "end_s": s.end_s,
+                "samples": s.samples,
+                "status": s.result.status,
+                "checks": s.result.checks,
+                "risks": s.result.risks,
+            }
+            for s in stages
+        ],
+    }
+    with phase("serialize"):
+        click.echo("\n" + json.dumps(output, indent=2))
+
+
+@main.command("plan-batch")
+@click.option(
+    "--profiles",
+    default=None,
+    help="Directory of profiles or a glob pattern (quote it), e.g. 'profiles/*.yaml'.",
+)
+@click.option(
+    "--bundle",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Multi-document YAML file with one profile per '---' document.",
+)
+@click.option(
+    "--out-dir",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="Directory that receives one <service>.json plan per profile.",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Worker processes (defaults to the CPU count). Not with --bundle.",
+)
+@click.option(
+    "--chunk-size",
+    default=16,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Profiles handed to a worker per task. Not with --bundle.",
+)
+@click.option(
+    "--log",
+    "log_path",
+    default=None,
+    type=click.Path(),
+    help=(
+        "Optional path to the evidence log (JSONL, or SQLite for .db/.sqlite). "
+        "Appends one entry per plan."
+    ),
+)
+@click.option(
+    "--log-durability",
+    default="flush",
+    show_default=True,
+    type=click.Choice(DURABILITY_CHOICES),
+    help="How hard to push evidence to disk: none, flush to the OS, or fsync.",
+)
+@click.option(
+    "--export",
+    "exports",
+    multiple=True,
+    metavar="FORMAT",
+    callback=_check_export_formats,
+    help="Also write each plan as a script for this tool (k6, locust, jmeter, "
+    "or a registered exporter). Repeatable.",
+)
+@_compact_option
+@_no_cache_option
+def plan_batch_cmd(
+    profiles,
+    bundle,
+    out_dir,
+    workers,
+    chunk_size,
+    log_path,
+    log_durability,
+    exports,
+    compact,
+    no_cache,
+):
+    """Generate plans for every profile in a directory, glob, or bundle."""
+    if (profiles is None) == (bundle is None):
+        click.echo("Error: pass exactly one of --profiles or --bundle", err=True)
+        sys.exit(1)
+    if bundle:
+        # A bundle is streamed serially and parsed once, so these cannot apply.
+        ctx = click.get_current_context()
+        ignored = [
+            f"--{name.replace('_', '-')}"
+            for name in ("workers", "chunk_size", "no_cache")
+            if ctx.get_parameter_source(name) is not click.core.ParameterSource.DEFAULT
+        ]
+        if ignored:
+            click.echo(f"Error: {', '.join(ignored)} cannot be used with --bundle", err=True)
+            sys.exit(1)
+
+    from src.batch import discover_profiles, plan_batch, plan_bundle
+    from src.cache import default_cache_dir
+    from src.profiling import phase
+
+    if bundle:
+        with phase("generate"):
+            report = plan_bundle(bundle, out_dir, exports=exports, compact=compact)
+    else:
+        paths = discover_profiles(profiles)
+        if not paths:
+            click.echo(f"Error: no profiles found for {profiles}", err=True)
+            sys.exit(1)
+        with phase("generate"):
+            report = plan_batch(
+                paths,
+                out_dir,
+                workers=workers,
+                chunk_size=chunk_size,
+                cache_dir=None if no_cache else default_cache_dir(),
+                exports=exports,
+                compact=compact,
+            )
+
+    for failure in report.failures:
+        click.echo(f"FAILED {failure.profile}: {failure.error}", err=True)
+
+    if log_path:
+        from src.evidence import create_event
+        from src.evidence_store import open_store
+
+        with phase("log"), open_store(log_path, durability=log_durability) as store:
+            for item in report.planned:
+                store.append(create_event(
+                    service=item.service,
+                    profile_path=item.profile,
+                    scenarios=item.scenarios,
+                ))
+
+    click.echo(
+        f"Planned {len(report.planned)} profile(s), {len(report.failures)} failed "
+        f"in {report.elapsed_seconds:.2f}s ({report.throughput:.1f} profiles/sec)"
+    )
+    if report.failures:
+        sys.exit(1)
+
+
+@main.command("export")
+@click.option(
+    "--profile",
+    required=True,
+    type=click.Path(exists=True),
+    help="Path to a service profile file (YAML or JSON).",
+)
+@click.option(
+    "--format",
+    "fmt",
+    required=True,
+    metavar="FORMAT",
+    callback=_check_export_formats,
+    help="Target load testing tool: k6, locust, jmeter, or a registered exporter.",
+)
+@click.option(
+    "--out",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Optional output path for the script. Prints to stdout if omitted.",
+)
+@_no_cache_option
+def export_cmd(profile, fmt, out, no_cache):
+    """Export a generated plan as a k6, Locust, or JMeter script."""
+    from src.exporters import export_plan
+    from src.generator import generate_plan
+    from src.loader import ProfileValidationError, load_profile
+    from src.profiling import phase
+
+    try:
+        svc_profile = load_profile(profile, cache=_profile_cache(no_cache))
+    except ProfileValidationError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    with phase("generate"):
+        test_plan = generate_plan(svc_profile, profile)
+    with phase("serialize"):
+        script = export_plan(test_plan, fmt, svc_profile.endpoints)
+        if out:
+            with open(out, "w") as f:
+                f.write(script)
+            click.echo(f"{fmt} script written to {out}")
+        else:
+            click.echo(script, nl=False)
+
+
+@main.command()
+@click.option(
+    "--profile",
+    required=True,
+    type=click.Path(exists=True),
+    help="Path to a service profile file (YAML or JSON).",
+)
+@click.option(
+    "--scenario",
+    "scenario_name",
+    required=True,
+    type=click.Choice(["steady", "burst", "soak"]),
+    help="Scenario of the generated plan to compile.",
+)
+@click.option(
+    "--arrival",
+    default="poisson",
+    show_default=True,
+    type=click.Choice(["poisson", "constant"]),
+    help="Arrival process used to place requests along the rate curve.",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option(
+    "--out",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="Output .npy file of (offset_s, endpoint) records.",
+)
+@_no_cache_option
+def schedule(profile, scenario_name, arrival, seed, out, no_cache):
+    """Compile a scenario into exact per-request send offsets."""
+    import time
+
+    from src.generator import generate_plan
+    from src.loader import ProfileValidationError, load_profile
+    from src.profiling import phase
+    from src.schedule import compile_schedule
+
+    try:
+        svc_profile = load_profile(profile, cache=_profile_cache(no_cache))
+    except ProfileValidationError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    with phase("generate"):
+        test_plan = generate_plan(svc_profile, profile)
+    scenario = next(s for s in test_plan.scenarios if s.name == scenario_name)
+    start = time.perf_counter()
+    try:
+        with phase("generate"):
+            result = compile_schedule(
+                scenario, svc_profile.endpoints, arrival=arrival, seed=seed, out_path=out
+            )
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    click.echo(
+        f"Wrote {len(result)} request offsets for {scenario_name} to {out} "
+        f"in {elapsed:.2f}s"
+    )
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind.")
+@click.option(
+    "--port",
+    default=8765,
+    show_default=True,
+    type=click.IntRange(min=0, max=65535),
+    help="TCP port (0 picks a free one).",
+)
+@click.option(
+    "--unix",
+    "unix_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix socket instead of TCP.",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Worker processes for loads, plans, and interpretation "
+    "(default: CPU count; 0 interprets in the server process).",
+)
+@_no_cache_option
+def serve(host, port, unix_path, workers, no_cache):
+    """Serve profiles, plans, and interpretations as a local JSON API."""
+    from src.server import run
+
+    def ready(address):
+        click.echo(f"Serving on {address} (Ctrl-C to stop)", err=True)
+
+    run(
+        host=host,
+        port=port,
+        unix_path=unix_path,
+        workers=workers,
+        profile_cache=_profile_cache(no_cache),
+        ready=ready,
+    )
+
+
+@main.group()
+def cache():
+    """Manage the parsed-profile cache."""
+
+
+@cache.command("clear")
+def cache_clear():
+    """Delete every cached profile."""
+    from src.cache import ProfileCache, default_cache_dir
+
+    removed = ProfileCache().clear()
+    click.echo(f"Removed {removed} cached profile(s) from {default_cache_dir()}")
+
+
+@main.group()
+def evidence():
+    """Inspect the evidence log."""
+
+
+@evidence.command("query")
+@click.option(
+    "--log",
+    "log_path",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="Path to the evidence log (JSONL with rotated segments, or SQLite for .db/.sqlite).",
+)
+@click.option("--service", default=None, help="Only events for this service.")
+@click.option(
+    "--since",
+    default=None,
+    help="Inclusive lower bound on the event timestamp (e.g. 2024-05-01 or 2024-05-01T12:00:00Z).",
+)
+@click.option("--until", default=None, help="Exclusive upper bound on the event timestamp.")
+def evidence_query(log_path, service, since, until):
+    """Print matching evidence events as JSONL."""
+    import json
+
+    from src.evidence import event_to_dict
+    from src.evidence_store import open_store
+
+    try:
+        with open_store(log_path) as store:
+            events = store.query(service=service, since=since, until=until)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    for event in events:
+        click.echo(json.dumps(event_to_dict(event)))
+
+
+@evidence.command("rotate")
+@click.option(
+    "--log",
+    "log_path",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="Path to the evidence log (JSONL).",
+)
+@click.option(
+    "--max-bytes",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Only rotate if the live log is larger than this.",
+)
+@click.option(
+    "--max-age",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="Only rotate if the live log's first event is older than this many seconds.",
+)
+@click.option(
+    "--no-compress",
+    is_flag=True,
+    default=False,
+    help="Leave the new segment uncompressed.",
+)
+def evidence_rotate(log_path, max_bytes, max_age, no_compress):
+    """Close the live evidence log as the next numbered (gzipped) segment."""
+    from src.evidence import rotate_log
+
+    segment = rotate_log(
+        log_path, max_bytes=max_bytes, max_age=max_age, compress=not no_compress
+    )
+    if segment is None:
+        click.echo("Nothing to rotate")
+    else:
+        click.echo(f"Rotated {log_path} to {segment}{'' if no_compress else '.gz'}")
+
+
+@evidence.command("migrate")
+@click.option(
+    "--from",
+    "source",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="JSONL evidence log to copy (rotated segments included).",
+)
+@click.option(
+    "--to",
+    "target",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="New or empty SQLite database to load into (created if missing).",
+)
+def evidence_migrate(source, target):
+    """Bulk-load a JSONL evidence log into a SQLite evidence store."""
+    from src.evidence_store import SqliteEvidenceStore, migrate
+
+    rejected = []
+    try:
+        with SqliteEvidenceStore(target, durability="none", batch_size=10_000) as store:
+            count = migrate(source, store, rejected=rejected)
+    except (FileNotFoundError, ValueError) as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    for message in rejected:
+        click.echo(f"Warning: skipped {message}", err=True)
+    click.echo(f"Migrated {count} event(s) from {source} to {target}")
+
+
+@evidence.command("failures")
+@click.option(
+    "--log",
+    "log_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Evidence log (JSONL, or SQLite for .db/.sqlite).",
+)
+def evidence_failures(log_path):
+    """Print failures per service per week (weeks start on Monday) as CSV."""
+    from src.evidence_store import open_store
+
+    with open_store(log_path) as store:
+        rows = store.failures_per_week()
+    click.echo("week,service,failures")
+    for service, week, count in rows:
+        click.echo(f"{week},{service},{count}")
 
 
 if __name__ == "__main__":
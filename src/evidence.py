@@ -1,12 +1,58 @@
-"""Append-only evidence logging in JSONL format."""
+"""Append-only evidence logging in JSONL format.
 
+Next to each log sits a sidecar index directory, ``<log>.idx/``, holding
+one binary file per service of ``(epoch seconds, byte offset)`` records
+and a ``covered`` marker with the length of the log prefix indexed so far.
+Service and time-range queries read only the matching service's records
+and seek straight to the matching lines.
+
+The live log can be rotated into numbered segments (``<log>.000001``,
+gzipped in the background to ``<log>.000001.gz``), each keeping its index
+directory. ``<log>.segments.json`` lists the segments with their event
+count, timestamp range, and services, so queries open only the segments
+that can match.
+"""
+
+import calendar
+import contextlib
+import gzip
+import hashlib
+import io
 import json
 import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+import time
 from datetime import datetime, timezone
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
 
 from src.models import EvidenceEvent
 
+TimeBound = Union[str, datetime]
+
+# One index record per event: epoch seconds and the line's byte offset.
+# Appends pack records with struct; queries read them with NumPy, which is
+# imported only there so logging a plan never pays for it.
+INDEX_RECORD = struct.Struct("<qq")
+
+DURABILITY_MODES = ("none", "flush", "fsync")
+
+_INDEX_SUFFIX = ".bin"
+_COVERED_FILE = "covered"
+_TS_FORMATS = ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+# Lines written by append_event start with ts and service; other layouts
+# (or escaped strings) fall back to a full JSON decode.
+_KEY_PREFIX = re.compile(rb'\{"ts": "([^"\\]*)", "service": "([^"\\]*)"')
+
 
 def create_event(
     service: str,
@@ -42,57 +88,726 @@ def append_event(event: EvidenceEvent, log_path: str) -> None:
     """Append a single evidence event as a JSONL line.
 
     Creates the file (and parent directories) if it does not exist.
-    Never overwrites existing entries.
+    Never overwrites existing entries. The sidecar index is extended in the
+    same call when it is up to date with the log. To log many events, use
+    an EvidenceWriter instead.
 
     Args:
         event: The event to log.
         log_path: Filesystem path to the JSONL evidence log.
     """
-    parent = os.path.dirname(log_path)
-    if parent and not os.path.isdir(parent):
-        os.makedirs(parent, exist_ok=True)
+    with EvidenceWriter(log_path, flush_size=1) as writer:
+        writer.append(event)
 
-    line = json.dumps({
-        "ts": event.ts,
-        "service": event.service,
-        "profile": event.profile,
-        "scenarios": event.scenarios,
-        "interpretation": event.interpretation,
-        "outcome": event.outcome,
-    })
 
-    with open(log_path, "a") as f:
-        f.write(line + "\n")
+class EvidenceWriter:
+    """Buffered, append-only evidence log writer, safe across processes.
+
+    Events are encoded as they arrive and written in batches, once
+    ``flush_size`` events are buffered or ``flush_interval`` seconds have
+    passed since the oldest buffered event (checked on each append), and
+    always on close. Each batch is written with a single ``os.write`` on an
+    ``O_APPEND`` descriptor while holding an exclusive ``fcntl`` lock on the
+    log, so concurrent writers (several CI jobs sharing one log) never
+    interleave or tear lines. Use it as a context manager::
+
+        with EvidenceWriter("evidence.jsonl") as writer:
+            for event in events:
+                writer.append(event)
+
+    Durability modes:
+        ``none``: batches are written only when ``flush_size`` is reached
+            and at close; ``flush_interval`` is ignored.
+        ``flush``: batches are also written once ``flush_interval`` passes,
+            bounding how long an event stays invisible to readers.
+        ``fsync``: like ``flush``, and every batch is fsynced so it
+            survives power loss.
+
+    Args:
+        log_path: Filesystem path to the JSONL evidence log.
+        flush_size: Events buffered before a batch is written.
+        flush_interval: Maximum age in seconds of a buffered event before the
+            next append writes the batch.
+        durability: One of DURABILITY_MODES.
+        max_bytes: Rotate the live log into a numbered segment before a
+            batch would grow it past this size.
+        max_age: Rotate the live log once its first event is this many
+            seconds old.
+        compress: Gzip rotated segments on a background thread.
+
+    Raises:
+        ValueError: If ``durability`` or ``flush_size`` is invalid.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        flush_size: int = 512,
+        flush_interval: float = 1.0,
+        durability: str = "flush",
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        compress: bool = True,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"unknown durability mode: {durability!r} "
+                f"(expected one of {', '.join(DURABILITY_MODES)})"
+            )
+        if flush_size < 1:
+            raise ValueError("flush_size must be at least 1")
+        self.log_path = log_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._lines: List[bytes] = []
+        self._keys: List[Tuple[str, str]] = []
+        self._oldest = 0.0
+        self._fd: Optional[int] = None
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self._compressor: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "EvidenceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def append(self, event: EvidenceEvent) -> None:
+        """Buffer ``event``, writing the batch if it is full or stale."""
+        if not self._lines:
+            self._oldest = time.monotonic()
+        self._lines.append((json.dumps(event_to_dict(event)) + "\n").encode())
+        self._keys.append((event.service, event.ts))
+        if len(self._lines) >= self.flush_size or (
+            self.durability != "none"
+            and time.monotonic() - self._oldest >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered events as one locked append."""
+        if not self._lines:
+            return
+        data = b"".join(self._lines)
+        fd = self._lock_live()
+        try:
+            if _rotation_due(self.log_path, fd, len(data), self.max_bytes, self.max_age):
+                _rotate_locked(self.log_path, fd)
+                self._release()
+                self._start_compression()
+                fd = self._lock_live()
+            # Under the lock nobody else appends, so the end of the file is
+            # where this O_APPEND write lands.
+            start = os.lseek(fd, 0, os.SEEK_END)
+            _write_all(fd, data)
+            if self.durability == "fsync":
+                os.fsync(fd)
+            entries = []
+            offset = start
+            for key, line in zip(self._keys, self._lines):
+                entries.append((key, offset))
+                offset += len(line)
+            _index_append(self.log_path, entries, start, offset)
+        finally:
+            _unlock(fd)
+        self._lines.clear()
+        self._keys.clear()
+
+    def close(self) -> None:
+        """Write anything still buffered, close the log, and finish compressing."""
+        self.flush()
+        self._release()
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+    def _lock_live(self) -> int:
+        """Lock the current live log, reopening it if it was rotated away."""
+        while True:
+            if self._fd is None:
+                parent = os.path.dirname(self.log_path)
+                if parent and not os.path.isdir(parent):
+                    os.makedirs(parent, exist_ok=True)
+                self._fd = os.open(
+                    self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+                )
+            _lock(self._fd)
+            if _is_current(self._fd, self.log_path):
+                return self._fd
+            self._release()
+
+    def _release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # also drops the lock
+            self._fd = None
+
+    def _start_compression(self) -> None:
+        if not self.compress:
+            return
+        if self._compressor is not None:
+            self._compressor.join()
+        self._compressor = threading.Thread(
+            target=compress_segments, args=(self.log_path,), name="evidence-gzip"
+        )
+        self._compressor.start()
 
 
 def read_events(log_path: str) -> List[EvidenceEvent]:
     """Read all events from a JSONL evidence log.
 
+    Rotated segments (compressed or not) are read first, oldest first,
+    followed by the live log.
+
     Args:
         log_path: Path to the evidence log.
 
     Returns:
         List of EvidenceEvent instances. Malformed lines are skipped.
     """
+    return list(iter_events(log_path))
+
+
+def iter_events(log_path: str) -> Iterator[EvidenceEvent]:
+    """Like ``read_events``, but yields events one at a time."""
+    paths = [_segment_path(log_path, entry["id"]) for entry in _read_manifest(log_path)]
+    if os.path.isfile(log_path):
+        paths.append(log_path)
+
+    for path in paths:
+        with _open_segment(path) as f:
+            for line in f:
+                event = _parse_line(line)
+                if event is not None:
+                    yield event
+
+
+def log_exists(log_path: str) -> bool:
+    """True if the live log or any rotated segment of it exists."""
+    return os.path.isfile(log_path) or bool(_read_manifest(log_path))
+
+
+def query_events(
+    log_path: str,
+    service: Optional[str] = None,
+    since: Optional[TimeBound] = None,
+    until: Optional[TimeBound] = None,
+) -> List[EvidenceEvent]:
+    """Return the events for ``service`` with ``since <= ts < until``.
+
+    Uses the sidecar index (``<log_path>.idx/``) to seek straight to the
+    matching lines instead of decoding the whole log. The index is brought
+    up to date first, so logs written before indexing existed, or by other
+    tools, are indexed on their first query. Rotated segments are opened
+    only if the segment manifest says they hold events for ``service`` in
+    the requested time range.
+
+    Args:
+        log_path: Path to the evidence log.
+        service: Only return events for this service.
+        since: Inclusive lower bound, as a datetime or ISO 8601 string
+            (``2024-05-01`` or ``2024-05-01T12:00:00Z``).
+        until: Exclusive upper bound, same forms as ``since``.
+
+    Returns:
+        Matching events in log order.
+
+    Raises:
+        ValueError: If ``since`` or ``until`` is not a recognised timestamp.
+    """
+    lo = to_epoch(since) if since is not None else None
+    hi = to_epoch(until) if until is not None else None
+    digest = None if service is None else _service_key(service)
+
+    events = []
+    for entry in _read_manifest(log_path):
+        if not entry["events"]:
+            continue
+        if digest is not None and digest not in entry["services"]:
+            continue
+        if (lo is not None and entry["max_ts"] < lo) or (
+            hi is not None and entry["min_ts"] >= hi
+        ):
+            continue
+        events.extend(_query_file(_segment_path(log_path, entry["id"]), service, lo, hi))
+    if os.path.isfile(log_path):
+        sync_index(log_path)
+        events.extend(_query_file(log_path, service, lo, hi))
+    return events
+
+
+def sync_index(log_path: str) -> int:
+    """Index any log lines the sidecar index does not cover yet.
+
+    Rebuilds the index from scratch if the log is shorter than the index
+    claims (the log was truncated or replaced).
+
+    Returns:
+        Number of events added to the index.
+    """
+    with _locked_log(log_path):
+        return _catch_up(log_path)
+
+
+def rotate_log(
+    log_path: str,
+    max_bytes: Optional[int] = None,
+    max_age: Optional[float] = None,
+    compress: bool = True,
+) -> Optional[str]:
+    """Close the live log as the next numbered segment.
+
+    With no thresholds the log is rotated unconditionally; otherwise only
+    once it exceeds ``max_bytes`` or its first event is ``max_age`` seconds
+    old. The segment is indexed, recorded in the manifest, and (with
+    ``compress``) gzipped before returning.
+
+    Returns:
+        The segment path (without ``.gz``), or None if nothing was rotated.
+    """
     if not os.path.isfile(log_path):
+        return None
+    with _locked_log(log_path) as fd:
+        unconditional = max_bytes is None and max_age is None
+        if os.fstat(fd).st_size == 0 or not (
+            unconditional or _rotation_due(log_path, fd, 0, max_bytes, max_age)
+        ):
+            return None
+        segment = _rotate_locked(log_path, fd)
+    if compress:
+        compress_segments(log_path)
+    return segment
+
+
+def compress_segments(log_path: str) -> int:
+    """Gzip every rotated segment that is still stored uncompressed.
+
+    Safe to run concurrently with readers and with other compressors: each
+    segment is compressed to a private temporary file, renamed into place,
+    and only then is the plain segment removed.
+
+    Returns:
+        Number of segments compressed.
+    """
+    done = 0
+    for entry in _read_manifest(log_path):
+        segment = _segment_path(log_path, entry["id"])
+        if not os.path.isfile(segment):
+            continue
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(segment) or ".",
+            prefix=os.path.basename(segment) + ".",
+            suffix=".gz.tmp",
+        )
+        try:
+            # Wrap the fd first so it is closed even if the segment is gone.
+            with os.fdopen(fd, "wb") as raw, open(segment, "rb") as src:
+                with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp, segment + ".gz")
+        except FileNotFoundError:
+            os.unlink(tmp)  # another process finished this segment first
+            continue
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        try:
+            os.remove(segment)
+        except FileNotFoundError:
+            pass
+        done += 1
+    return done
+
+
+def to_epoch(value: TimeBound) -> int:
+    """Epoch seconds of an ISO 8601 string or datetime (naive means UTC).
+
+    Raises:
+        ValueError: If a string is not a recognised timestamp.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            for fmt in _TS_FORMATS:  # Python < 3.11 rejects a trailing "Z"
+                try:
+                    return calendar.timegm(time.strptime(value, fmt))
+                except ValueError:
+                    continue
+            raise ValueError(f"unrecognised timestamp: {value!r}") from None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def epoch_or_missing(ts) -> int:
+    """Like ``to_epoch``, but -1 for a missing or unparseable timestamp."""
+    try:
+        return to_epoch(ts)
+    except (TypeError, ValueError):
+        return -1
+
+
+def event_to_dict(event: EvidenceEvent) -> dict:
+    """The JSON object written for ``event``."""
+    return {
+        "ts": event.ts,
+        "service": event.service,
+        "profile": event.profile,
+        "scenarios": event.scenarios,
+        "interpretation": event.interpretation,
+        "outcome": event.outcome,
+    }
+
+
+# -- internal helpers ---------------------------------------------------------
+
+def _lock(fd: int) -> None:
+    """Take an exclusive advisory lock on ``fd`` (a no-op without fcntl)."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _is_current(fd: int, path: str) -> bool:
+    """Whether ``fd`` still refers to ``path`` (it was not rotated away)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    fst = os.fstat(fd)
+    return (st.st_dev, st.st_ino) == (fst.st_dev, fst.st_ino)
+
+
+@contextlib.contextmanager
+def _locked_log(log_path: str):
+    """Open the live log read-only and hold its lock."""
+    while True:
+        fd = os.open(log_path, os.O_RDONLY)
+        _lock(fd)
+        if _is_current(fd, log_path):
+            break
+        os.close(fd)
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _catch_up(log_path: str) -> int:
+    """Index the part of the log past the index's coverage (lock held)."""
+    size = os.path.getsize(log_path)
+    covered = _index_covered(log_path)
+    if covered > size:
+        shutil.rmtree(_index_dir(log_path), ignore_errors=True)
+        covered = 0
+    if covered == size and os.path.isdir(_index_dir(log_path)):
+        return 0
+
+    entries = []
+    offset = covered
+    with open(log_path, "rb") as f:
+        f.seek(covered)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # a foreign writer mid-line; index it next time
+            key = _index_key(line)
+            if key is not None:
+                entries.append((key, offset))
+            offset += len(line)
+    _index_write(log_path, entries, offset)
+    return len(entries)
+
+
+def _rotation_due(
+    log_path: str,
+    fd: int,
+    incoming: int,
+    max_bytes: Optional[int],
+    max_age: Optional[float],
+) -> bool:
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return False
+    if max_bytes is not None and size + incoming > max_bytes:
+        return True
+    if max_age is not None:
+        with open(log_path, "rb") as f:
+            key = _index_key(f.readline())
+        started = epoch_or_missing(key[1]) if key is not None else -1
+        return started >= 0 and time.time() - started >= max_age
+    return False
+
+
+def _rotate_locked(log_path: str, fd: int) -> str:
+    """Move the live log and its index to the next segment (lock held)."""
+    _catch_up(log_path)
+    manifest = _read_manifest(log_path)
+    seg_id = manifest[-1]["id"] + 1 if manifest else 1
+    segment = _segment_path(log_path, seg_id)
+    entry = {"id": seg_id, "bytes": os.fstat(fd).st_size}
+    entry.update(_index_summary(log_path))
+
+    # Every step happens before the live log is renamed: until then other
+    # processes queue on this file's lock, and the first one to lock the new
+    # live log already sees the updated manifest.
+    manifest.append(entry)
+    _write_manifest(log_path, manifest)
+    if os.path.isdir(_index_dir(log_path)):
+        os.rename(_index_dir(log_path), _index_dir(segment))
+    os.rename(log_path, segment)
+    return segment
+
+
+def _segment_path(log_path: str, seg_id: int) -> str:
+    return f"{log_path}.{seg_id:06d}"
+
+
+def _manifest_path(log_path: str) -> str:
+    return log_path + ".segments.json"
+
+
+def _read_manifest(log_path: str) -> List[dict]:
+    """Rotated segments, oldest first, with their event/time/service summary."""
+    try:
+        with open(_manifest_path(log_path), "r") as f:
+            return json.load(f)["segments"]
+    except FileNotFoundError:
+        return []
+
+
+def _write_manifest(log_path: str, segments: List[dict]) -> None:
+    path = _manifest_path(log_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"segments": segments}, f)
+    os.replace(tmp, path)
+
+
+def _open_segment(path: str):
+    """Open a log or segment for binary reading, compressed or not.
+
+    Returns an empty stream for a segment that is listed in the manifest but
+    missing on disk (a rotation interrupted before its rename).
+    """
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        pass
+    try:
+        return gzip.open(path + ".gz", "rb")
+    except FileNotFoundError:
+        return io.BytesIO()
+
+
+def _query_file(
+    path: str, service: Optional[str], lo: Optional[int], hi: Optional[int]
+) -> List[EvidenceEvent]:
+    """Matching events from one log or segment, located through its index."""
+    index_dir = _index_dir(path)
+    if service is not None:
+        index_files = [os.path.join(index_dir, _service_key(service) + _INDEX_SUFFIX)]
+    elif os.path.isdir(index_dir):
+        index_files = [
+            os.path.join(index_dir, name)
+            for name in os.listdir(index_dir)
+            if name.endswith(_INDEX_SUFFIX)
+        ]
+    else:
+        index_files = []
+
+    import numpy as np
+
+    offsets = []
+    for index_file in index_files:
+        if not os.path.isfile(index_file):
+            continue
+        records = np.fromfile(index_file, dtype=_index_dtype())
+        keep = np.ones(len(records), dtype=bool)
+        if lo is not None:
+            keep &= records["ts"] >= lo
+        if hi is not None:
+            keep &= records["ts"] < hi
+        offsets.append(records["offset"][keep])
+    if not offsets:
         return []
+    wanted = np.unique(np.concatenate(offsets)).tolist()
 
     events = []
-    with open(log_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                raw = json.loads(line)
-                events.append(EvidenceEvent(
-                    ts=raw.get("ts", ""),
-                    service=raw.get("service", ""),
-                    profile=raw.get("profile", ""),
-                    scenarios=raw.get("scenarios", []),
-                    interpretation=raw.get("interpretation", False),
-                    outcome=raw.get("outcome", ""),
-                ))
-            except json.JSONDecodeError:
-                continue
+    with _open_segment(path) as f:
+        for line in _lines_at(f, wanted):
+            event = _parse_line(line)
+            if event is not None and (service is None or event.service == service):
+                events.append(event)
     return events
+
+
+def _lines_at(f, offsets: List[int]) -> Iterator[bytes]:
+    """Yield the lines starting at the given ascending byte offsets."""
+    if not isinstance(f, gzip.GzipFile):
+        for offset in offsets:
+            f.seek(offset)
+            yield f.readline()
+        return
+    # Seeking in gzip means decompressing up to the target anyway, so
+    # stream the segment once and keep only the wanted lines.
+    wanted = iter(offsets)
+    target = next(wanted, None)
+    position = 0
+    for line in f:
+        if target is None:
+            return
+        if position == target:
+            yield line
+            target = next(wanted, None)
+        position += len(line)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """``os.write`` until all of ``data`` is written.
+
+    Regular files accept the whole buffer in one call; the loop only
+    matters if the write is interrupted (e.g. the disk fills up).
+    """
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _parse_line(line: bytes) -> Optional[EvidenceEvent]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        raw = json.loads(line.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(raw, dict):
+        return None
+    return EvidenceEvent(
+        ts=raw.get("ts", ""),
+        service=raw.get("service", ""),
+        profile=raw.get("profile", ""),
+        scenarios=raw.get("scenarios", []),
+        interpretation=raw.get("interpretation", False),
+        outcome=raw.get("outcome", ""),
+    )
+
+
+def _index_key(line: bytes) -> Optional[Tuple[str, str]]:
+    """(service, ts) of a log line, without decoding the rest of it."""
+    match = _KEY_PREFIX.match(line)
+    if match is not None:
+        return match.group(2).decode("utf-8"), match.group(1).decode("utf-8")
+    event = _parse_line(line)
+    if event is None or not isinstance(event.service, str):
+        return None  # other tools' lines may carry any JSON value here
+    # A mistyped ts only matches queries without time bounds.
+    return event.service, event.ts if isinstance(event.ts, str) else ""
+
+
+def _epochs(timestamps: List[str]) -> List[int]:
+    """Epoch seconds for ISO 8601 strings; -1 where a value cannot be parsed.
+
+    Unparseable timestamps only match queries without time bounds. Large
+    batches (index catch-up) are parsed with NumPy in one call.
+    """
+    if len(timestamps) < 256:
+        return [epoch_or_missing(ts) for ts in timestamps]
+    import numpy as np
+
+    try:
+        parsed = np.array(
+            [ts[:-1] if ts.endswith("Z") else ts for ts in timestamps],
+            dtype="datetime64[s]",
+        )
+    except (AttributeError, TypeError, ValueError):
+        return [epoch_or_missing(ts) for ts in timestamps]
+    epochs = parsed.astype(np.int64)
+    epochs[np.isnat(parsed)] = -1
+    return epochs.tolist()
+
+
+def _index_dtype():
+    import numpy as np
+
+    return np.dtype([("ts", "<i8"), ("offset", "<i8")])
+
+
+def _index_dir(log_path: str) -> str:
+    return log_path + ".idx"
+
+
+def _service_key(service: str) -> str:
+    """Stable short name for a service in index file names and manifests."""
+    return hashlib.sha1(service.encode("utf-8")).hexdigest()[:16]
+
+
+def _index_covered(log_path: str) -> int:
+    """Byte length of the log prefix the index describes (0 if no index)."""
+    try:
+        with open(os.path.join(_index_dir(log_path), _COVERED_FILE), "rb") as f:
+            return struct.unpack("<q", f.read(8))[0]
+    except (OSError, struct.error):
+        return 0
+
+
+def _index_summary(log_path: str) -> dict:
+    """Event count, timestamp range, and service keys covered by an index."""
+    import numpy as np
+
+    index_dir = _index_dir(log_path)
+    names = sorted(os.listdir(index_dir)) if os.path.isdir(index_dir) else []
+    services, events, lo, hi = [], 0, None, None
+    for name in names:
+        if not name.endswith(_INDEX_SUFFIX):
+            continue
+        ts = np.fromfile(os.path.join(index_dir, name), dtype=_index_dtype())["ts"]
+        if len(ts) == 0:
+            continue
+        services.append(name[: -len(_INDEX_SUFFIX)])
+        events += len(ts)
+        lo = int(ts.min()) if lo is None else min(lo, int(ts.min()))
+        hi = int(ts.max()) if hi is None else max(hi, int(ts.max()))
+    return {"events": events, "min_ts": lo, "max_ts": hi, "services": services}
+
+
+def _index_append(log_path: str, entries, start: int, end: int) -> None:
+    """Extend the index if it covers exactly the log up to ``start``.
+
+    A lagging index is left alone; ``sync_index`` catches it up on the next
+    query, so appends never pay for a scan.
+    """
+    if _index_covered(log_path) == start:
+        _index_write(log_path, entries, end)
+
+
+def _index_write(log_path: str, entries, end: int) -> None:
+    """Append per-service records for ``((service, ts), offset)`` entries.
+
+    Then mark the log up to ``end`` as covered.
+    """
+    index_dir = _index_dir(log_path)
+    os.makedirs(index_dir, exist_ok=True)
+    by_service = {}
+    for (service, ts), offset in entries:
+        by_service.setdefault(service, []).append((ts, offset))
+    for service, rows in by_service.items():
+        epochs = _epochs([ts for ts, _ in rows])
+        data = b"".join(
+            INDEX_RECORD.pack(epoch, offset) for epoch, (_, offset) in zip(epochs, rows)
+        )
+        with open(os.path.join(index_dir, _service_key(service) + _INDEX_SUFFIX), "ab") as f:
+            f.write(data)
+    # Overwrite in place so unlocked readers never see an empty marker.
+    fd = os.open(os.path.join(index_dir, _COVERED_FILE), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.pwrite(fd, struct.pack("<q", end), 0)
+    finally:
+        os.close(fd)
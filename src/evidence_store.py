@@ -0,0 +1,350 @@
+"""Evidence storage backends: the JSONL log and a SQLite database.
+
+Both implement EvidenceStore, so the CLI can log to and query either one;
+``open_store`` picks the backend from the path's extension. The SQLite
+store suits dashboards: aggregates such as failures per service per week
+run as SQL against indexed columns instead of a Python loop over every
+event.
+"""
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.evidence import (
+    DURABILITY_MODES,
+    EvidenceWriter,
+    TimeBound,
+    epoch_or_missing,
+    iter_events,
+    log_exists,
+    query_events,
+    to_epoch,
+)
+from src.models import EvidenceEvent
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Outcomes counted as failures by the aggregate queries.
+FAILURE_OUTCOMES = ("issues-detected",)
+
+# (service, week starting Monday as YYYY-MM-DD, count)
+WeeklyCount = Tuple[str, str, int]
+
+
+class EvidenceStore(ABC):
+    """Append-only store of EvidenceEvents.
+
+    Stores buffer appends; ``flush`` (or closing the store, e.g. by leaving
+    a ``with`` block) makes them durable according to the store's
+    durability mode. Reads and queries see everything appended so far.
+    """
+
+    def __enter__(self) -> "EvidenceStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @abstractmethod
+    def append(self, event: EvidenceEvent) -> None:
+        """Add one event."""
+
+    def append_many(self, events: Iterable[EvidenceEvent]) -> int:
+        """Add events in order; returns how many were added."""
+        count = 0
+        for event in events:
+            self.append(event)
+            count += 1
+        return count
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Persist buffered events."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and release the store."""
+
+    @abstractmethod
+    def read(self) -> List[EvidenceEvent]:
+        """Every event, in append order."""
+
+    def count(self) -> int:
+        """Number of events in the store."""
+        return len(self.read())
+
+    @abstractmethod
+    def query(
+        self,
+        service: Optional[str] = None,
+        since: Optional[TimeBound] = None,
+        until: Optional[TimeBound] = None,
+    ) -> List[EvidenceEvent]:
+        """Events for ``service`` with ``since <= ts < until``, in append order."""
+
+    @abstractmethod
+    def failures_per_week(self) -> List[WeeklyCount]:
+        """Failure counts per service per ISO week, ordered by week then service."""
+
+
+class JsonlEvidenceStore(EvidenceStore):
+    """The JSONL evidence log (see ``src.evidence``) as an EvidenceStore."""
+
+    def __init__(self, path: str, durability: str = "flush", **writer_options):
+        self.path = path
+        self._writer = EvidenceWriter(path, durability=durability, **writer_options)
+
+    def append(self, event: EvidenceEvent) -> None:
+        self._writer.append(event)
+
+    def flush(self) -> None:
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def read(self) -> List[EvidenceEvent]:
+        self.flush()
+        return list(iter_events(self.path))
+
+    def query(self, service=None, since=None, until=None) -> List[EvidenceEvent]:
+        self.flush()
+        return query_events(self.path, service=service, since=since, until=until)
+
+    def failures_per_week(self) -> List[WeeklyCount]:
+        self.flush()
+        counts = {}
+        for event in iter_events(self.path):
+            if event.outcome not in FAILURE_OUTCOMES:
+                continue
+            epoch = epoch_or_missing(event.ts)
+            if epoch < 0:
+                continue
+            day = datetime.fromtimestamp(epoch, timezone.utc).date()
+            week = (day - timedelta(days=day.weekday())).isoformat()
+            counts[(week, event.service)] = counts.get((week, event.service), 0) + 1
+        return [(service, week, n) for (week, service), n in sorted(counts.items())]
+
+
+class SqliteEvidenceStore(EvidenceStore):
+    """Evidence in a SQLite database.
+
+    The database runs in WAL mode so dashboards can read while planners
+    write. Appends are buffered and inserted ``batch_size`` at a time in a
+    single transaction. ``(service, ts)`` and ``outcome`` are indexed.
+
+    Args:
+        path: Database file; created with its schema if missing.
+        durability: One of DURABILITY_MODES, mapped to ``PRAGMA
+            synchronous`` OFF, NORMAL, or FULL.
+        batch_size: Buffered events that trigger an insert transaction.
+    """
+
+    _SYNCHRONOUS = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL"}
+
+    def __init__(self, path: str, durability: str = "flush", batch_size: int = 1000):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"unknown durability mode: {durability!r} "
+                f"(expected one of {', '.join(DURABILITY_MODES)})"
+            )
+        parent = os.path.dirname(path)
+        if parent and not os.path.isdir(parent):
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[tuple] = []
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self._SYNCHRONOUS[durability]}")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def append(self, event: EvidenceEvent) -> None:
+        self._pending.append(_event_row(event))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def append_many(self, events: Iterable[EvidenceEvent]) -> int:
+        count = 0
+        for event in events:
+            self.append(event)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(_INSERT, self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def read(self) -> List[EvidenceEvent]:
+        self.flush()
+        return self._select("", ())
+
+    def count(self) -> int:
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def query(self, service=None, since=None, until=None) -> List[EvidenceEvent]:
+        self.flush()
+        clauses, params = [], []
+        if service is not None:
+            clauses.append("service = ?")
+            params.append(service)
+        if since is not None:
+            clauses.append("ts_epoch >= ?")
+            params.append(to_epoch(since))
+        if until is not None:
+            clauses.append("ts_epoch < ?")
+            params.append(to_epoch(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(where, params)
+
+    def failures_per_week(self) -> List[WeeklyCount]:
+        self.flush()
+        marks = ", ".join("?" for _ in FAILURE_OUTCOMES)
+        rows = self._conn.execute(
+            f"""
+            SELECT service,
+                   date(ts_epoch, 'unixepoch', 'weekday 0', '-6 days') AS week,
+                   COUNT(*)
+            FROM events
+            WHERE outcome IN ({marks}) AND ts_epoch >= 0
+            GROUP BY week, service
+            ORDER BY week, service
+            """,
+            FAILURE_OUTCOMES,
+        )
+        return [(service, week, count) for service, week, count in rows]
+
+    def _select(self, where: str, params) -> List[EvidenceEvent]:
+        rows = self._conn.execute(
+            "SELECT ts, service, profile, scenarios, interpretation, outcome "
+            f"FROM events {where} ORDER BY id",
+            params,
+        )
+        return [
+            EvidenceEvent(
+                ts=ts,
+                service=service,
+                profile=profile,
+                scenarios=json.loads(scenarios),
+                interpretation=bool(interpretation),
+                outcome=outcome,
+            )
+            for ts, service, profile, scenarios, interpretation, outcome in rows
+        ]
+
+
+def open_store(path: str, durability: str = "flush") -> EvidenceStore:
+    """Open the evidence store at ``path``: SQLite for SQLITE_SUFFIXES, else JSONL."""
+    if os.path.splitext(path)[1].lower() in SQLITE_SUFFIXES:
+        return SqliteEvidenceStore(path, durability=durability)
+    return JsonlEvidenceStore(path, durability=durability)
+
+
+def migrate(
+    source: str, target: EvidenceStore, rejected: Optional[List[str]] = None
+) -> int:
+    """Bulk-load every event of the JSONL log ``source`` into ``target``.
+
+    Events are streamed (rotated segments first), so memory use does not
+    grow with the log. The target must be empty, so running a migration
+    twice cannot duplicate events.
+
+    Args:
+        source: JSONL evidence log.
+        target: Empty store to load into.
+        rejected: If given, events with missing or mistyped fields are
+            skipped and described here. Otherwise the first one raises.
+
+    Returns:
+        Number of events copied.
+
+    Raises:
+        FileNotFoundError: If neither ``source`` nor any rotated segment of
+            it exists.
+        ValueError: If ``target`` already holds events, or an event is
+            invalid and ``rejected`` is None.
+    """
+    if not log_exists(source):
+        raise FileNotFoundError(f"evidence log not found: {source}")
+    existing = target.count()
+    if existing:
+        raise ValueError(
+            f"migration target already holds {existing} event(s); "
+            "migrate into a new store"
+        )
+    return target.append_many(_valid_events(iter_events(source), rejected))
+
+
+# -- internal helpers ---------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    ts_epoch INTEGER NOT NULL,
+    service TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    scenarios TEXT NOT NULL,
+    interpretation INTEGER NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_service_ts ON events (service, ts_epoch);
+CREATE INDEX IF NOT EXISTS events_outcome ON events (outcome);
+"""
+
+_INSERT = (
+    "INSERT INTO events "
+    "(ts, ts_epoch, service, profile, scenarios, interpretation, outcome) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+_TEXT_FIELDS = ("ts", "service", "profile", "outcome")
+
+
+def _valid_events(
+    events: Iterable[EvidenceEvent], rejected: Optional[List[str]]
+) -> Iterator[EvidenceEvent]:
+    for index, event in enumerate(events, start=1):
+        problems = [
+            f"'{name}' must be a string" for name in _TEXT_FIELDS
+            if not isinstance(getattr(event, name), str)
+        ]
+        if not isinstance(event.scenarios, list):
+            problems.append("'scenarios' must be a list")
+        if not problems:
+            yield event
+            continue
+        message = f"event {index}: {'; '.join(problems)}"
+        if rejected is None:
+            raise ValueError(message)
+        rejected.append(message)
+
+
+def _event_row(event: EvidenceEvent) -> tuple:
+    return (
+        event.ts,
+        epoch_or_missing(event.ts),
+        event.service,
+        event.profile,
+        json.dumps(event.scenarios),
+        int(bool(event.interpretation)),
+        event.outcome,
+    )
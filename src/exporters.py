@@ -0,0 +1,427 @@
+"""Export load test plans as executable k6, Locust, and JMeter scripts.
+
+Each exporter turns a LoadTestPlan (plus the profile's endpoints, which the
+plan itself does not carry) into the text of a script for one tool. Exporters
+are looked up by name in a registry, so new backends can be added with
+``register_exporter``.
+
+Stage semantics match the generator: each stage ramps linearly from the
+previous stage's ``target_rps`` to its own. Plan checks are mapped to each
+tool's native pass/fail mechanism where one exists; checks on metrics the
+tool cannot observe (CPU, memory) are listed as comments instead.
+"""
+
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.models import Check, Endpoint, LoadTestPlan, Scenario
+
+ExportFunc = Callable[[LoadTestPlan, List[Endpoint]], str]
+
+
+class ExportError(Exception):
+    """Raised when a plan cannot be exported."""
+
+
+@dataclass
+class Exporter:
+    name: str
+    extension: str
+    func: ExportFunc
+
+
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(name: str, extension: str) -> Callable[[ExportFunc], ExportFunc]:
+    """Decorator registering an export function under ``name``."""
+    def decorator(func: ExportFunc) -> ExportFunc:
+        EXPORTERS[name] = Exporter(name=name, extension=extension, func=func)
+        return func
+    return decorator
+
+
+def export_plan(
+    plan: LoadTestPlan, fmt: str, endpoints: Optional[List[Endpoint]] = None
+) -> str:
+    """Render a plan as a script for the named tool.
+
+    Args:
+        plan: The plan to export.
+        fmt: Registered exporter name, e.g. ``"k6"``.
+        endpoints: Endpoints to exercise, weighted by ``Endpoint.weight``.
+            Defaults to a single ``GET /``.
+
+    Returns:
+        The script text.
+
+    Raises:
+        ExportError: If ``fmt`` is not a registered exporter.
+    """
+    exporter = EXPORTERS.get(fmt)
+    if exporter is None:
+        raise ExportError(
+            f"unknown export format: {fmt} (expected one of {', '.join(sorted(EXPORTERS))})"
+        )
+    active = [e for e in endpoints or [] if e.weight > 0]
+    return exporter.func(plan, active or [Endpoint(path="/", method="GET")])
+
+
+def export_filename(service: str, fmt: str) -> str:
+    """Conventional output filename for an exported script."""
+    return f"{service}{EXPORTERS[fmt].extension}"
+
+
+# -- shared helpers -----------------------------------------------------------
+
+
+_PERCENTILE_RE = re.compile(r"^latency_p(\d+(?:\.\d+)?)$")
+
+
+def _latency_percentile(check: Check) -> Optional[str]:
+    match = _PERCENTILE_RE.match(check.metric)
+    return match.group(1) if match else None
+
+
+def _stage_rows(scenario: Scenario) -> List[tuple]:
+    """(start_s, duration_s, start_rps, end_rps) for each stage."""
+    rows = []
+    start = 0
+    prev = 0
+    for stage in scenario.stages:
+        target = stage.target_rps or 0
+        rows.append((start, stage.duration_seconds, prev, target))
+        start += stage.duration_seconds
+        prev = target
+    return rows
+
+
+def _scenario_duration(scenario: Scenario) -> int:
+    return sum(s.duration_seconds for s in scenario.stages)
+
+
+def _estimate_vus(scenario: Scenario) -> int:
+    """Concurrency needed to sustain the peak rate (Little's law).
+
+    Uses the loosest latency check as the expected response time, with a
+    1 second default when the scenario has no latency checks.
+    """
+    peak = max((s.target_rps or 0 for s in scenario.stages), default=0)
+    latencies = [c.threshold for c in scenario.checks if _latency_percentile(c)]
+    response_s = max(latencies) / 1000.0 if latencies else 1.0
+    return max(1, math.ceil(peak * response_s))
+
+
+def _one_line(value) -> str:
+    """``value`` with line breaks collapsed, safe inside a line comment."""
+    return " ".join(str(value).split())
+
+
+def _docstring_text(value) -> str:
+    """``value`` on one line, escaped to read back verbatim from a docstring."""
+    return _one_line(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _unmapped(checks: List[Check], mapped: List[Check]) -> List[Check]:
+    return [c for c in checks if not any(c is m for m in mapped)]
+
+
+# -- k6 -----------------------------------------------------------------------
+
+
+@register_exporter("k6", ".k6.js")
+def export_k6(plan: LoadTestPlan, endpoints: List[Endpoint]) -> str:
+    """k6 script running each scenario with a ramping-arrival-rate executor.
+
+    Scenarios run back to back via ``startTime``. Latency checks become
+    ``http_req_duration`` percentile thresholds and error-rate checks become
+    ``http_req_failed`` rate thresholds, both scoped with a scenario tag.
+    """
+    scenarios = {}
+    thresholds: Dict[str, List[str]] = {}
+    unmapped = []
+    start = 0
+    for scenario in plan.scenarios:
+        vus = _estimate_vus(scenario)
+        scenarios[scenario.name] = {
+            "executor": "ramping-arrival-rate",
+            "startTime": f"{start}s",
+            "startRate": 0,
+            "timeUnit": "1s",
+            "preAllocatedVUs": vus,
+            "maxVUs": vus * 2,
+            "stages": [
+                {"duration": f"{s.duration_seconds}s", "target": s.target_rps or 0}
+                for s in scenario.stages
+            ],
+        }
+        start += _scenario_duration(scenario)
+
+        mapped = []
+        for check in scenario.checks:
+            pct = _latency_percentile(check)
+            if pct is not None:
+                key = f"http_req_duration{{scenario:{scenario.name}}}"
+                expr = f"p({pct}){check.operator}{check.threshold:g}"
+            elif check.metric == "error_rate":
+                key = f"http_req_failed{{scenario:{scenario.name}}}"
+                expr = f"rate{check.operator}{check.threshold:g}"
+            else:
+                continue
+            thresholds.setdefault(key, []).append(expr)
+            mapped.append(check)
+        unmapped.extend(
+            f"{scenario.name}: {c.metric} {c.operator} {c.threshold:g}"
+            for c in _unmapped(scenario.checks, mapped)
+        )
+
+    options = {"scenarios": scenarios, "thresholds": thresholds}
+    targets = [
+        {"method": e.method.upper(), "path": e.path, "weight": e.weight} for e in endpoints
+    ]
+    lines = [
+        f"// k6 script generated from the {_one_line(plan.service)} load test plan.",
+        f"// Source profile: {_one_line(plan.profile_path)}",
+    ]
+    if unmapped:
+        lines.append("// Checks not enforceable by k6 (verify with interpret-cmd):")
+        lines.extend(f"//   {_one_line(u)}" for u in unmapped)
+    lines += [
+        "import http from 'k6/http';",
+        "",
+        "const BASE_URL = __ENV.BASE_URL || 'http://localhost:8080';",
+        f"const ENDPOINTS = {json.dumps(targets, indent=2)};",
+        "const TOTAL_WEIGHT = ENDPOINTS.reduce((sum, e) => sum + e.weight, 0);",
+        "",
+        f"export const options = {json.dumps(options, indent=2)};",
+        "",
+        "function pickEndpoint() {",
+        "  let r = Math.random() * TOTAL_WEIGHT;",
+        "  for (const e of ENDPOINTS) {",
+        "    r -= e.weight;",
+        "    if (r < 0) return e;",
+        "  }",
+        "  return ENDPOINTS[ENDPOINTS.length - 1];",
+        "}",
+        "",
+        "export default function () {",
+        "  const e = pickEndpoint();",
+        "  http.request(e.method, BASE_URL + e.path, null, { tags: { name: e.path } });",
+        "}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# -- Locust -------------------------------------------------------------------
+
+
+_LOCUST_TEMPLATE = '''\
+"""Locust script generated from the {service_doc} load test plan.
+
+Source profile: {profile_path_doc}
+
+Each simulated user sends one request per second (constant_throughput), so
+the shape's user count equals the target arrival rate. Choose a scenario with
+PLAN_SCENARIO (default: {default_scenario_doc}); its checks decide the exit code.
+"""
+
+import os
+
+from locust import HttpUser, LoadTestShape, constant_throughput, events
+
+SCENARIOS = {scenarios}
+ENDPOINTS = {endpoints}
+SCENARIO = os.environ.get("PLAN_SCENARIO", {default_scenario})
+
+
+def _make_task(method, path):
+    def _task(user):
+        user.client.request(method, path, name=path)
+    return _task
+
+
+class PlanUser(HttpUser):
+    wait_time = constant_throughput(1)
+    tasks = {{_make_task(m, p): w for m, p, w in ENDPOINTS}}
+
+
+class PlanShape(LoadTestShape):
+    def tick(self):
+        stages = SCENARIOS[SCENARIO]["stages"]
+        t = self.get_run_time()
+        for start, duration, start_rps, end_rps in stages:
+            if t < start + duration:
+                frac = (t - start) / duration if duration else 1.0
+                users = start_rps + (end_rps - start_rps) * frac
+                return max(int(round(users)), 1), max(end_rps, start_rps, 1)
+        return None
+
+
+_OPS = {{
+    "<=": lambda a, b: a <= b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    ">": lambda a, b: a > b,
+}}
+
+
+@events.quitting.add_listener
+def _enforce_checks(environment, **_kwargs):
+    stats = environment.stats.total
+    failed = []
+    for kind, arg, op, threshold in SCENARIOS[SCENARIO]["checks"]:
+        if kind == "percentile":
+            value = stats.get_response_time_percentile(arg)
+        else:
+            value = stats.fail_ratio
+        if not _OPS[op](value, threshold):
+            failed.append(f"{{kind}} {{arg}}: {{value}} not {{op}} {{threshold}}")
+    for line in failed:
+        print(f"CHECK FAILED: {{line}}")
+    if failed:
+        environment.process_exit_code = 1
+'''
+
+
+@register_exporter("locust", ".locustfile.py")
+def export_locust(plan: LoadTestPlan, endpoints: List[Endpoint]) -> str:
+    """Locust file with a LoadTestShape per scenario and exit-code checks.
+
+    Latency checks are evaluated against the run's response-time percentiles
+    and error-rate checks against ``fail_ratio`` when Locust quits.
+    """
+    scenarios = {}
+    for scenario in plan.scenarios:
+        checks = []
+        for check in scenario.checks:
+            pct = _latency_percentile(check)
+            if pct is not None:
+                checks.append(("percentile", float(pct) / 100.0, check.operator, check.threshold))
+            elif check.metric == "error_rate":
+                checks.append(("fail_ratio", None, check.operator, check.threshold))
+        scenarios[scenario.name] = {"stages": _stage_rows(scenario), "checks": checks}
+
+    min_weight = min(e.weight for e in endpoints)
+    weighted = [
+        (e.method.upper(), e.path, max(1, int(round(e.weight / min_weight)))) for e in endpoints
+    ]
+    default_scenario = plan.scenarios[0].name if plan.scenarios else ""
+    return _LOCUST_TEMPLATE.format(
+        service_doc=_docstring_text(plan.service),
+        profile_path_doc=_docstring_text(plan.profile_path),
+        default_scenario_doc=_docstring_text(default_scenario),
+        default_scenario=repr(default_scenario),
+        scenarios=repr(scenarios),
+        endpoints=repr(weighted),
+    )
+
+
+# -- JMeter -------------------------------------------------------------------
+
+
+def _prop(parent: ET.Element, kind: str, name: str, value=None) -> ET.Element:
+    el = ET.SubElement(parent, kind, name=name)
+    if value is not None:
+        el.text = str(value).lower() if isinstance(value, bool) else str(value)
+    return el
+
+
+def _test_element(tree: ET.Element, tag: str, gui: str, name: str) -> ET.Element:
+    el = ET.SubElement(tree, tag, guiclass=gui, testclass=tag, testname=name, enabled="true")
+    return el
+
+
+@register_exporter("jmeter", ".jmx")
+def export_jmeter(plan: LoadTestPlan, endpoints: List[Endpoint]) -> str:
+    """JMeter test plan with one thread group per scenario, run serially.
+
+    Stage rates are driven by the Throughput Shaping Timer
+    (``kg.apc.jmeter.timers.VariableThroughputTimer`` from JMeter Plugins).
+    JMeter has no native percentile thresholds, so the loosest latency check
+    becomes a per-sample DurationAssertion; percentile and error-rate checks
+    are recorded as user-defined variables for post-run evaluation.
+    """
+    root = ET.Element("jmeterTestPlan", version="1.2", properties="5.0", jmeter="5.6")
+    top = ET.SubElement(root, "hashTree")
+    test_plan = _test_element(top, "TestPlan", "TestPlanGui", f"{plan.service} load test plan")
+    _prop(test_plan, "stringProp", "TestPlan.comments", f"Source profile: {plan.profile_path}")
+    _prop(test_plan, "boolProp", "TestPlan.serialize_threadgroups", True)
+    variables = _prop(test_plan, "elementProp", "TestPlan.user_defined_variables")
+    variables.set("elementType", "Arguments")
+    args = _prop(variables, "collectionProp", "Arguments.arguments")
+    plan_tree = ET.SubElement(top, "hashTree")
+
+    total_weight = sum(e.weight for e in endpoints)
+    for scenario in plan.scenarios:
+        for check in scenario.checks:
+            arg = _prop(args, "elementProp", f"{scenario.name}.{check.metric}")
+            arg.set("elementType", "Argument")
+            _prop(arg, "stringProp", "Argument.name", f"{scenario.name}.{check.metric}")
+            _prop(arg, "stringProp", "Argument.value", f"{check.operator}{check.threshold:g}")
+
+        group = _test_element(plan_tree, "ThreadGroup", "ThreadGroupGui", scenario.name)
+        _prop(group, "stringProp", "ThreadGroup.on_sample_error", "continue")
+        _prop(group, "stringProp", "ThreadGroup.num_threads", _estimate_vus(scenario))
+        _prop(group, "stringProp", "ThreadGroup.ramp_time", 0)
+        _prop(group, "boolProp", "ThreadGroup.scheduler", True)
+        _prop(group, "stringProp", "ThreadGroup.duration", _scenario_duration(scenario))
+        loop = _prop(group, "elementProp", "ThreadGroup.main_controller")
+        loop.set("elementType", "LoopController")
+        _prop(loop, "boolProp", "LoopController.continue_forever", False)
+        _prop(loop, "intProp", "LoopController.loops", -1)
+        group_tree = ET.SubElement(plan_tree, "hashTree")
+
+        timer = _test_element(
+            group_tree,
+            "kg.apc.jmeter.timers.VariableThroughputTimer",
+            "kg.apc.jmeter.timers.VariableThroughputTimerGui",
+            f"{scenario.name} arrival rate",
+        )
+        profile = _prop(timer, "collectionProp", "load_profile")
+        for i, (_, duration, start_rps, end_rps) in enumerate(_stage_rows(scenario)):
+            row = _prop(profile, "collectionProp", str(i))
+            _prop(row, "stringProp", "start", start_rps)
+            _prop(row, "stringProp", "end", end_rps)
+            _prop(row, "stringProp", "duration", duration)
+        ET.SubElement(group_tree, "hashTree")
+
+        latency = [c for c in scenario.checks if _latency_percentile(c)]
+        if latency:
+            loosest = max(latency, key=lambda c: c.threshold)
+            assertion = _test_element(
+                group_tree, "DurationAssertion", "DurationAssertionGui",
+                f"{loosest.metric} {loosest.operator} {loosest.threshold:g} ms",
+            )
+            _prop(assertion, "stringProp", "DurationAssertion.duration", int(loosest.threshold))
+            ET.SubElement(group_tree, "hashTree")
+
+        for endpoint in endpoints:
+            share = _test_element(
+                group_tree, "ThroughputController", "ThroughputControllerGui",
+                f"{endpoint.method.upper()} {endpoint.path} share",
+            )
+            _prop(share, "intProp", "ThroughputController.style", 1)
+            _prop(share, "boolProp", "ThroughputController.perThread", False)
+            percent = ET.SubElement(share, "FloatProperty")
+            ET.SubElement(percent, "name").text = "ThroughputController.percentThroughput"
+            ET.SubElement(percent, "value").text = f"{100.0 * endpoint.weight / total_weight:.2f}"
+            ET.SubElement(percent, "savedValue").text = "0.0"
+            share_tree = ET.SubElement(group_tree, "hashTree")
+
+            sampler = _test_element(
+                share_tree, "HTTPSamplerProxy", "HttpTestSampleGui",
+                f"{endpoint.method.upper()} {endpoint.path}",
+            )
+            _prop(sampler, "stringProp", "HTTPSampler.protocol", "${__P(protocol,http)}")
+            _prop(sampler, "stringProp", "HTTPSampler.domain", "${__P(host,localhost)}")
+            _prop(sampler, "stringProp", "HTTPSampler.port", "${__P(port,8080)}")
+            _prop(sampler, "stringProp", "HTTPSampler.path", endpoint.path)
+            _prop(sampler, "stringProp", "HTTPSampler.method", endpoint.method.upper())
+            ET.SubElement(share_tree, "hashTree")
+
+    ET.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding="unicode") + "\n"
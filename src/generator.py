@@ -1,9 +1,8 @@
 """Generate load test plans from a validated service profile."""
 
-import json
-from dataclasses import asdict
-from typing import List
+from typing import IO, List, Optional
 
+from src import serialize
 from src.models import (
     Check,
     LoadTestPlan,
@@ -40,12 +39,17 @@ def generate_plan(profile: ServiceProfile, profile_path: str) -> LoadTestPlan:
 
 def plan_to_dict(plan: LoadTestPlan) -> dict:
     """Convert a LoadTestPlan to a plain dict suitable for JSON serialization."""
-    return asdict(plan)
+    return serialize.to_dict(plan)
 
 
-def plan_to_json(plan: LoadTestPlan, indent: int = 2) -> str:
-    """Serialize a LoadTestPlan to a JSON string."""
-    return json.dumps(plan_to_dict(plan), indent=indent)
+def plan_to_json(plan: LoadTestPlan, indent: Optional[int] = 2) -> str:
+    """Serialize a LoadTestPlan to a JSON string (compact if ``indent`` is None)."""
+    return serialize.dumps(plan, indent=indent)
+
+
+def write_plan_json(plan: LoadTestPlan, fp: IO[str], indent: Optional[int] = 2) -> None:
+    """Stream a LoadTestPlan as JSON into the text file ``fp``."""
+    serialize.dump(plan, fp, indent=indent)
 
 
 # -- scenario builders --------------------------------------------------------
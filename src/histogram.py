@@ -0,0 +1,197 @@
+"""Log-bucketed latency histogram for streaming percentile estimation.
+
+Values are counted in buckets whose bounds grow geometrically by
+``1 + precision``, in the spirit of HDR histograms: memory is fixed by the
+layout (a few thousand counters for 1 microsecond to 1 hour at 1%), any
+percentile can be read back with at most ``precision / 2`` relative error,
+and recording a batch of samples is a single ``np.bincount``.
+
+Histograms with the same layout merge exactly by adding their counts, so
+each load-generator node can dump its histogram (``to_dict``) and the
+fleet-wide percentiles come from the merged counts rather than from
+averaging per-node percentiles, which is not meaningful.
+"""
+
+import math
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+HISTOGRAM_FORMAT = "latency-histogram"
+HISTOGRAM_VERSION = 1
+
+
+class LatencyHistogram:
+    """Fixed-layout histogram of latencies in milliseconds.
+
+    Bucket 0 holds values below ``lowest_ms``; bucket ``i >= 1`` holds
+    ``[lowest * (1+p)**(i-1), lowest * (1+p)**i)``. Values above
+    ``highest_ms`` are clamped into the last bucket. The exact minimum and
+    maximum are tracked separately so extreme percentiles stay exact.
+    """
+
+    def __init__(
+        self,
+        lowest_ms: float = 0.001,
+        highest_ms: float = 3_600_000.0,
+        precision: float = 0.01,
+    ):
+        if not (0 < lowest_ms < highest_ms):
+            raise ValueError("expected 0 < lowest_ms < highest_ms")
+        if not (0 < precision < 1):
+            raise ValueError("precision must be between 0 and 1")
+        self.lowest_ms = float(lowest_ms)
+        self.highest_ms = float(highest_ms)
+        self.precision = float(precision)
+        self._log_base = math.log1p(self.precision)
+        n = int(math.ceil(math.log(self.highest_ms / self.lowest_ms) / self._log_base)) + 2
+        self.counts = np.zeros(n, dtype=np.int64)
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = -math.inf
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def layout(self) -> Tuple[float, float, float]:
+        """``(lowest_ms, highest_ms, precision)``; histograms merge only with equal layouts."""
+        return (self.lowest_ms, self.highest_ms, self.precision)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s counts into this histogram and return it.
+
+        Raises:
+            ValueError: If the layouts differ.
+        """
+        _check_layouts(self, [other])
+        self.counts += other.counts
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    def to_dict(self) -> dict:
+        """JSON-ready dump: layout, totals, and counts from the first to the last used bucket."""
+        used = np.flatnonzero(self.counts)
+        start, stop = (int(used[0]), int(used[-1]) + 1) if used.size else (0, 0)
+        return {
+            "format": HISTOGRAM_FORMAT,
+            "version": HISTOGRAM_VERSION,
+            "layout": {
+                "lowest_ms": self.lowest_ms,
+                "highest_ms": self.highest_ms,
+                "precision": self.precision,
+            },
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "min_ms": self.min_ms if used.size else None,
+            "max_ms": self.max_ms if used.size else None,
+            "offset": start,
+            "counts": self.counts[start:stop].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, doc: dict) -> "LatencyHistogram":
+        """Rebuild a histogram dumped by ``to_dict``.
+
+        Raises:
+            ValueError: If ``doc`` is not a histogram dump this version reads.
+        """
+        if not isinstance(doc, dict) or doc.get("format") != HISTOGRAM_FORMAT:
+            raise ValueError(f"not a {HISTOGRAM_FORMAT} document")
+        if doc.get("version") != HISTOGRAM_VERSION:
+            raise ValueError(f"unsupported histogram version: {doc.get('version')!r}")
+        try:
+            hist = cls(**doc["layout"])
+            counts = np.asarray(doc["counts"], dtype=np.int64)
+            offset = int(doc["offset"])
+            if offset < 0 or offset + counts.size > hist.counts.size or (counts < 0).any():
+                raise ValueError("counts do not fit the layout")
+            hist.counts[offset:offset + counts.size] = counts
+            hist.total_ms = float(doc["total_ms"])
+            if counts.any():
+                hist.min_ms = float(doc["min_ms"])
+                hist.max_ms = float(doc["max_ms"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"malformed histogram: {exc!r}") from exc
+        return hist
+
+    def record(self, values) -> None:
+        """Add one latency or an array of latencies (ms). NaNs are ignored."""
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+        self.counts += np.bincount(self._bucket_index(arr), minlength=len(self.counts))
+        self.total_ms += float(arr.sum())
+        self.min_ms = min(self.min_ms, float(arr.min()))
+        self.max_ms = max(self.max_ms, float(arr.max()))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) in ms, or None if empty."""
+        total = self.count
+        if total == 0:
+            return None
+        if q <= 0:
+            return self.min_ms
+        if q >= 100:
+            return self.max_ms
+        rank = max(1, int(math.ceil(q / 100.0 * total)))
+        idx = int(np.searchsorted(np.cumsum(self.counts), rank))
+        if idx == len(self.counts) - 1:
+            return self.max_ms  # overflow bucket: only the exact max is known
+        value = self._bucket_value(idx)
+        return min(max(value, self.min_ms), self.max_ms)
+
+    def mean(self) -> Optional[float]:
+        total = self.count
+        return self.total_ms / total if total else None
+
+    def _bucket_index(self, arr: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            idx = np.floor(np.log(arr / self.lowest_ms) / self._log_base) + 1
+        idx[arr < self.lowest_ms] = 0
+        return np.clip(idx, 0, len(self.counts) - 1).astype(np.intp)
+
+    def _bucket_value(self, idx: int) -> float:
+        """Geometric midpoint of a bucket."""
+        if idx == 0:
+            return self.lowest_ms
+        return self.lowest_ms * math.exp((idx - 0.5) * self._log_base)
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """Merge histograms with the same layout into a new one.
+
+    Bucket arrays are added into one accumulator, a single vectorized add
+    per histogram; 1,000 default-layout histograms merge in a few
+    milliseconds. Merging is associative and commutative, so per-node
+    dumps can be merged in any grouping (per rack, then per fleet) with
+    the same result.
+
+    Raises:
+        ValueError: If ``histograms`` is empty or the layouts differ.
+    """
+    histograms = list(histograms)
+    if not histograms:
+        raise ValueError("nothing to merge")
+    first = histograms[0]
+    _check_layouts(first, histograms[1:])
+    merged = LatencyHistogram(*first.layout)
+    for h in histograms:
+        np.add(merged.counts, h.counts, out=merged.counts)
+    merged.total_ms = math.fsum(h.total_ms for h in histograms)
+    merged.min_ms = min(h.min_ms for h in histograms)
+    merged.max_ms = max(h.max_ms for h in histograms)
+    return merged
+
+
+def _check_layouts(first: LatencyHistogram, others: Iterable[LatencyHistogram]) -> None:
+    for other in others:
+        if other.layout != first.layout:
+            raise ValueError(
+                f"cannot merge histograms with different layouts: "
+                f"{first.layout} and {other.layout}"
+            )
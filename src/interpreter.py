@@ -4,9 +4,16 @@ import csv
 import io
 import json
 import os
-from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 
-from src.models import InterpretationResult, MetricsSummary, SLO
+from src.checks import compile_checks, summary_row
+from src.models import Check, InterpretationResult, MetricsSummary, SLO
+
+
+# Files at least this large (CSVs, k6 output) are parsed in worker processes
+# by load_metrics_many.
+LARGE_FILE_BYTES = 4 * 1024 * 1024
 
 
 class MetricsParseError(Exception):
@@ -14,7 +21,10 @@ class MetricsParseError(Exception):
 
 
 def load_metrics(path: str) -> Tuple[MetricsSummary, List[str]]:
-    """Load a metrics summary from JSON or CSV.
+    """Load a metrics summary from JSON or CSV, or summarise k6 JSON output.
+
+    k6 ``--out json`` files are recognised by a ``.ndjson`` extension or by
+    their first line, and streamed by ``src.k6``.
 
     Args:
         path: Path to the metrics file.
@@ -30,145 +40,140 @@ def load_metrics(path: str) -> Tuple[MetricsSummary, List[str]]:
         raise MetricsParseError(f"metrics file not found: {path}")
 
     ext = os.path.splitext(path)[1].lower()
-    if ext == ".json":
+    if ext in (".json", ".ndjson"):
+        from src.k6 import is_k6_output, load_k6
+
+        if is_k6_output(path):
+            return load_k6(path)
         return _load_json(path)
     elif ext == ".csv":
         return _load_csv(path)
     else:
         raise MetricsParseError(
-            f"unsupported metrics format: {ext} (expected .json or .csv)"
+            f"unsupported metrics format: {ext} (expected .json, .ndjson or .csv)"
         )
 
 
-def interpret(metrics: MetricsSummary, slo: SLO) -> InterpretationResult:
+def load_metrics_many(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    large_file_bytes: int = LARGE_FILE_BYTES,
+) -> List[Tuple[MetricsSummary, List[str]]]:
+    """Load many metrics files concurrently, e.g. one per load-generator node.
+
+    Small files are read by a thread pool, since their cost is mostly
+    opening and reading. Files of ``large_file_bytes`` or more (large CSVs,
+    k6 output) are parsed in a process pool, where the parsing is not
+    serialized by the GIL.
+
+    Args:
+        paths: Metrics files (JSON or CSV).
+        workers: Threads and processes per pool. ``None`` uses the executor
+            defaults; ``1`` loads every file in the current thread.
+        large_file_bytes: Size from which a file goes to the process pool.
+
+    Returns:
+        One ``(MetricsSummary, warnings)`` tuple per path, in input order.
+
+    Raises:
+        MetricsParseError: For the first file (in input order) that cannot
+            be read or parsed; the message names the file.
+    """
+    paths = list(paths)
+    if workers == 1 or len(paths) <= 1:
+        outcomes = [_try_load(path) for path in paths]
+    else:
+        outcomes = _load_concurrently(paths, workers, large_file_bytes)
+
+    results = []
+    for path, outcome in zip(paths, outcomes):
+        if isinstance(outcome, MetricsParseError):
+            raise MetricsParseError(f"{path}: {outcome}")
+        results.append(outcome)
+    return results
+
+
+def interpret(
+    metrics: MetricsSummary,
+    slo: SLO,
+    checks: Optional[List[Check]] = None,
+) -> InterpretationResult:
     """Evaluate a MetricsSummary against an SLO and produce a narrative.
 
     Args:
         metrics: Parsed metrics summary.
         slo: SLO thresholds from the service profile.
+        checks: Checks to evaluate instead of the ones derived from ``slo``,
+            e.g. a scenario's checks from a generated plan.
 
     Returns:
         An InterpretationResult with status, narrative, check details, and risks.
     """
-    checks = []
-    risks = []
-    any_fail = False
-
-    # Latency checks
-    latency_fields = {
-        "p95": metrics.p95_ms,
-        "p99": metrics.p99_ms,
-    }
-    for pct, value in latency_fields.items():
-        threshold = slo.latency_ms.get(pct)
-        if threshold is None:
-            continue
-        if value is None:
-            checks.append({
-                "metric": f"latency_{pct}",
-                "result": "skip",
-                "detail": f"{pct} latency not provided in metrics",
-            })
-            continue
-        passed = value <= threshold
-        checks.append({
-            "metric": f"latency_{pct}",
-            "result": "pass" if passed else "fail",
-            "detail": f"{pct} latency: {value:.1f} ms (threshold: {threshold} ms)",
-        })
-        if not passed:
-            any_fail = True
-
-    # Error rate check
-    if metrics.error_rate is not None:
-        passed = metrics.error_rate <= slo.error_rate
-        checks.append({
-            "metric": "error_rate",
-            "result": "pass" if passed else "fail",
-            "detail": (
-                f"error rate: {metrics.error_rate * 100:.2f}% "
-                f"(threshold: {slo.error_rate * 100:.1f}%)"
-            ),
-        })
-        if not passed:
-            any_fail = True
-    else:
-        checks.append({
-            "metric": "error_rate",
-            "result": "skip",
-            "detail": "error rate not provided in metrics",
-        })
-
-    # Resource saturation risks
-    if metrics.cpu_percent is not None and metrics.cpu_percent > 80:
-        risks.append(f"High CPU usage: {metrics.cpu_percent:.0f}%")
-    if metrics.memory_percent is not None and metrics.memory_percent > 80:
-        risks.append(f"High memory usage: {metrics.memory_percent:.0f}%")
-    if metrics.gc_pause_ms is not None and metrics.gc_pause_ms > 100:
-        risks.append(f"Elevated GC pause: {metrics.gc_pause_ms:.0f} ms")
+    engine = compile_checks(slo_checks(slo) if checks is None else checks)
+    results = engine.evaluate_summary(metrics)
+    risks = resource_risks(metrics)
 
+    any_fail = any(c["result"] == "fail" for c in results)
     status = "fail" if any_fail else ("warning" if risks else "pass")
-    narrative = _build_narrative(status, checks, risks, metrics)
+    narrative = build_narrative(status, results, risks, metrics)
 
     return InterpretationResult(
         status=status,
         narrative=narrative,
-        checks=checks,
+        checks=results,
         risks=risks,
     )
 
 
-# -- internal helpers ---------------------------------------------------------
-
-
-_METRIC_FIELDS = [
+def slo_checks(slo: SLO) -> List[Check]:
+    """The checks ``interpret`` applies by default: p95/p99 latency and error rate."""
+    checks = [
+        Check(
+            metric=f"latency_{pct}",
+            operator="<=",
+            threshold=slo.latency_ms[pct],
+            description=f"{pct} latency within SLO",
+        )
+        for pct in ("p95", "p99")
+        if slo.latency_ms.get(pct) is not None
+    ]
+    checks.append(Check(
+        metric="error_rate",
+        operator="<=",
+        threshold=slo.error_rate,
+        description="Error rate within SLO",
+    ))
+    return checks
+
+
+# Fields of a metrics summary, in MetricsSummary order.
+METRIC_FIELDS = (
     "p50_ms", "p90_ms", "p95_ms", "p99_ms",
     "error_rate", "throughput_rps",
     "cpu_percent", "memory_percent", "gc_pause_ms",
+)
+
+# Resource saturation that does not by itself fail an SLO, as checks that
+# must hold plus the risk message emitted when they do not.
+_RISK_RULES = [
+    (Check("cpu_percent", "<=", 80, "CPU below saturation"), "High CPU usage: {:.0f}%"),
+    (Check("memory_percent", "<=", 80, "Memory below saturation"), "High memory usage: {:.0f}%"),
+    (Check("gc_pause_ms", "<=", 100, "GC pauses short"), "Elevated GC pause: {:.0f} ms"),
 ]
+_RISK_ENGINE = compile_checks([check for check, _ in _RISK_RULES])
 
 
-def _load_json(path: str) -> Tuple[MetricsSummary, List[str]]:
-    try:
-        with open(path, "r") as f:
-            raw = json.load(f)
-    except json.JSONDecodeError as exc:
-        raise MetricsParseError(f"failed to parse JSON: {exc}") from exc
+def metrics_from_dict(raw: dict) -> Tuple[MetricsSummary, List[str]]:
+    """Build a MetricsSummary from a mapping of METRIC_FIELDS to values.
 
-    if not isinstance(raw, dict):
-        raise MetricsParseError("metrics JSON must be an object at top level")
-
-    return _dict_to_metrics(raw)
-
-
-def _load_csv(path: str) -> Tuple[MetricsSummary, List[str]]:
-    try:
-        with open(path, "r") as f:
-            content = f.read()
-    except OSError as exc:
-        raise MetricsParseError(f"failed to read CSV: {exc}") from exc
+    Missing and non-numeric values become None, each with a warning.
 
-    reader = csv.DictReader(io.StringIO(content))
-    rows = list(reader)
-    if not rows:
-        raise MetricsParseError("CSV file has no data rows")
-
-    # Use the first row
-    raw = {}
-    for key, val in rows[0].items():
-        key = key.strip()
-        if key in _METRIC_FIELDS:
-            try:
-                raw[key] = float(val)
-            except (ValueError, TypeError):
-                pass  # will be caught as a warning
-    return _dict_to_metrics(raw)
-
-
-def _dict_to_metrics(raw: dict) -> Tuple[MetricsSummary, List[str]]:
+    Returns:
+        Tuple of (MetricsSummary, list of warning strings).
+    """
     warnings = []
     kwargs = {}
-    for field_name in _METRIC_FIELDS:
+    for field_name in METRIC_FIELDS:
         val = raw.get(field_name)
         if val is None:
             warnings.append(f"missing field: {field_name}")
@@ -182,12 +187,38 @@ def _dict_to_metrics(raw: dict) -> Tuple[MetricsSummary, List[str]]:
     return MetricsSummary(**kwargs), warnings
 
 
-def _build_narrative(
+def risk_rules() -> List[Tuple[Check, str]]:
+    """Resource saturation rules as ``(check that must hold, message)`` pairs.
+
+    The message is a format string taking the offending value.
+    """
+    return list(_RISK_RULES)
+
+
+def resource_risks(metrics: MetricsSummary) -> List[str]:
+    """Flag resource saturation that does not by itself fail an SLO."""
+    passed, present, values = _RISK_ENGINE.evaluate(summary_row(metrics))
+    return [
+        message.format(values[i])
+        for i, (_, message) in enumerate(_RISK_RULES)
+        if present[i] and not passed[i]
+    ]
+
+
+def build_narrative(
     status: str,
     checks: List[dict],
     risks: List[str],
     metrics: MetricsSummary,
 ) -> str:
+    """The narrative text of an InterpretationResult.
+
+    Args:
+        status: ``"pass"``, ``"warning"`` or ``"fail"``.
+        checks: Check result dicts, as in ``InterpretationResult.checks``.
+        risks: Risk messages.
+        metrics: The summary that was judged (for throughput).
+    """
     lines = []
     if status == "pass":
         lines.append("All SLO checks passed.")
@@ -208,3 +239,81 @@ def _build_narrative(
             lines.append(f"  - {r}")
 
     return "\n".join(lines)
+
+
+# -- internal helpers ---------------------------------------------------------
+
+
+def _try_load(path: str):
+    """Worker: ``load_metrics(path)``, or the MetricsParseError it raised."""
+    try:
+        return load_metrics(path)
+    except MetricsParseError as exc:
+        return exc
+
+
+def _load_concurrently(paths: List[str], workers: Optional[int], large_file_bytes: int) -> list:
+    large = {i for i, path in enumerate(paths) if _file_size(path) >= large_file_bytes}
+    outcomes: list = [None] * len(paths)
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        pending = {
+            i: threads.submit(_try_load, path)
+            for i, path in enumerate(paths)
+            if i not in large
+        }
+        # The threads keep reading small files while large ones parse.
+        order = sorted(large)
+        if len(order) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as processes:
+                loaded = list(processes.map(_try_load, [paths[i] for i in order]))
+        else:
+            loaded = [_try_load(paths[i]) for i in order]
+        for i, outcome in zip(order, loaded):
+            outcomes[i] = outcome
+        for i, future in pending.items():
+            outcomes[i] = future.result()
+    return outcomes
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0  # load_metrics reports the missing file
+
+
+def _load_json(path: str) -> Tuple[MetricsSummary, List[str]]:
+    try:
+        with open(path, "r") as f:
+            raw = json.load(f)
+    except json.JSONDecodeError as exc:
+        raise MetricsParseError(f"failed to parse JSON: {exc}") from exc
+
+    if not isinstance(raw, dict):
+        raise MetricsParseError("metrics JSON must be an object at top level")
+
+    return metrics_from_dict(raw)
+
+
+def _load_csv(path: str) -> Tuple[MetricsSummary, List[str]]:
+    try:
+        with open(path, "r") as f:
+            content = f.read()
+    except OSError as exc:
+        raise MetricsParseError(f"failed to read CSV: {exc}") from exc
+
+    reader = csv.DictReader(io.StringIO(content))
+    rows = list(reader)
+    if not rows:
+        raise MetricsParseError("CSV file has no data rows")
+
+    # Use the first row
+    raw = {}
+    for key, val in rows[0].items():
+        key = key.strip()
+        if key in METRIC_FIELDS:
+            try:
+                raw[key] = float(val)
+            except (ValueError, TypeError):
+                pass  # will be caught as a warning
+    return metrics_from_dict(raw)
@@ -0,0 +1,295 @@
+"""Stream k6 ``--out json`` results into a summary and a per-second series.
+
+k6 writes one JSON object per line: ``Metric`` lines declare a metric and
+``Point`` lines carry one sample, e.g.::
+
+    {"type":"Point","data":{"time":"2024-05-09T14:34:45.625742514+02:00","value":459.86,"tags":{...}},"metric":"http_req_duration"}
+
+Runs reach tens of gigabytes, so the file is read in large chunks and only
+three metrics are kept: ``http_req_duration`` (into a latency histogram),
+``http_req_failed`` and ``iterations`` (into per-second counters). Lines
+are never split or decoded one by one: a regular expression finds the
+lines that end in one of the three metric names, which skips every other
+per-request metric in C, and only the time and value at the start of those
+lines are extracted. A chunk in which the marker count does not match
+(lines written in another key order) is re-read line by line with
+``json.loads``. Timestamps are bucketed to whole seconds through a cache,
+and values are converted in bulk with NumPy.
+"""
+
+import dataclasses
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.interpreter import MetricsParseError
+from src.models import MetricsSummary
+from src.samples import SampleStats
+from src.timeseries import MetricsSeries
+
+K6_EXTENSIONS = (".ndjson",)
+
+DURATION_METRIC = "http_req_duration"
+FAILED_METRIC = "http_req_failed"
+ITERATIONS_METRIC = "iterations"
+K6_METRICS = (DURATION_METRIC, FAILED_METRIC, ITERATIONS_METRIC)
+
+_DURATION, _FAILED, _ITERATIONS = (m.encode() for m in K6_METRICS)
+
+_CHUNK_BYTES = 16 * 1024 * 1024
+_SNIFF_BYTES = 64 * 1024
+
+_NAMES = b"|".join(m.encode() for m in K6_METRICS)
+# Every line for a kept metric contains one of these (k6 writes compact JSON).
+_MARKERS = tuple(b'"metric":"' + m.encode() + b'"' for m in K6_METRICS)
+# k6 writes the metric name last, so a kept line ends with its marker.
+_LINE_END = re.compile(rb'"metric":"(' + _NAMES + rb')"\}\r?$', re.M)
+# The start of a Point line in the key order k6 writes.
+_POINT_HEAD = re.compile(
+    rb'\{"type":"Point","data":\{"time":"'
+    rb"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.\d+)?(Z|[+-]\d\d:\d\d)"
+    rb'","value":([^,}]+)'
+)
+_TIME = re.compile(r"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.\d+)?(Z|[+-]\d\d:\d\d)$")
+
+
+@dataclass
+class K6Result:
+    """Aggregates of one k6 JSON output file.
+
+    Attributes:
+        stats: Latency histogram, failed-request count, and time span, as
+            for raw samples (so it can be dumped and merged across nodes).
+        ts: Epoch second of each row of the per-second counters.
+        requests: ``http_req_duration`` points per second.
+        failed: Failed requests (sum of ``http_req_failed``) per second.
+        checked: ``http_req_failed`` points per second.
+        iterations: Completed iterations per second.
+        skipped_lines: Lines mentioning a kept metric that were not valid JSON.
+    """
+
+    stats: SampleStats
+    ts: np.ndarray
+    requests: np.ndarray
+    failed: np.ndarray
+    checked: np.ndarray
+    iterations: np.ndarray
+    skipped_lines: int = 0
+
+    def to_summary(self) -> Tuple[MetricsSummary, List[str]]:
+        """Summarise like ``load_metrics``; fields k6 does not report are warned."""
+        summary, warnings = self.stats.to_summary()
+        if self.stats.has_errors:
+            # Per http_req_failed point, which need not match the duration count.
+            error_rate = float(self.failed.sum() / self.checked.sum())
+            summary = dataclasses.replace(summary, error_rate=error_rate)
+        if self.skipped_lines:
+            warnings.append(f"skipped {self.skipped_lines} malformed line(s)")
+        return summary, warnings
+
+    def series(self) -> MetricsSeries:
+        """Per-second throughput and error rate (NaN for seconds without requests)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            error_rate = np.where(self.checked > 0, self.failed / self.checked, np.nan)
+        return MetricsSeries(
+            ts=self.ts.astype(np.float64),
+            columns={"error_rate": error_rate, "throughput_rps": self.requests.astype(np.float64)},
+        )
+
+
+def is_k6_output(path: str) -> bool:
+    """Whether ``path`` looks like k6 JSON output.
+
+    ``.ndjson`` files are assumed to be; for other files the first line
+    must be a JSON object with a ``metric`` key and a ``type`` of
+    ``Metric`` or ``Point``.
+    """
+    if os.path.splitext(path)[1].lower() in K6_EXTENSIONS:
+        return True
+    try:
+        with open(path, "rb") as f:
+            first = f.read(_SNIFF_BYTES).split(b"\n", 1)[0]
+        doc = json.loads(first)
+    except (OSError, ValueError):
+        return False
+    return isinstance(doc, dict) and doc.get("type") in ("Metric", "Point") and "metric" in doc
+
+
+def ingest_k6(path: str, chunk_bytes: int = _CHUNK_BYTES) -> K6Result:
+    """Stream a k6 JSON output file into a K6Result.
+
+    Memory is bounded by the chunk size plus one counter per second of the
+    run, however large the file is.
+
+    Raises:
+        MetricsParseError: If the file is missing or holds no
+            ``http_req_duration`` points.
+    """
+    if not os.path.isfile(path):
+        raise MetricsParseError(f"k6 output not found: {path}")
+
+    acc = _Accumulator()
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            acc.add_chunk(block[:cut])
+        if tail.strip():
+            acc.add_chunk(tail)
+
+    if acc.stats.count == 0:
+        raise MetricsParseError(f"k6 output has no {DURATION_METRIC} points")
+    return acc.finish()
+
+
+def load_k6(path: str) -> Tuple[MetricsSummary, List[str]]:
+    """Load a k6 JSON output file and summarise it like ``load_metrics`` does."""
+    return ingest_k6(path).to_summary()
+
+
+# -- internal helpers ---------------------------------------------------------
+
+
+@dataclass
+class _PerSecond:
+    """Weighted counts per epoch second, grown to cover every second seen."""
+
+    start: Optional[int] = None
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    def add(self, seconds: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        if seconds.size == 0:
+            return
+        lo, hi = int(seconds.min()), int(seconds.max())
+        if self.start is None:
+            self.start = lo
+        if lo < self.start:
+            self.counts = np.concatenate((np.zeros(self.start - lo), self.counts))
+            self.start = lo
+        size = hi - self.start + 1
+        if size > self.counts.size:
+            self.counts = np.concatenate((self.counts, np.zeros(size - self.counts.size)))
+        self.counts += np.bincount(
+            seconds - self.start, weights=weights, minlength=self.counts.size
+        )
+
+    def aligned(self, start: int, size: int) -> np.ndarray:
+        """Counts for ``[start, start + size)``, zero outside the seen range."""
+        out = np.zeros(size)
+        if self.start is not None:
+            offset = self.start - start
+            out[offset:offset + self.counts.size] = self.counts
+        return out
+
+
+class _Accumulator:
+    def __init__(self):
+        self.stats = SampleStats()
+        self.per_second = {m.encode(): _PerSecond() for m in K6_METRICS}
+        self.checked = _PerSecond()
+        self.skipped = 0
+        self._epochs: Dict[Tuple[bytes, bytes], int] = {}
+
+    def add_chunk(self, data: bytes) -> None:
+        seconds: Dict[bytes, List[int]] = {m: [] for m in self.per_second}
+        values: Dict[bytes, List[bytes]] = {m: [] for m in self.per_second}
+        epochs = self._epochs
+        for stamp, zone, value, metric in self._points(data):
+            key = (stamp, zone)
+            epoch = epochs.get(key)
+            if epoch is None:
+                epoch = epochs[key] = _epoch_second(stamp, zone)
+            seconds[metric].append(epoch)
+            values[metric].append(value)
+
+        for metric, secs in seconds.items():
+            if not secs:
+                continue
+            secs = np.array(secs, dtype=np.int64)
+            vals = np.array(values[metric]).astype(np.float64)
+            if metric == _DURATION:
+                self.stats.histogram.record(vals)
+                self.per_second[metric].add(secs)
+                self.stats.first_ts = min(self.stats.first_ts, float(secs.min()))
+                self.stats.last_ts = max(self.stats.last_ts, float(secs.max()) + 1)
+            else:
+                self.per_second[metric].add(secs, vals)
+                if metric == _FAILED:
+                    self.checked.add(secs)
+                    self.stats.errors += int(np.count_nonzero(vals))
+
+    def _points(self, data: bytes) -> Iterator[Tuple[bytes, bytes, bytes, bytes]]:
+        """Yield ``(second, zone, value, metric)`` for each kept Point line."""
+        ends = list(_LINE_END.finditer(data))
+        if len(ends) != sum(map(data.count, _MARKERS)):
+            for line in data.splitlines():
+                if any(marker in line for marker in _MARKERS):
+                    point = self._parse_slow(line)
+                    if point is not None:
+                        yield point
+            return
+        rfind, match = data.rfind, _POINT_HEAD.match
+        for end in ends:
+            start = rfind(b"\n", 0, end.start()) + 1
+            head = match(data, start)
+            if head is not None:
+                yield head.group(1), head.group(2), head.group(3), end.group(1)
+            else:
+                point = self._parse_slow(data[start:end.end()])
+                if point is not None:
+                    yield point
+
+    def _parse_slow(self, line: bytes) -> Optional[Tuple[bytes, bytes, bytes, bytes]]:
+        """Parse one line with ``json.loads``; None unless it is a kept Point."""
+        try:
+            doc = json.loads(line)
+        except ValueError:
+            self.skipped += 1
+            return None
+        if not isinstance(doc, dict) or doc.get("type") != "Point":
+            return None
+        metric = str(doc.get("metric")).encode()
+        if metric not in self.per_second:
+            return None
+        try:
+            m = _TIME.match(doc["data"]["time"])
+            value = float(doc["data"]["value"])
+        except (KeyError, TypeError, ValueError):
+            m = None
+        if m is None:
+            self.skipped += 1
+            return None
+        return m.group(1).encode(), m.group(2).encode(), repr(value).encode(), metric
+
+    def finish(self) -> K6Result:
+        counters = [*self.per_second.values(), self.checked]
+        start = min(c.start for c in counters if c.start is not None)
+        stop = max(c.start + c.counts.size for c in counters if c.start is not None)
+        size = stop - start
+        self.stats.has_errors = self.checked.start is not None
+        return K6Result(
+            stats=self.stats,
+            ts=np.arange(start, stop, dtype=np.int64),
+            requests=self.per_second[_DURATION].aligned(start, size).astype(np.int64),
+            failed=self.per_second[_FAILED].aligned(start, size).astype(np.int64),
+            checked=self.checked.aligned(start, size).astype(np.int64),
+            iterations=self.per_second[_ITERATIONS].aligned(start, size),
+            skipped_lines=self.skipped,
+        )
+
+
+def _epoch_second(stamp: bytes, zone: bytes) -> int:
+    zone = b"+00:00" if zone == b"Z" else zone
+    when = datetime.fromisoformat((stamp + zone).decode())
+    return int(math.floor(when.timestamp()))
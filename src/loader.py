@@ -2,9 +2,7 @@
 
 import json
 import os
-from typing import List
-
-import yaml
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from src.models import (
     DataConstraints,
@@ -13,17 +11,83 @@ from src.models import (
     ServiceProfile,
     TrafficShape,
 )
+from src.profiling import phase
+
+if TYPE_CHECKING:
+    from src.cache import ProfileCache
+
+# Bump whenever parsing or validation changes so cached profiles are rebuilt.
+LOADER_VERSION = "3"
+
+YAML_BACKEND_ENV = "PERF_ASSISTANT_YAML_BACKEND"
+
+
+def _select_yaml_loader(preference: Optional[str] = None):
+    """Pick the libyaml-backed CSafeLoader when available, else SafeLoader.
+
+    Setting ``PERF_ASSISTANT_YAML_BACKEND=python`` forces the pure-Python
+    loader, which is useful for benchmarking and for reproducing parser bugs.
+    """
+    import yaml
+
+    preference = preference or os.environ.get(YAML_BACKEND_ENV, "auto")
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if preference != "python" and c_loader is not None:
+        return c_loader, "libyaml"
+    return yaml.SafeLoader, "python"
+
+
+# Chosen on first YAML parse: PyYAML is only imported when a YAML profile
+# is actually loaded, so JSON-only runs and --help start faster.
+_YAML_LOADER = None
+YAML_BACKEND = None
+
+
+def _yaml():
+    """Return ``(yaml module, selected loader class)``, importing on first use."""
+    global _YAML_LOADER, YAML_BACKEND
+    import yaml
+
+    if _YAML_LOADER is None:
+        _YAML_LOADER, YAML_BACKEND = _select_yaml_loader()
+    return yaml, _YAML_LOADER
+
+
+def loader_info() -> dict:
+    """Describe the active parsing backend (for ``--loader-info``)."""
+    yaml, loader = _yaml()
+    return {
+        "yaml_backend": YAML_BACKEND,
+        "yaml_loader": loader.__name__,
+        "pyyaml_version": yaml.__version__,
+        "libyaml_available": getattr(yaml, "__with_libyaml__", False),
+        "loader_version": LOADER_VERSION,
+    }
 
 
 class ProfileValidationError(Exception):
     """Raised when a service profile fails validation."""
 
 
-def load_profile(path: str) -> ServiceProfile:
+class ProfileDocumentError(ProfileValidationError):
+    """Raised for one document of a multi-document profile bundle."""
+
+    def __init__(self, message: str, document_index: int, line: Optional[int]):
+        where = f"document {document_index}"
+        if line is not None:
+            where += f" (line {line})"
+        super().__init__(f"{where}: {message}")
+        self.document_index = document_index
+        self.line = line
+
+
+def load_profile(path: str, cache: Optional["ProfileCache"] = None) -> ServiceProfile:
     """Load a service profile from a YAML or JSON file.
 
     Args:
         path: Path to the profile file.
+        cache: Optional ProfileCache. On a hit the validated profile is
+            returned without parsing; on a miss it is stored after validation.
 
     Returns:
         A validated ServiceProfile instance.
@@ -35,27 +99,122 @@ def load_profile(path: str) -> ServiceProfile:
         raise ProfileValidationError(f"profile file not found: {path}")
 
     ext = os.path.splitext(path)[1].lower()
-    try:
-        with open(path, "r") as f:
-            if ext in (".yaml", ".yml"):
-                raw = yaml.safe_load(f)
-            elif ext == ".json":
-                raw = json.load(f)
-            else:
-                raise ProfileValidationError(
-                    f"unsupported file extension: {ext} (expected .yaml, .yml, or .json)"
-                )
-    except (yaml.YAMLError, json.JSONDecodeError) as exc:
-        raise ProfileValidationError(f"failed to parse {path}: {exc}") from exc
-
-    if not isinstance(raw, dict):
-        raise ProfileValidationError("profile must be a mapping/object at the top level")
-
-    return _build_profile(raw)
-
-
-def _build_profile(raw: dict) -> ServiceProfile:
-    """Construct and validate a ServiceProfile from a raw dict."""
+    if ext not in (".yaml", ".yml", ".json"):
+        raise ProfileValidationError(
+            f"unsupported file extension: {ext} (expected .yaml, .yml, or .json)"
+        )
+
+    with phase("load"):
+        with open(path, "rb") as f:
+            content = f.read()
+
+        key = None
+        if cache is not None:
+            key = cache.key(content, ext, LOADER_VERSION)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        if ext == ".json":
+            try:
+                raw = json.loads(content)
+            except ValueError as exc:
+                raise ProfileValidationError(f"failed to parse {path}: {exc}") from exc
+        else:
+            yaml, yaml_loader = _yaml()
+            try:
+                raw = yaml.load(content, Loader=yaml_loader)
+            except (yaml.YAMLError, ValueError) as exc:
+                raise ProfileValidationError(f"failed to parse {path}: {exc}") from exc
+
+    with phase("validate"):
+        if not isinstance(raw, dict):
+            raise ProfileValidationError("profile must be a mapping/object at the top level")
+        profile = build_profile(raw)
+    if cache is not None:
+        cache.put(key, profile)
+    return profile
+
+
+def load_profiles_stream(
+    path: str, errors: Optional[List[ProfileDocumentError]] = None
+) -> Iterator[ServiceProfile]:
+    """Yield validated profiles from a multi-document YAML bundle.
+
+    Documents are separated by ``---`` and parsed one at a time, so memory use
+    does not grow with the size of the bundle. Empty documents are skipped.
+
+    Args:
+        path: Path to the YAML bundle.
+        errors: If given, validation errors are appended here and the stream
+            continues with the next document. Otherwise the first invalid
+            document raises. YAML syntax errors always stop the stream, since
+            the parser cannot resynchronise after them.
+
+    Yields:
+        A validated ServiceProfile per document.
+
+    Raises:
+        ProfileValidationError: If the file is missing or not YAML.
+        ProfileDocumentError: For malformed or invalid documents, carrying
+            the zero-based document index and 1-based start line.
+    """
+    if not os.path.isfile(path):
+        raise ProfileValidationError(f"profile file not found: {path}")
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".yaml", ".yml"):
+        raise ProfileValidationError(
+            f"unsupported bundle extension: {ext} (expected .yaml or .yml)"
+        )
+
+    yaml, yaml_loader = _yaml()
+    with open(path, "rb") as f:
+        parser = yaml_loader(f)
+        try:
+            index = 0
+            while True:
+                try:
+                    if not parser.check_node():
+                        break
+                    node = parser.get_node()
+                    raw = parser.construct_document(node)
+                except yaml.YAMLError as exc:
+                    mark = getattr(exc, "problem_mark", None)
+                    line = mark.line + 1 if mark is not None else None
+                    raise ProfileDocumentError(
+                        f"failed to parse {path}: {exc}", index, line
+                    ) from exc
+
+                if raw is not None:
+                    try:
+                        if not isinstance(raw, dict):
+                            raise ProfileValidationError(
+                                "profile must be a mapping/object at the top level"
+                            )
+                        profile = build_profile(raw)
+                    except ProfileValidationError as exc:
+                        err = ProfileDocumentError(
+                            str(exc), index, node.start_mark.line + 1
+                        )
+                        if errors is None:
+                            raise err from exc
+                        errors.append(err)
+                    else:
+                        yield profile
+                index += 1
+        finally:
+            parser.dispose()
+
+
+def build_profile(raw: dict) -> ServiceProfile:
+    """Construct and validate a ServiceProfile from a raw dict.
+
+    This is what ``load_profile`` does after parsing, for callers that
+    already hold the parsed document (e.g. a JSON request body).
+
+    Raises:
+        ProfileValidationError: If required fields are missing or invalid.
+    """
     errors: List[str] = []
 
     service = raw.get("service")
@@ -145,9 +304,17 @@ def _parse_endpoints(raw: list, errors: List[str]) -> List[Endpoint]:
         path = ep.get("path", "")
         method = ep.get("method", "GET")
         critical = ep.get("critical", False)
+        weight = ep.get("weight", 1.0)
         if not path:
             errors.append(f"endpoints[{i}].path is required")
-        endpoints.append(Endpoint(path=path, method=method, critical=critical))
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+            errors.append(f"endpoints[{i}].weight must be a non-negative number")
+            weight = 1.0
+        endpoints.append(Endpoint(
+            path=path, method=method, critical=critical, weight=float(weight)
+        ))
+    if endpoints and not any(ep.weight > 0 for ep in endpoints):
+        errors.append("endpoint weights must not all be 0")
     return endpoints
 
 
@@ -0,0 +1,194 @@
+"""Columnar metrics for interpreting many runs against one SLO at once.
+
+A MetricsBatch holds one float64 array per metrics field (NaN where a run
+did not report the value), so re-scoring tens of thousands of historical
+results is a handful of NumPy comparisons instead of one ``interpret`` call
+per run. ``interpret_batch`` computes every status, check outcome, and risk
+flag in one pass; check dicts and narrative text are only rendered for the
+rows a caller asks for.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.checks import SUMMARY_COLUMNS, CompiledChecks, compile_checks
+from src.interpreter import METRIC_FIELDS, build_narrative, risk_rules, slo_checks
+from src.models import Check, InterpretationResult, MetricsSummary, SLO
+
+STATUSES = ("pass", "warning", "fail")
+
+_RISK_RULES = risk_rules()
+_RISK_ENGINE = compile_checks([check for check, _ in _RISK_RULES])
+
+
+@dataclass
+class MetricsBatch:
+    """Many metrics summaries as one column per metric (NaN when missing).
+
+    Attributes:
+        columns: Array of length ``len(batch)`` for every ``METRIC_FIELDS``
+            entry.
+        labels: Optional name per row, e.g. the file it was loaded from.
+    """
+
+    columns: Dict[str, np.ndarray]
+    labels: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        lengths = {len(col) for col in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("metrics columns must all have the same length")
+        size = lengths.pop() if lengths else 0
+        for name in METRIC_FIELDS:
+            if name not in self.columns:
+                self.columns[name] = np.full(size, np.nan)
+            else:
+                self.columns[name] = np.asarray(self.columns[name], dtype=np.float64)
+        if self.labels and len(self.labels) != size:
+            raise ValueError(f"got {len(self.labels)} labels for {size} rows")
+
+    @classmethod
+    def from_summaries(
+        cls, summaries: Iterable[MetricsSummary], labels: Optional[Sequence[str]] = None
+    ) -> "MetricsBatch":
+        """Build a batch from MetricsSummary objects (``None`` becomes NaN)."""
+        rows = [[getattr(m, name) for name in METRIC_FIELDS] for m in summaries]
+        matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(METRIC_FIELDS))
+        return cls.from_matrix(matrix, labels)
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: np.ndarray, labels: Optional[Sequence[str]] = None
+    ) -> "MetricsBatch":
+        """Build a batch from a ``(rows, len(METRIC_FIELDS))`` array in field order."""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(METRIC_FIELDS):
+            raise ValueError(
+                f"expected a (rows, {len(METRIC_FIELDS)}) matrix, got shape {matrix.shape}"
+            )
+        # Copy out of the row-major matrix so each column is contiguous.
+        columns = {name: matrix[:, j].copy() for j, name in enumerate(METRIC_FIELDS)}
+        return cls(columns=columns, labels=list(labels or []))
+
+    def __len__(self) -> int:
+        return len(self.columns[METRIC_FIELDS[0]])
+
+    def matrix(self, columns: Sequence[str] = SUMMARY_COLUMNS) -> np.ndarray:
+        """Stack the given columns into a ``(rows, columns)`` array."""
+        return np.column_stack([self.columns[name] for name in columns]).reshape(
+            len(self), len(columns)
+        )
+
+    def summary(self, i: int) -> MetricsSummary:
+        """Row ``i`` as a MetricsSummary."""
+        kwargs = {}
+        for name in METRIC_FIELDS:
+            val = self.columns[name][i]
+            kwargs[name] = None if np.isnan(val) else float(val)
+        return MetricsSummary(**kwargs)
+
+
+@dataclass
+class BatchInterpretation:
+    """Vectorized interpretation of a MetricsBatch.
+
+    The arrays are computed up front; ``checks``, ``risks``, ``narrative``
+    and ``result`` render the interpreter's text for a single row on demand
+    and match what ``interpret`` returns for that row's summary.
+
+    Attributes:
+        status: ``"pass"``, ``"warning"`` or ``"fail"`` per row.
+        passed: ``(rows, checks)`` whether each check passed.
+        present: ``(rows, checks)`` whether each check's metric was reported.
+        values: ``(rows, checks)`` the value each check read.
+        risk_flags: ``(rows, risk rules)`` resource saturation flags.
+    """
+
+    batch: MetricsBatch
+    engine: CompiledChecks
+    status: np.ndarray
+    passed: np.ndarray
+    present: np.ndarray
+    values: np.ndarray
+    risk_flags: np.ndarray
+    _risk_values: np.ndarray = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @property
+    def failed(self) -> np.ndarray:
+        """``(rows, checks)`` whether each check ran and failed."""
+        return self.present & ~self.passed
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of rows per status, for every status."""
+        counts = Counter(self.status.tolist())
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+    def checks(self, i: int) -> List[dict]:
+        """Check dicts for row ``i``, as in ``InterpretationResult.checks``."""
+        return self.engine.results(self.passed[i], self.present[i], self.values[i])
+
+    def risks(self, i: int) -> List[str]:
+        """Risk messages for row ``i``."""
+        return [
+            message.format(self._risk_values[i, j])
+            for j, (_, message) in enumerate(_RISK_RULES)
+            if self.risk_flags[i, j]
+        ]
+
+    def narrative(self, i: int) -> str:
+        """Narrative text for row ``i``."""
+        return self.result(i).narrative
+
+    def result(self, i: int) -> InterpretationResult:
+        """The full InterpretationResult for row ``i``."""
+        status = str(self.status[i])
+        checks = self.checks(i)
+        risks = self.risks(i)
+        return InterpretationResult(
+            status=status,
+            narrative=build_narrative(status, checks, risks, self.batch.summary(i)),
+            checks=checks,
+            risks=risks,
+        )
+
+
+def interpret_batch(
+    batch: MetricsBatch,
+    slo: SLO,
+    checks: Optional[List[Check]] = None,
+) -> BatchInterpretation:
+    """Evaluate every row of a batch against an SLO in one vectorized pass.
+
+    Args:
+        batch: Metrics for many runs.
+        slo: SLO thresholds from the service profile.
+        checks: Checks to evaluate instead of the ones derived from ``slo``.
+
+    Returns:
+        A BatchInterpretation with per-row status, check, and risk arrays.
+    """
+    engine = compile_checks(slo_checks(slo) if checks is None else checks)
+    values = batch.matrix()
+    passed, present, picked = engine.evaluate(values)
+    risk_passed, risk_present, risk_values = _RISK_ENGINE.evaluate(values)
+    risk_flags = risk_present & ~risk_passed
+
+    any_fail = (present & ~passed).any(axis=1)
+    any_risk = risk_flags.any(axis=1)
+    status = np.where(any_fail, "fail", np.where(any_risk, "warning", "pass"))
+    return BatchInterpretation(
+        batch=batch,
+        engine=engine,
+        status=status,
+        passed=passed,
+        present=present,
+        values=picked,
+        risk_flags=risk_flags,
+        _risk_values=risk_values,
+    )
@@ -1,36 +1,63 @@
-"""Data models for service profiles, load test plans, and evidence events."""
-
+"""Data models for service profiles, load test plans, and evidence events.
+
+Models are slotted dataclasses on Python 3.10+: instances carry no
+per-instance ``__dict__``, which saves about a third of the memory per
+instance in a large plan, fleet, or evidence read (measured by
+``python -m benchmarks.bench_models``). Setting
+``PERF_ASSISTANT_FROZEN_MODELS=1`` also makes them frozen, which turns
+accidental mutation of shared objects such as cached profiles into an
+error; ``BatchReport``, which is filled in as a batch runs, always stays
+mutable.
+"""
+
+import os
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+FROZEN_MODELS_ENV = "PERF_ASSISTANT_FROZEN_MODELS"
+
+FROZEN_MODELS = os.environ.get(FROZEN_MODELS_ENV, "") not in ("", "0")
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def model(cls=None, *, frozen: Optional[bool] = None):
+    """``@dataclass`` with slots (3.10+), frozen when FROZEN_MODELS is set."""
+    options = dict(_SLOTS, frozen=FROZEN_MODELS if frozen is None else frozen)
+    if cls is None:
+        return lambda c: dataclass(c, **options)
+    return dataclass(cls, **options)
 
-@dataclass
+
+@model
 class Endpoint:
     path: str
     method: str
     critical: bool = False
+    weight: float = 1.0  # relative share of generated traffic
 
 
-@dataclass
+@model
 class TrafficShape:
     baseline_rps: int
     peak_rps: int
     burst_factor: float = 3.0
 
 
-@dataclass
+@model
 class SLO:
     latency_ms: dict = field(default_factory=dict)  # e.g. {"p95": 400, "p99": 800}
     error_rate: float = 0.01
 
 
-@dataclass
+@model
 class DataConstraints:
     uses_production_data: bool = False
     notes: str = ""
 
 
-@dataclass
+@model
 class ServiceProfile:
     service: str
     summary: str
@@ -41,7 +68,7 @@ class ServiceProfile:
     data: Optional[DataConstraints] = None
 
 
-@dataclass
+@model
 class Check:
     metric: str
     operator: str  # "<=", "<", ">=", ">"
@@ -49,7 +76,7 @@ class Check:
     description: str = ""
 
 
-@dataclass
+@model
 class Stage:
     name: str  # "ramp-up", "hold", "ramp-down"
     duration_seconds: int
@@ -57,7 +84,7 @@ class Stage:
     target_vus: Optional[int] = None
 
 
-@dataclass
+@model
 class Scenario:
     name: str  # "steady", "burst", "soak"
     description: str
@@ -66,14 +93,14 @@ class Scenario:
     metrics_to_watch: List[str] = field(default_factory=list)
 
 
-@dataclass
+@model
 class SafetyNotes:
     test_data_handling: str = ""
     environment_isolation: str = ""
     cleanup_steps: str = ""
 
 
-@dataclass
+@model
 class LoadTestPlan:
     service: str
     profile_path: str
@@ -81,7 +108,7 @@ class LoadTestPlan:
     safety_notes: Optional[SafetyNotes] = None
 
 
-@dataclass
+@model
 class MetricsSummary:
     p50_ms: Optional[float] = None
     p90_ms: Optional[float] = None
@@ -94,7 +121,7 @@ class MetricsSummary:
     gc_pause_ms: Optional[float] = None
 
 
-@dataclass
+@model
 class InterpretationResult:
     status: str  # "pass", "fail", "warning"
     narrative: str
@@ -102,7 +129,16 @@ class InterpretationResult:
     risks: List[str] = field(default_factory=list)
 
 
-@dataclass
+@model
+class StageInterpretation:
+    stage: str
+    start_s: int  # offset from scenario start
+    end_s: int
+    samples: int  # metric rows that fell inside the stage
+    result: InterpretationResult
+
+
+@model
 class EvidenceEvent:
     ts: str
     service: str
@@ -110,3 +146,31 @@ class EvidenceEvent:
     scenarios: List[str] = field(default_factory=list)
     interpretation: bool = False
     outcome: str = "plan-generated"
+
+
+@model
+class BatchItem:
+    profile: str
+    service: str
+    plan_path: str
+    scenarios: List[str] = field(default_factory=list)
+
+
+@model
+class BatchFailure:
+    profile: str
+    error: str
+
+
+@model(frozen=False)
+class BatchReport:
+    planned: List[BatchItem] = field(default_factory=list)
+    failures: List[BatchFailure] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Profiles processed per second, counting successes and failures."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (len(self.planned) + len(self.failures)) / self.elapsed_seconds
@@ -0,0 +1,190 @@
+"""Per-phase timings and opt-in CPU/memory profiling for CLI runs.
+
+Code marks its phases with ``phase("load")``, ``phase("generate")`` and so
+on. Outside a profiling session that costs a single global lookup; inside
+one, elapsed time is added to the phase's running total, so a phase entered
+many times (e.g. ``load`` for a profile and then a metrics file) reports
+the sum. Phases nest: time spent in an inner phase (``load`` inside a
+batch's ``generate``) counts only towards the inner one, so the phases never
+add up to more than the wall time.
+
+A ProfileSession wraps one CLI command and can additionally run cProfile
+(writing a ``.prof`` file for pstats or snakeviz) and tracemalloc (reporting
+the peak and the top allocation sites). ``cProfile`` and ``tracemalloc``
+are imported only when requested.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Phases in the order they are reported when present.
+PHASES = ("load", "validate", "generate", "serialize", "interpret", "log")
+
+TIMINGS_FORMATS = ("text", "json")
+
+# Totals of the running session, or None when nothing is being timed.
+_active: Optional[Dict[str, float]] = None
+
+# Time spent in nested phases, one entry per phase currently open.
+_nested: List[float] = []
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the ``with`` block, minus nested phases, to ``name``."""
+    totals = _active
+    if totals is None:
+        yield
+        return
+    _nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        totals[name] = totals.get(name, 0.0) + elapsed - _nested.pop()
+        if _nested:
+            _nested[-1] += elapsed
+
+
+class ProfileSession:
+    """Timings and optional profilers around one CLI command.
+
+    Args:
+        command: Name reported with the results.
+        timings: ``"text"`` or ``"json"`` to report per-phase timings, or
+            ``None`` for no timing report. With ``"json"`` the memory
+            report is folded into the same JSON line.
+        cpu_out: Path that receives cProfile stats, or ``None``.
+        trace_memory: Run tracemalloc and report the peak and top sites.
+        memory_top: Number of allocation sites to report.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        timings: Optional[str] = None,
+        cpu_out: Optional[str] = None,
+        trace_memory: bool = False,
+        memory_top: int = 10,
+    ):
+        if timings is not None and timings not in TIMINGS_FORMATS:
+            raise ValueError(
+                f"unknown timings format: {timings!r} "
+                f"(expected one of {', '.join(TIMINGS_FORMATS)})"
+            )
+        self.command = command
+        self.timings = timings
+        self.cpu_out = cpu_out
+        self.trace_memory = trace_memory
+        self.memory_top = memory_top
+        self.phases: Dict[str, float] = {}
+        self._profiler = None
+        self._start = 0.0
+
+    def start(self) -> None:
+        """Begin timing (and profiling, if requested)."""
+        global _active
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        if self.cpu_out:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+        _active = self.phases
+        self._start = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def finish(self) -> List[str]:
+        """Stop everything and return the report as lines for stderr."""
+        global _active
+        if self._profiler is not None:
+            self._profiler.disable()
+        total = time.perf_counter() - self._start
+        _active = None
+
+        phases = self._ordered_phases()
+        report = {
+            "command": self.command,
+            "total_s": total,
+            "phases": phases,
+            # Time outside every phase: lazy imports, option handling, output.
+            "other_s": max(0.0, total - sum(phases.values())),
+        }
+        lines = []
+        if self.cpu_out:
+            self._profiler.dump_stats(self.cpu_out)
+            lines.append(
+                f"CPU profile written to {self.cpu_out} "
+                f"(inspect with: python -m pstats {self.cpu_out})"
+            )
+        if self.trace_memory:
+            report["memory"] = _memory_report(self.memory_top)
+
+        if self.timings == "json":
+            lines.append(json.dumps(report))
+        else:
+            if self.timings == "text":
+                lines.extend(_format_timings(report))
+            if self.trace_memory:
+                lines.extend(_format_memory(report["memory"]))
+        return lines
+
+    def _ordered_phases(self) -> Dict[str, float]:
+        known = [name for name in PHASES if name in self.phases]
+        extra = [name for name in self.phases if name not in PHASES]
+        return {name: self.phases[name] for name in known + extra}
+
+
+# -- internal helpers ---------------------------------------------------------
+
+
+def _memory_report(top: int) -> dict:
+    import tracemalloc
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "*/cProfile.py"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+    }
+
+
+def _format_timings(report: dict) -> List[str]:
+    lines = [f"Timings for {report['command']}: {report['total_s'] * 1000:.1f} ms total"]
+    for name, seconds in report["phases"].items():
+        lines.append(f"  {name:10s} {seconds * 1000:10.1f} ms")
+    lines.append(f"  {'other':10s} {report['other_s'] * 1000:10.1f} ms")
+    return lines
+
+
+def _format_memory(memory: dict) -> List[str]:
+    lines = [
+        f"Memory: peak {memory['peak_bytes'] / 2**20:.1f} MiB, "
+        f"{memory['current_bytes'] / 2**20:.1f} MiB still allocated; top sites:"
+    ]
+    for site in memory["top"]:
+        lines.append(
+            f"  {site['size_bytes'] / 1024:10.1f} KiB  {site['location']} ({site['count']} blocks)"
+        )
+    return lines
@@ -0,0 +1,215 @@
+"""Stream raw per-request latency samples into a percentile histogram.
+
+A node's SampleStats can be dumped as a JSON histogram document
+(``dump_histogram``); dumps from many load generators are merged into
+fleet-wide percentiles, error rate, and throughput by
+``load_merged_histograms``.
+"""
+
+import io
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.histogram import LatencyHistogram, merge_histograms
+from src.interpreter import MetricsParseError, metrics_from_dict
+from src.models import MetricsSummary
+
+LATENCY_COLUMN = "latency_ms"
+ERROR_COLUMN = "error"
+TIMESTAMP_COLUMN = "ts"
+
+_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class SampleStats:
+    """Bounded-memory aggregate of a raw sample stream."""
+
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    has_errors: bool = False
+    first_ts: float = math.inf
+    last_ts: float = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    def percentile(self, q: float) -> Optional[float]:
+        return self.histogram.percentile(q)
+
+    def to_summary(self) -> Tuple[MetricsSummary, List[str]]:
+        """Build a MetricsSummary; fields the samples cannot supply are warned."""
+        raw = {}
+        if self.count:
+            for name, q in (("p50_ms", 50), ("p90_ms", 90), ("p95_ms", 95), ("p99_ms", 99)):
+                raw[name] = self.percentile(q)
+            if self.has_errors:
+                raw["error_rate"] = self.errors / self.count
+            if self.last_ts > self.first_ts:
+                raw["throughput_rps"] = self.count / (self.last_ts - self.first_ts)
+        return metrics_from_dict(raw)
+
+    def to_dict(self) -> dict:
+        """The histogram dump plus the error count and time span (None when unknown)."""
+        doc = self.histogram.to_dict()
+        doc["errors"] = self.errors if self.has_errors else None
+        doc["first_ts"] = self.first_ts if math.isfinite(self.first_ts) else None
+        doc["last_ts"] = self.last_ts if math.isfinite(self.last_ts) else None
+        return doc
+
+    @classmethod
+    def from_dict(cls, doc: dict) -> "SampleStats":
+        """Rebuild stats dumped by ``to_dict``.
+
+        Raises:
+            ValueError: If ``doc`` is not a histogram dump.
+        """
+        stats = cls(histogram=LatencyHistogram.from_dict(doc))
+        if doc.get("errors") is not None:
+            stats.has_errors = True
+            stats.errors = int(doc["errors"])
+        if doc.get("first_ts") is not None and doc.get("last_ts") is not None:
+            stats.first_ts = float(doc["first_ts"])
+            stats.last_ts = float(doc["last_ts"])
+        return stats
+
+
+def merge_sample_stats(stats: Sequence[SampleStats]) -> SampleStats:
+    """Combine per-node stats into fleet-wide stats.
+
+    Histograms are merged bucket by bucket. The error rate is kept only if
+    every node reported errors, and throughput spans the earliest to the
+    latest timestamp across nodes, which is right for nodes that ran
+    concurrently.
+
+    Raises:
+        ValueError: If ``stats`` is empty or the histogram layouts differ.
+    """
+    merged = SampleStats(histogram=merge_histograms(s.histogram for s in stats))
+    merged.has_errors = all(s.has_errors for s in stats)
+    if merged.has_errors:
+        merged.errors = sum(s.errors for s in stats)
+    merged.first_ts = min(s.first_ts for s in stats)
+    merged.last_ts = max(s.last_ts for s in stats)
+    return merged
+
+
+def dump_histogram(stats: SampleStats, path: str) -> None:
+    """Write ``stats`` as a mergeable JSON histogram document."""
+    with open(path, "w") as f:
+        json.dump(stats.to_dict(), f, separators=(",", ":"))
+
+
+def load_histogram_dumps(paths: Sequence[str]) -> List[SampleStats]:
+    """Read histogram documents written by ``dump_histogram``.
+
+    Raises:
+        MetricsParseError: If a file is missing or not a histogram dump;
+            the message names the file.
+    """
+    out = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                out.append(SampleStats.from_dict(json.load(f)))
+        except (OSError, ValueError) as exc:
+            raise MetricsParseError(f"{path}: {exc}") from exc
+    return out
+
+
+def load_merged_histograms(paths: Sequence[str]) -> Tuple[MetricsSummary, List[str]]:
+    """Merge per-node histogram dumps and summarise them like ``load_metrics``.
+
+    Raises:
+        MetricsParseError: If there are no dumps, one cannot be read, the
+            layouts differ, or the merged histogram is empty.
+    """
+    if not paths:
+        raise MetricsParseError("no histogram files given")
+    try:
+        stats = merge_sample_stats(load_histogram_dumps(paths))
+    except ValueError as exc:
+        raise MetricsParseError(str(exc)) from exc
+    if stats.count == 0:
+        raise MetricsParseError("merged histograms hold no samples")
+    return stats.to_summary()
+
+
+def ingest_samples(path: str, chunk_bytes: int = _CHUNK_BYTES) -> SampleStats:
+    """Stream a raw-sample CSV into a SampleStats.
+
+    The CSV needs a header with a ``latency_ms`` column. An optional
+    ``error`` column (0/1) feeds the error rate and an optional ``ts`` column
+    (epoch seconds) feeds throughput. Other columns are ignored. The file is
+    parsed in chunks of roughly ``chunk_bytes``, so memory use is bounded
+    regardless of row count.
+
+    Raises:
+        MetricsParseError: If the file is missing, lacks ``latency_ms``, or
+            contains non-numeric values in the used columns.
+    """
+    if not os.path.isfile(path):
+        raise MetricsParseError(f"samples file not found: {path}")
+
+    stats = SampleStats()
+    with open(path, "rb") as f:
+        header = [h.strip() for h in f.readline().decode().split(",")]
+        if LATENCY_COLUMN not in header:
+            raise MetricsParseError(f"samples CSV needs a '{LATENCY_COLUMN}' column")
+        columns = [LATENCY_COLUMN]
+        for optional in (ERROR_COLUMN, TIMESTAMP_COLUMN):
+            if optional in header:
+                columns.append(optional)
+        usecols = [header.index(c) for c in columns]
+        stats.has_errors = ERROR_COLUMN in columns
+
+        tail = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            _ingest_chunk(stats, block[:cut], usecols, columns)
+        if tail.strip():
+            _ingest_chunk(stats, tail, usecols, columns)
+    return stats
+
+
+def load_raw_samples(
+    path: str, histogram_out: Optional[str] = None
+) -> Tuple[MetricsSummary, List[str]]:
+    """Load raw samples and summarise them like ``load_metrics`` does.
+
+    With ``histogram_out``, the stats are also written there with
+    ``dump_histogram`` for merging with other nodes' dumps.
+    """
+    stats = ingest_samples(path)
+    if stats.count == 0:
+        raise MetricsParseError("samples file has no data rows")
+    if histogram_out is not None:
+        dump_histogram(stats, histogram_out)
+    return stats.to_summary()
+
+
+def _ingest_chunk(stats: SampleStats, data: bytes, usecols: List[int], columns: List[str]) -> None:
+    if not data.strip():
+        return
+    try:
+        arr = np.loadtxt(io.BytesIO(data), delimiter=",", usecols=usecols, ndmin=2)
+    except ValueError as exc:
+        raise MetricsParseError(f"failed to parse samples: {exc}") from exc
+    stats.histogram.record(arr[:, 0])
+    if ERROR_COLUMN in columns:
+        stats.errors += int(np.count_nonzero(arr[:, columns.index(ERROR_COLUMN)]))
+    if TIMESTAMP_COLUMN in columns:
+        ts = arr[:, columns.index(TIMESTAMP_COLUMN)]
+        stats.first_ts = min(stats.first_ts, float(ts.min()))
+        stats.last_ts = max(stats.last_ts, float(ts.max()))
@@ -0,0 +1,147 @@
+"""Compile scenarios into per-request send schedules (open workload model).
+
+A scenario's stages describe a piecewise-linear arrival rate: each stage ramps
+linearly from the previous stage's ``target_rps`` (0 for the first stage) to
+its own. The compiler maps that rate curve to exact request send offsets so a
+driver can replay them without deciding timing itself.
+
+The work is done in "cumulative expected requests" space: for a rate curve
+``r(t)`` with integral ``R(t)``, a unit-rate arrival sequence ``u_k`` becomes
+send times ``t_k = R^-1(u_k)``. Within a stage ``R`` is quadratic, so the
+inverse has a closed form and the whole schedule is computed with array
+operations in blocks of about a million requests.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from src.models import Endpoint, Scenario
+
+SCHEDULE_DTYPE = np.dtype([("offset_s", "<f8"), ("endpoint", "<u4")])
+
+ARRIVAL_PROCESSES = ("poisson", "constant")
+
+# Requests generated per vectorized block; bounds peak temporary memory.
+_BLOCK = 1_000_000
+
+
+def compile_schedule(
+    scenario: Scenario,
+    endpoints: Optional[List[Endpoint]] = None,
+    arrival: str = "poisson",
+    seed: int = 0,
+    out_path: Optional[str] = None,
+) -> np.ndarray:
+    """Turn a scenario into a sorted array of per-request send offsets.
+
+    Args:
+        scenario: Scenario whose stages define the rate curve. Stages without
+            ``target_rps`` (VU-driven stages) are treated as 0 rps.
+        endpoints: Endpoints to split traffic across by ``weight``. When
+            empty, every request gets endpoint index 0.
+        arrival: ``"poisson"`` for a non-homogeneous Poisson process or
+            ``"constant"`` for evenly spaced arrivals along the rate curve.
+        seed: Seed for arrivals and endpoint assignment; the same inputs
+            always produce the same schedule.
+        out_path: Optional ``.npy`` path. When given, the schedule is written
+            through a memory map and the memmap is returned.
+
+    Returns:
+        A structured array of dtype SCHEDULE_DTYPE with fields ``offset_s``
+        (seconds from scenario start) and ``endpoint`` (index into
+        ``endpoints``), sorted by offset.
+
+    Raises:
+        ValueError: If ``arrival`` is unknown or endpoint weights are invalid.
+    """
+    if arrival not in ARRIVAL_PROCESSES:
+        raise ValueError(
+            f"unknown arrival process: {arrival!r} (expected one of {ARRIVAL_PROCESSES})"
+        )
+    rng = np.random.default_rng(seed)
+
+    durations = np.array([s.duration_seconds for s in scenario.stages], dtype=np.float64)
+    r1 = np.array([s.target_rps or 0 for s in scenario.stages], dtype=np.float64)
+    r0 = np.concatenate(([0.0], r1[:-1]))
+    starts = np.concatenate(([0.0], np.cumsum(durations)))[:-1]
+    areas = (r0 + r1) / 2.0 * durations
+    cum_areas = np.concatenate(([0.0], np.cumsum(areas)))
+    total = float(cum_areas[-1]) if len(areas) else 0.0
+
+    blocks = _arrival_blocks(total, arrival, rng)
+    count = int(sum(n for _, _, n in blocks))
+
+    if out_path is not None:
+        schedule = np.lib.format.open_memmap(
+            out_path, mode="w+", dtype=SCHEDULE_DTYPE, shape=(count,)
+        )
+    else:
+        schedule = np.empty(count, dtype=SCHEDULE_DTYPE)
+
+    cdf = _endpoint_cdf(endpoints or [])
+    pos = 0
+    for lo, hi, n in blocks:
+        if n == 0:
+            continue
+        if arrival == "poisson":
+            u = np.sort(rng.uniform(lo, hi, n))
+        else:
+            u = np.arange(lo, lo + n, dtype=np.float64) + 0.5
+        view = schedule[pos:pos + n]
+        view["offset_s"] = _invert(u, cum_areas, starts, durations, r0, r1)
+        if cdf is None:
+            view["endpoint"] = 0
+        else:
+            view["endpoint"] = np.searchsorted(cdf, rng.random(n), side="right")
+        pos += n
+
+    if isinstance(schedule, np.memmap):
+        schedule.flush()
+    return schedule
+
+
+def _arrival_blocks(total: float, arrival: str, rng: np.random.Generator):
+    """Split [0, total) expected requests into (lo, hi, count) blocks.
+
+    Counts are drawn up front so the output size is known before any offsets
+    are generated. Disjoint intervals of a Poisson process are independent,
+    so drawing each block separately is exact.
+    """
+    if total <= 0:
+        return []
+    if arrival == "constant":
+        n_total = int(total)
+        return [
+            (float(lo), float(min(lo + _BLOCK, n_total)), min(_BLOCK, n_total - lo))
+            for lo in range(0, n_total, _BLOCK)
+        ]
+    n_blocks = max(1, int(np.ceil(total / _BLOCK)))
+    edges = np.linspace(0.0, total, n_blocks + 1)
+    counts = rng.poisson(np.diff(edges))
+    return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(n_blocks)]
+
+
+def _invert(u, cum_areas, starts, durations, r0, r1) -> np.ndarray:
+    """Map cumulative expected-request positions to send offsets in seconds."""
+    idx = np.searchsorted(cum_areas, u, side="right") - 1
+    np.clip(idx, 0, len(durations) - 1, out=idx)
+    local = u - cum_areas[idx]
+    a, b, d = r0[idx], r1[idx], durations[idx]
+    # Solve a*t + (b - a) * t^2 / (2d) = local for t, in the form that stays
+    # stable when b == a and when a == 0.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disc = np.sqrt(np.maximum(a * a + 2.0 * (b - a) * local / d, 0.0))
+        tau = np.where(a + disc > 0, 2.0 * local / (a + disc), 0.0)
+    return starts[idx] + np.minimum(tau, d)
+
+
+def _endpoint_cdf(endpoints: List[Endpoint]) -> Optional[np.ndarray]:
+    if not endpoints:
+        return None
+    weights = np.array([e.weight for e in endpoints], dtype=np.float64)
+    if np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("endpoint weights must be non-negative with a positive sum")
+    cdf = np.cumsum(weights) / weights.sum()
+    cdf[-1] = np.inf  # guard against rounding leaving the last bucket short
+    return cdf
@@ -0,0 +1,253 @@
+"""Serialize model dataclasses to dicts and JSON without ``dataclasses.asdict``.
+
+``asdict`` deep-copies every value through ``copy.deepcopy`` and
+``json.dumps(..., indent=2)`` falls back to the pure-Python encoder, which
+together dominate the time to write large plans. This module walks the
+dataclasses directly, using field lists cached per class:
+
+* ``to_dict`` builds the same nested dicts and lists as ``asdict``.
+* ``dumps``/``dump`` encode straight from the dataclasses. With
+  ``indent=None`` the output is compact (``{"a":1,"b":[2]}``). ``dump``
+  streams to a file in bounded chunks instead of building one string.
+
+NumPy scalars (``numpy.float64`` and friends) are written as the matching
+Python numbers.
+
+When orjson is installed it encodes compact and 2-space-indented output
+(its only indent width). Its output is the same JSON, except that non-ASCII
+text is written as UTF-8 rather than ``\\uXXXX`` escapes and NaN becomes
+``null``. Set ``PERF_ASSISTANT_JSON_BACKEND=stdlib`` to force the built-in
+encoder.
+"""
+
+import dataclasses
+import json
+import os
+from json.encoder import encode_basestring_ascii
+from typing import IO, Dict, List, Optional, Tuple
+
+JSON_BACKEND_ENV = "PERF_ASSISTANT_JSON_BACKEND"
+
+
+def _select_backend(preference: Optional[str] = None):
+    """Return ``(orjson module or None, backend name)``."""
+    preference = preference or os.environ.get(JSON_BACKEND_ENV, "auto")
+    if preference != "stdlib":
+        try:
+            import orjson
+        except ImportError:
+            pass
+        else:
+            return orjson, "orjson"
+    return None, "stdlib"
+
+
+_orjson, JSON_BACKEND = _select_backend()
+
+# ``dump`` writes once this many pieces (tens of KiB of text) have built up.
+_FLUSH_CHUNKS = 4096
+
+
+def to_dict(obj):
+    """Convert a dataclass (recursively) to plain dicts and lists, like ``asdict``."""
+    cls = type(obj)
+    if cls in _SCALARS:
+        return obj
+    names = _field_names(cls)
+    if names is not None:
+        return {name: to_dict(getattr(obj, name)) for name in names}
+    if cls is list or cls is tuple:
+        return cls(to_dict(v) for v in obj)
+    if cls is dict:
+        return {k: to_dict(v) for k, v in obj.items()}
+    if _is_numpy_scalar(obj):
+        return obj.item()
+    return obj
+
+
+def dumps(obj, indent: Optional[int] = 2) -> str:
+    """Encode a dataclass (or plain JSON data) as a JSON string.
+
+    Args:
+        obj: Dataclass instance, or dicts/lists/scalars containing them.
+        indent: Spaces per nesting level, or ``None`` for compact output.
+    """
+    if _orjson is not None and indent in (None, 2):
+        return _orjson.dumps(obj, option=_orjson_option(indent)).decode("utf-8")
+    if indent is None:
+        # The C encoder handles compact output; it is bypassed when indenting.
+        return json.dumps(to_dict(obj), separators=(",", ":"))
+    out: List[str] = []
+    _Encoder(indent).encode(obj, 0, out)
+    return "".join(out)
+
+
+def dump(obj, fp: IO[str], indent: Optional[int] = 2) -> None:
+    """Encode ``obj`` as JSON into the text file ``fp``.
+
+    The stdlib encoder writes after each list element once a few thousand
+    pieces have accumulated, so memory use is bounded by the largest list
+    element (a scenario, for a plan) rather than the whole document.
+    """
+    if _orjson is not None and indent in (None, 2):
+        fp.write(_orjson.dumps(obj, option=_orjson_option(indent)).decode("utf-8"))
+        return
+    _Encoder(indent, fp).encode(obj, 0, [])
+
+
+# -- internal helpers ---------------------------------------------------------
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+# Field names per dataclass type; None for types that are not dataclasses.
+_FIELDS: Dict[type, Optional[Tuple[str, ...]]] = {}
+
+
+def _field_names(cls: type) -> Optional[Tuple[str, ...]]:
+    try:
+        return _FIELDS[cls]
+    except KeyError:
+        names = None
+        if dataclasses.is_dataclass(cls):
+            names = tuple(f.name for f in dataclasses.fields(cls))
+        _FIELDS[cls] = names
+        return names
+
+
+def _orjson_option(indent: Optional[int]) -> int:
+    option = _orjson.OPT_SERIALIZE_NUMPY
+    return option | _orjson.OPT_INDENT_2 if indent == 2 else option
+
+
+def _is_numpy_scalar(obj) -> bool:
+    # numpy.float64, numpy.int64, numpy.bool_ and so on, checked without
+    # importing numpy; metrics computed with numpy often carry them.
+    return type(obj).__module__ == "numpy" and getattr(obj, "ndim", None) == 0
+
+
+def _float(value: float) -> str:
+    # Matches json.dumps (allow_nan=True).
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+class _Encoder:
+    """Appends JSON text for a value to a list of chunks.
+
+    Output is identical to ``json.dumps(to_dict(obj), indent=indent)`` when
+    indented, and to ``separators=(",", ":")`` when ``indent`` is None. With
+    ``fp`` set, chunks are written out whenever a list element completes and
+    at least ``_FLUSH_CHUNKS`` have accumulated.
+    """
+
+    def __init__(self, indent: Optional[int], fp: Optional[IO[str]] = None):
+        self.indent = indent
+        self.fp = fp
+        self.key_sep = ":" if indent is None else ": "
+        self._newlines: List[str] = []
+        self._keys: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+    def encode(self, obj, level: int, out: List[str]) -> None:
+        self._value(obj, level, out)
+        if self.fp is not None:
+            self.fp.write("".join(out))
+            out.clear()
+
+    def _newline(self, level: int) -> str:
+        """Newline plus indentation for ``level`` ("" when compact)."""
+        if self.indent is None:
+            return ""
+        while len(self._newlines) <= level:
+            self._newlines.append("\n" + " " * (self.indent * len(self._newlines)))
+        return self._newlines[level]
+
+    def _value(self, obj, level: int, out: List[str]) -> None:
+        cls = type(obj)
+        if cls is str:
+            out.append(encode_basestring_ascii(obj))
+        elif obj is None:
+            out.append("null")
+        elif obj is True:
+            out.append("true")
+        elif obj is False:
+            out.append("false")
+        elif cls is int:
+            out.append(int.__repr__(obj))
+        elif cls is float:
+            out.append(_float(obj))
+        elif cls is list or cls is tuple:
+            self._array(obj, level, out)
+        elif cls is dict:
+            self._object([(self._key(k), v) for k, v in obj.items()], level, out)
+        elif isinstance(obj, float):
+            out.append(_float(obj))
+        elif isinstance(obj, int):
+            out.append(int.__repr__(obj))
+        elif _is_numpy_scalar(obj):
+            self._value(obj.item(), level, out)
+        else:
+            keys = self._keys.get(cls)
+            if keys is None:
+                names = _field_names(cls)
+                if names is None:
+                    raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+                keys = tuple((name, self._key(name)) for name in names)
+                self._keys[cls] = keys
+            self._object([(key, getattr(obj, name)) for name, key in keys], level, out)
+
+    def _key(self, key) -> str:
+        # Non-string keys are coerced the way json.dumps does.
+        if isinstance(key, str):
+            pass
+        elif key is True or key is False:
+            key = "true" if key else "false"
+        elif key is None:
+            key = "null"
+        elif isinstance(key, int):
+            key = int.__repr__(key)
+        elif isinstance(key, float):
+            key = _float(key)
+        else:
+            raise TypeError(
+                f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+            )
+        return encode_basestring_ascii(key) + self.key_sep
+
+    def _object(self, items: List[Tuple[str, object]], level: int, out: List[str]) -> None:
+        if not items:
+            out.append("{}")
+            return
+        inner = self._newline(level + 1)
+        separator = "," + inner
+        out.append("{" + inner)
+        first = True
+        for key, value in items:
+            if not first:
+                out.append(separator)
+            first = False
+            out.append(key)
+            self._value(value, level + 1, out)
+        out.append(self._newline(level) + "}")
+
+    def _array(self, items, level: int, out: List[str]) -> None:
+        if not items:
+            out.append("[]")
+            return
+        inner = self._newline(level + 1)
+        separator = "," + inner
+        out.append("[" + inner)
+        first = True
+        for value in items:
+            if not first:
+                out.append(separator)
+            first = False
+            self._value(value, level + 1, out)
+            if self.fp is not None and len(out) >= _FLUSH_CHUNKS:
+                self.fp.write("".join(out))
+                out.clear()
+        out.append(self._newline(level) + "]")
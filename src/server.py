@@ -0,0 +1,414 @@
+"""Long-running JSON API over load_profile, generate_plan, and interpret.
+
+``serve`` keeps one interpreter alive so callers such as the internal
+portal pay the import and parse cost once instead of on every request.
+Requests are handled on an asyncio event loop; validated profiles and
+their serialized plans are held in an in-memory LRU keyed by path and
+invalidated when the file's mtime or size changes. Cold profile loads,
+plan generation, and interpretation (which may parse large metrics
+files) run in a process pool so they never block the loop.
+
+Endpoints (JSON request and response bodies):
+
+    GET  /health      -> {"status": "ok", "profiles_cached": n}
+    POST /profile     {"profile": path} or {"profile_data": {...}}
+                      -> the validated profile
+    POST /plan        same body -> the generated plan
+    POST /interpret   same body plus one of "metrics" (a summary object),
+                      "metrics_path", or "samples_path"
+                      -> {"service", "status", "narrative", "checks",
+                          "risks", "warnings"}
+
+Errors are returned as ``{"error": message}`` with status 400 for
+malformed requests and 422 for invalid profiles or metrics.
+"""
+
+import asyncio
+import json
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from src.cache import ProfileCache
+from src.generator import generate_plan, plan_to_json
+from src.interpreter import MetricsParseError, interpret, load_metrics, metrics_from_dict
+from src.loader import ProfileValidationError, build_profile, load_profile
+from src.models import SLO, ServiceProfile
+from src.serialize import to_dict
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Request bodies larger than this are rejected with 413.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Requests with more header fields than this are rejected with 431.
+MAX_HEADERS = 100
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+class RequestError(Exception):
+    """Raised by a handler to answer with an HTTP error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PlanServer:
+    """Serves profiles, plans, and interpretations over HTTP/1.1.
+
+    Args:
+        workers: Worker processes for profile loads, plan generation, and
+            interpretation. ``None`` uses the CPU count; ``0`` loads and
+            plans on a thread and interprets on the event loop, which suits
+            small inline metrics summaries.
+        cache_size: Profiles (with their serialized plans) kept warm.
+        profile_cache: Optional on-disk ProfileCache consulted when a
+            profile is not warm, e.g. right after the server starts.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache_size: int = 256,
+        profile_cache: Optional[ProfileCache] = None,
+    ):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.profile_cache = profile_cache
+        self.address: Optional[str] = None
+        self._warm: "OrderedDict[str, _WarmProfile]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unix_path: Optional[str] = None
+        self._routes = {
+            "/health": ("GET", self._health),
+            "/profile": ("POST", self._profile),
+            "/plan": ("POST", self._plan),
+            "/interpret": ("POST", self._interpret),
+        }
+
+    async def start(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[str] = None,
+    ) -> str:
+        """Start listening on TCP ``host:port``, or on ``unix_path`` if given.
+
+        Worker processes are started and warmed up before this returns.
+
+        Returns:
+            The listening address, e.g. ``http://127.0.0.1:8765`` or
+            ``unix:/tmp/perf.sock``. Port 0 picks a free port.
+        """
+        if self.workers != 0:
+            workers = self.workers or os.cpu_count() or 1
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(self._pool, _warm_worker) for _ in range(workers)
+            ))
+
+        if unix_path is not None:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path)
+            self._unix_path = unix_path
+            self.address = f"unix:{unix_path}"
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+            bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+            self.address = f"http://{bound_host}:{bound_port}"
+        return self.address
+
+    async def close(self) -> None:
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._unix_path is not None and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        """Route one request and return ``(status, JSON body)``."""
+        route = self._routes.get(path.split("?", 1)[0])
+        try:
+            if route is None:
+                raise RequestError(404, f"unknown path: {path}")
+            allowed, handler = route
+            if method != allowed:
+                raise RequestError(405, f"{path} expects {allowed}")
+            return 200, await handler(_parse_body(body) if allowed == "POST" else {})
+        except RequestError as exc:
+            return exc.status, _error(exc)
+        except (ProfileValidationError, MetricsParseError) as exc:
+            return 422, _error(exc)
+        except Exception as exc:  # keep serving; report to the caller
+            return 500, _error(exc)
+
+    # -- handlers -------------------------------------------------------------
+
+    async def _health(self, request: dict) -> bytes:
+        return _dumps({"status": "ok", "profiles_cached": len(self._warm)})
+
+    async def _profile(self, request: dict) -> bytes:
+        warm = await self._resolve(request)
+        return _dumps(to_dict(warm.profile))
+
+    async def _plan(self, request: dict) -> bytes:
+        warm = await self._resolve(request)
+        if warm.plan_json is None:
+            warm.plan_json = await self._offload(_plan_json, warm.profile, warm.path)
+        return warm.plan_json
+
+    async def _interpret(self, request: dict) -> bytes:
+        warm = await self._resolve(request)
+        sources = [k for k in ("metrics", "metrics_path", "samples_path") if k in request]
+        if len(sources) != 1:
+            raise RequestError(
+                400, "pass exactly one of metrics, metrics_path, or samples_path"
+            )
+        kind = sources[0]
+        if kind == "metrics" and not isinstance(request[kind], dict):
+            raise RequestError(400, "metrics must be an object")
+        if kind != "metrics" and not isinstance(request[kind], str):
+            raise RequestError(400, f"{kind} must be a path")
+        job = (warm.profile.slo, kind, request[kind])
+        if self._pool is None:
+            result = _interpret_job(job)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, _interpret_job, job)
+        result["service"] = warm.profile.service
+        return _dumps(result)
+
+    async def _resolve(self, request: dict) -> "_WarmProfile":
+        """The warm entry for the request's profile, loading it on a miss."""
+        if "profile_data" in request:
+            raw = request["profile_data"]
+            if not isinstance(raw, dict):
+                raise RequestError(400, "profile_data must be an object")
+            return _WarmProfile(await self._offload(build_profile, raw), "<inline>", None)
+
+        path = request.get("profile")
+        if not isinstance(path, str):
+            raise RequestError(400, "pass profile (a path) or profile_data (an object)")
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise ProfileValidationError(f"profile file not found: {path}")
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        warm = self._warm.get(path)
+        if warm is not None and warm.stamp == stamp:
+            self._warm.move_to_end(path)
+            return warm
+        profile = await self._offload(load_profile, path, self.profile_cache)
+        warm = _WarmProfile(profile, path, stamp)
+        self._warm[path] = warm
+        self._warm.move_to_end(path)
+        while len(self._warm) > self.cache_size:
+            self._warm.popitem(last=False)
+        return warm
+
+    async def _offload(self, fn: Callable, *args):
+        """Run blocking work in the worker pool, or a thread if there is none."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    # -- HTTP -----------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(_response(400, _error("malformed request line"), False))
+                    await writer.drain()
+                    break
+                headers = {}
+                count = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    count += 1
+                    if count > MAX_HEADERS:
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                if count > MAX_HEADERS:
+                    status, body = 431, _error(f"more than {MAX_HEADERS} header fields")
+                    keep_alive = False
+                elif "transfer-encoding" in headers:
+                    status, body = 501, _error("chunked request bodies are not supported")
+                    keep_alive = False
+                else:
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        length = -1
+                    if length < 0 or length > MAX_BODY_BYTES:
+                        status = 400 if length < 0 else 413
+                        body = _error(f"invalid or oversized body ({headers.get('content-length')})")
+                        keep_alive = False
+                    else:
+                        payload = await reader.readexactly(length) if length else b""
+                        status, body = await self.dispatch(method, path, payload)
+
+                writer.write(_response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def run(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    profile_cache: Optional[ProfileCache] = None,
+    ready: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Run a PlanServer until SIGINT or SIGTERM.
+
+    Args:
+        host: TCP interface to bind.
+        port: TCP port to bind.
+        unix_path: Listen on this Unix socket instead of TCP.
+        workers: Interpretation worker processes (see PlanServer).
+        profile_cache: Optional on-disk ProfileCache.
+        ready: Called with the listening address once the server accepts
+            connections.
+    """
+
+    async def _main():
+        server = PlanServer(workers=workers, profile_cache=profile_cache)
+        address = await server.start(host, port, unix_path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if ready is not None:
+            ready(address)
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    asyncio.run(_main())
+
+
+# -- internal helpers ---------------------------------------------------------
+
+
+class _WarmProfile:
+    """A validated profile and, once requested, its serialized plan."""
+
+    __slots__ = ("profile", "path", "stamp", "plan_json")
+
+    def __init__(self, profile: ServiceProfile, path: str, stamp: Optional[tuple]):
+        self.profile = profile
+        self.path = path
+        self.stamp = stamp
+        self.plan_json: Optional[bytes] = None
+
+
+def _plan_json(profile: ServiceProfile, path: str) -> bytes:
+    """Generate and serialize a plan; runs in a worker process."""
+    plan = generate_plan(profile, path)
+    return plan_to_json(plan, indent=None).encode("utf-8")
+
+
+def _interpret_job(job: Tuple[SLO, str, object]) -> dict:
+    """Load metrics and interpret them; runs in a worker process."""
+    slo, kind, source = job
+    if kind == "metrics":
+        metrics, warnings = metrics_from_dict(source)
+    elif kind == "samples_path":
+        from src.samples import load_raw_samples
+
+        metrics, warnings = load_raw_samples(source)
+    else:
+        metrics, warnings = load_metrics(source)
+
+    result = interpret(metrics, slo)
+    return {
+        "status": result.status,
+        "narrative": result.narrative,
+        "checks": result.checks,
+        "risks": result.risks,
+        "warnings": warnings,
+    }
+
+
+def _warm_worker() -> None:
+    """Import the interpretation path so the first real request is fast."""
+    import importlib
+
+    importlib.import_module("src.samples")
+
+
+def _parse_body(body: bytes) -> dict:
+    try:
+        request = json.loads(body) if body else {}
+    except ValueError as exc:
+        raise RequestError(400, f"invalid JSON body: {exc}")
+    if not isinstance(request, dict):
+        raise RequestError(400, "request body must be a JSON object")
+    return request
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+def _error(exc) -> bytes:
+    return _dumps({"error": str(exc)})
+
+
+def _response(status: int, body: bytes, keep_alive: bool) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
@@ -0,0 +1,418 @@
+"""Windowed aggregation of time-series metrics exports.
+
+A time-series CSV has one row per sample interval (typically one second)
+with the same columns as a summary CSV plus an optional ``ts`` column in
+epoch seconds. Rows are read in chunks, parsed into one NumPy array per
+column, and folded into fixed-width windows, so a 24-hour export is
+evaluated over its whole duration while memory stays proportional to the
+number of windows rather than rows.
+"""
+
+import io
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.checks import compile_checks
+from src.interpreter import (
+    METRIC_FIELDS,
+    MetricsParseError,
+    build_narrative,
+    interpret,
+    metrics_from_dict,
+    resource_risks,
+)
+from src.models import (
+    InterpretationResult,
+    MetricsSummary,
+    SLO,
+    Scenario,
+    StageInterpretation,
+)
+
+TIMESTAMP_COLUMN = "ts"
+
+# How each metric is rolled up inside a window: worst-case for latency,
+# memory, and GC pauses; average for rates and CPU.
+AGGREGATIONS = {
+    "p50_ms": "max",
+    "p90_ms": "max",
+    "p95_ms": "max",
+    "p99_ms": "max",
+    "error_rate": "mean",
+    "throughput_rps": "mean",
+    "cpu_percent": "mean",
+    "memory_percent": "max",
+    "gc_pause_ms": "max",
+}
+
+# Upper bound on the windows one series may span; a stray timestamp far
+# from the rest of the run would otherwise allocate a window for every gap.
+MAX_WINDOWS = 200_000
+
+_CHUNK_BYTES = 8 * 1024 * 1024
+_EMPTY_CELL = re.compile(rb"(?<=,)(?=,|\r?$)|^(?=,)", re.M)
+
+
+@dataclass
+class WindowedMetrics:
+    """Per-window aggregates, one array per metric (NaN when absent)."""
+
+    window_seconds: float
+    start_ts: float
+    columns: Dict[str, np.ndarray]
+    rows: np.ndarray  # rows that fell in each window
+    overall: MetricsSummary
+    warnings: List[str]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def window_starts(self) -> np.ndarray:
+        """Offset of each window from ``start_ts``, in seconds."""
+        return np.arange(len(self)) * self.window_seconds
+
+    def summary(self, i: int) -> MetricsSummary:
+        kwargs = {}
+        for name in METRIC_FIELDS:
+            col = self.columns.get(name)
+            val = None if col is None else col[i]
+            kwargs[name] = None if val is None or np.isnan(val) else float(val)
+        return MetricsSummary(**kwargs)
+
+
+@dataclass
+class MetricsSeries:
+    """Row-level metric columns with timestamps, sorted by time."""
+
+    ts: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def load_metrics_series(
+    path: str, interval_seconds: float = 1.0, chunk_bytes: int = _CHUNK_BYTES
+) -> MetricsSeries:
+    """Load every row of a time-series CSV as one array per column.
+
+    Uses the same format as ``load_metrics_timeseries``. Rows without a
+    ``ts`` column are stamped ``row * interval_seconds``.
+
+    Raises:
+        MetricsParseError: If the file is missing, has no recognised metric
+            columns or data rows, or contains non-numeric values.
+    """
+    if not os.path.isfile(path):
+        raise MetricsParseError(f"metrics file not found: {path}")
+    with open(path, "rb") as f:
+        fields, has_ts, usecols = _read_header(f)
+        blocks = [arr for arr in _read_chunks(f, usecols, chunk_bytes) if arr.shape[0]]
+    if not blocks:
+        raise MetricsParseError("CSV file has no data rows")
+    data = np.concatenate(blocks)
+    if has_ts:
+        ts, data = data[:, 0], data[:, 1:]
+    else:
+        ts = np.arange(data.shape[0]) * interval_seconds
+    order = np.argsort(ts, kind="stable")
+    ts, data = ts[order], data[order]
+    return MetricsSeries(ts=ts, columns={name: data[:, j] for j, name in enumerate(fields)})
+
+
+def load_metrics_timeseries(
+    path: str,
+    window_seconds: float = 60.0,
+    interval_seconds: float = 1.0,
+    chunk_bytes: int = _CHUNK_BYTES,
+    max_windows: int = MAX_WINDOWS,
+) -> WindowedMetrics:
+    """Stream a time-series CSV into per-window aggregates.
+
+    Windows are aligned to the first row's timestamp. Rows stamped earlier
+    (the file need not be sorted) get windows in front of it, so
+    ``start_ts`` is the start of the earliest window. Rows with an empty
+    ``ts`` are skipped with a warning.
+
+    Args:
+        path: CSV with a header naming metric columns (see ``METRIC_FIELDS``)
+            and optionally ``ts``. Empty cells are treated as missing.
+        window_seconds: Width of each aggregation window.
+        interval_seconds: Spacing assumed between rows when there is no
+            ``ts`` column.
+        chunk_bytes: Approximate bytes parsed per chunk.
+        max_windows: Largest number of windows the timestamps may span.
+
+    Returns:
+        A WindowedMetrics with per-window columns and an overall summary
+        aggregated with the same rules across every row.
+
+    Raises:
+        MetricsParseError: If the file is missing, has no recognised metric
+            columns or data rows, contains non-numeric values, or its
+            timestamps span more than ``max_windows`` windows.
+    """
+    if not os.path.isfile(path):
+        raise MetricsParseError(f"metrics file not found: {path}")
+    if window_seconds <= 0:
+        raise MetricsParseError("window_seconds must be positive")
+
+    with open(path, "rb") as f:
+        fields, has_ts, usecols = _read_header(f)
+        acc = _WindowAccumulator(
+            fields, window_seconds, has_ts, interval_seconds, max_windows
+        )
+        for arr in _read_chunks(f, usecols, chunk_bytes):
+            acc.add(arr)
+
+    if acc.total_rows == 0:
+        raise MetricsParseError("CSV file has no data rows")
+    return acc.finish()
+
+
+def interpret_windows(
+    windowed: WindowedMetrics, slo: SLO
+) -> Tuple[InterpretationResult, List[InterpretationResult]]:
+    """Interpret the overall summary and every window against an SLO."""
+    overall = interpret(windowed.overall, slo)
+    per_window = [interpret(windowed.summary(i), slo) for i in range(len(windowed))]
+    return overall, per_window
+
+
+def evaluate_stages(
+    scenario: Scenario,
+    series: MetricsSeries,
+    start_ts: Optional[float] = None,
+    include_ramps: bool = False,
+) -> List[StageInterpretation]:
+    """Judge each stage of a scenario against its own checks.
+
+    Rows are assigned to stages by cumulative ``Stage.duration_seconds``
+    measured from ``start_ts`` (default: the first row). Each stage's rows
+    are aggregated with the AGGREGATIONS rules and every scenario check is
+    evaluated for all stages at once by the compiled check engine.
+
+    Args:
+        scenario: Scenario from a generated plan; its checks are applied.
+        series: Time-stamped metrics.
+        start_ts: Timestamp at which the scenario started.
+        include_ramps: Also judge stages named ``ramp-*``, whose metrics are
+            usually dominated by warm-up and drain effects.
+
+    Returns:
+        One StageInterpretation per judged stage, in scenario order.
+    """
+    stages = scenario.stages
+    if not stages:
+        return []
+    fields = list(series.columns)
+    values = np.column_stack([series.columns[name] for name in fields])
+    start = float(series.ts[0]) if start_ts is None else float(start_ts)
+
+    bounds = np.concatenate(([0], np.cumsum([s.duration_seconds for s in stages])))
+    cuts = np.searchsorted(series.ts - start, bounds, side="left")
+    agg, counts = _segment_aggregate(values, cuts, fields)
+    samples = np.diff(cuts)
+
+    # One vectorized comparison per operator across every stage.
+    engine = compile_checks(scenario.checks, fields)
+    passed, present, picked = engine.evaluate(agg)
+
+    results = []
+    for i, stage in enumerate(stages):
+        if not include_ramps and stage.name.startswith("ramp"):
+            continue
+        checks = engine.results(passed[i], present[i], picked[i])
+        summary = _row_summary(agg[i], fields)
+        risks = resource_risks(summary)
+        any_fail = any(c["result"] == "fail" for c in checks)
+        status = "fail" if any_fail else ("warning" if risks else "pass")
+        results.append(StageInterpretation(
+            stage=stage.name,
+            start_s=int(bounds[i]),
+            end_s=int(bounds[i + 1]),
+            samples=int(samples[i]),
+            result=InterpretationResult(
+                status=status,
+                narrative=build_narrative(status, checks, risks, summary),
+                checks=checks,
+                risks=risks,
+            ),
+        ))
+    return results
+
+
+def _segment_aggregate(values: np.ndarray, cuts: np.ndarray, fields: List[str]):
+    """Aggregate contiguous row segments ``[cuts[i], cuts[i+1])`` per column.
+
+    Returns (aggregates, non-missing counts), both shaped (segments, columns).
+    Sums come from prefix sums and maxima from ``fmax.reduceat`` so every
+    column of every segment is computed in one pass.
+    """
+    present = ~np.isnan(values)
+    zero_row = np.zeros((1, values.shape[1]))
+    csum = np.vstack([zero_row, np.cumsum(np.where(present, values, 0.0), axis=0)])
+    ccount = np.vstack([zero_row, np.cumsum(present, axis=0)])
+    sums = csum[cuts[1:]] - csum[cuts[:-1]]
+    counts = ccount[cuts[1:]] - ccount[cuts[:-1]]
+
+    padded = np.vstack([values, np.full((1, values.shape[1]), np.nan)])
+    maxes = np.fmax.reduceat(padded, cuts, axis=0)[:-1]
+
+    is_max = np.array([AGGREGATIONS[name] == "max" for name in fields])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        agg = np.where(is_max, maxes, sums / counts)
+    agg[counts == 0] = np.nan
+    return agg, counts
+
+
+def _row_summary(row: np.ndarray, fields: List[str]) -> MetricsSummary:
+    kwargs = {name: None for name in METRIC_FIELDS}
+    for j, name in enumerate(fields):
+        if not np.isnan(row[j]):
+            kwargs[name] = float(row[j])
+    return MetricsSummary(**kwargs)
+
+
+def _read_header(f) -> Tuple[List[str], bool, List[int]]:
+    """Return (metric fields, has ts column, column indices to parse)."""
+    header = [h.strip() for h in f.readline().decode().split(",")]
+    fields = [name for name in METRIC_FIELDS if name in header]
+    if not fields:
+        raise MetricsParseError("CSV has no recognised metric columns")
+    has_ts = TIMESTAMP_COLUMN in header
+    names = ([TIMESTAMP_COLUMN] if has_ts else []) + fields
+    return fields, has_ts, [header.index(n) for n in names]
+
+
+def _read_chunks(f, usecols: List[int], chunk_bytes: int) -> Iterator[np.ndarray]:
+    """Yield parsed row blocks, splitting reads on line boundaries."""
+    tail = b""
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        yield _parse_chunk(block[:cut], usecols)
+    if tail.strip():
+        yield _parse_chunk(tail, usecols)
+
+
+def _parse_chunk(data: bytes, usecols: List[int]) -> np.ndarray:
+    if not data.strip():
+        return np.empty((0, len(usecols)))
+    data = _EMPTY_CELL.sub(b"nan", data)
+    try:
+        return np.loadtxt(io.BytesIO(data), delimiter=",", usecols=usecols, ndmin=2)
+    except ValueError as exc:
+        raise MetricsParseError(f"failed to parse CSV: {exc}") from exc
+
+
+class _WindowAccumulator:
+    """Running per-window sums, counts, and maxima for each metric column."""
+
+    def __init__(
+        self,
+        fields: List[str],
+        window_seconds: float,
+        has_ts: bool,
+        interval_seconds: float,
+        max_windows: int = MAX_WINDOWS,
+    ):
+        self.fields = fields
+        self.window_seconds = window_seconds
+        self.has_ts = has_ts
+        self.interval_seconds = interval_seconds
+        self.max_windows = max_windows
+        self.start_ts: Optional[float] = None
+        self.total_rows = 0
+        self.untimed_rows = 0
+        n = len(fields)
+        self.sums = np.zeros((n, 0))
+        self.counts = np.zeros((n, 0), dtype=np.int64)
+        self.maxes = np.full((n, 0), np.nan)
+        self.rows = np.zeros(0, dtype=np.int64)
+
+    def add(self, arr: np.ndarray) -> None:
+        if self.has_ts:
+            timed = ~np.isnan(arr[:, 0])
+            self.untimed_rows += int(arr.shape[0] - timed.sum())
+            arr = arr[timed]
+            ts, values = arr[:, 0], arr[:, 1:]
+        else:
+            ts = (self.total_rows + np.arange(arr.shape[0])) * self.interval_seconds
+            values = arr
+        if arr.shape[0] == 0:
+            return
+        if self.start_ts is None:
+            self.start_ts = float(ts[0])
+        window = np.floor((ts - self.start_ts) / self.window_seconds).astype(np.int64)
+        lo, hi = int(window.min()), int(window.max())
+        span = max(hi + 1, self.rows.size) - min(lo, 0)
+        if span > self.max_windows:
+            raise MetricsParseError(
+                f"timestamps span {span} windows of {self.window_seconds:g}s "
+                f"(limit {self.max_windows}); check the ts column for outliers "
+                "or use a wider window"
+            )
+        if lo < 0:
+            # Rows stamped before the first row: add windows in front.
+            self._grow(-lo, front=True)
+            self.start_ts -= -lo * self.window_seconds
+            window -= lo
+        self._grow(int(window.max()) + 1 - self.rows.size)
+        size = self.rows.size
+        self.rows += np.bincount(window, minlength=size)
+        self.total_rows += window.size
+        for j in range(len(self.fields)):
+            col = values[:, j]
+            present = ~np.isnan(col)
+            w = window[present]
+            self.sums[j] += np.bincount(w, weights=col[present], minlength=size)
+            self.counts[j] += np.bincount(w, minlength=size)
+            np.fmax.at(self.maxes[j], w, col[present])
+
+    def _grow(self, extra: int, front: bool = False) -> None:
+        if extra <= 0:
+            return
+        n = len(self.fields)
+
+        def pad(arr, fill):
+            return np.hstack([fill, arr] if front else [arr, fill])
+
+        self.sums = pad(self.sums, np.zeros((n, extra)))
+        self.counts = pad(self.counts, np.zeros((n, extra), dtype=np.int64))
+        self.maxes = pad(self.maxes, np.full((n, extra), np.nan))
+        self.rows = pad(self.rows, np.zeros(extra, dtype=np.int64))
+
+    def finish(self) -> WindowedMetrics:
+        columns = {}
+        overall = {}
+        for j, name in enumerate(self.fields):
+            if AGGREGATIONS[name] == "max":
+                columns[name] = self.maxes[j]
+                present = self.maxes[j][~np.isnan(self.maxes[j])]
+                if present.size:
+                    overall[name] = float(present.max())
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    columns[name] = self.sums[j] / self.counts[j]
+                if self.counts[j].sum():
+                    overall[name] = float(self.sums[j].sum() / self.counts[j].sum())
+        summary, warnings = metrics_from_dict(overall)
+        if self.untimed_rows:
+            warnings.append(f"skipped {self.untimed_rows} row(s) without a {TIMESTAMP_COLUMN}")
+        return WindowedMetrics(
+            window_seconds=self.window_seconds,
+            start_ts=self.start_ts,
+            columns=columns,
+            rows=self.rows,
+            overall=summary,
+            warnings=warnings,
+        )
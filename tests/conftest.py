@@ -0,0 +1,9 @@
+"""Shared pytest configuration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_profile_cache(tmp_path, monkeypatch):
+    """Keep the parsed-profile cache out of the user's home directory."""
+    monkeypatch.setenv("PERF_ASSISTANT_CACHE_DIR", str(tmp_path / "profile-cache"))
@@ -0,0 +1,132 @@
+"""Tests for batch plan generation."""
+
+import json
+import os
+import tempfile
+
+from src.batch import discover_profiles, plan_batch, plan_bundle
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+def _write_fleet(tmpdir, count):
+    """Write `count` valid JSON profiles plus one invalid profile."""
+    src = os.path.join(FIXTURES_DIR, "checkout-profile.json")
+    with open(src, "r") as f:
+        base = json.load(f)
+    for i in range(count):
+        base["service"] = f"svc-{i}"
+        with open(os.path.join(tmpdir, f"svc-{i}.json"), "w") as f:
+            json.dump(base, f)
+    with open(os.path.join(tmpdir, "broken.json"), "w") as f:
+        json.dump({"not": "a profile"}, f)
+
+
+class TestDiscoverProfiles:
+    def test_directory(self):
+        paths = discover_profiles(FIXTURES_DIR)
+        names = [os.path.basename(p) for p in paths]
+        assert "checkout-profile.yaml" in names
+        assert "checkout-profile.json" in names
+        assert "metrics-partial.csv" not in names
+
+    def test_glob(self):
+        paths = discover_profiles(os.path.join(FIXTURES_DIR, "checkout-*.yaml"))
+        assert [os.path.basename(p) for p in paths] == ["checkout-profile.yaml"]
+
+
+class TestPlanBatch:
+    def test_serial_batch_collects_failures(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiles_dir = os.path.join(tmpdir, "profiles")
+            out_dir = os.path.join(tmpdir, "plans")
+            os.makedirs(profiles_dir)
+            _write_fleet(profiles_dir, 3)
+
+            report = plan_batch(discover_profiles(profiles_dir), out_dir, workers=1)
+
+            assert len(report.planned) == 3
+            assert len(report.failures) == 1
+            assert report.failures[0].profile.endswith("broken.json")
+            assert "validation failed" in report.failures[0].error
+            assert sorted(os.listdir(out_dir)) == ["svc-0.json", "svc-1.json", "svc-2.json"]
+            assert report.throughput > 0
+
+    def test_process_pool_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_dir = os.path.join(tmpdir, "plans")
+            _write_fleet(tmpdir, 6)
+
+            report = plan_batch(
+                discover_profiles(tmpdir), out_dir, workers=2, chunk_size=2
+            )
+
+            assert len(report.planned) == 6
+            assert len(report.failures) == 1
+            with open(os.path.join(out_dir, "svc-4.json"), "r") as f:
+                plan = json.load(f)
+            assert plan["service"] == "svc-4"
+            assert report.planned[0].scenarios == ["steady", "burst", "soak"]
+
+    def test_unexpected_errors_become_failures(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_dir = os.path.join(tmpdir, "plans")
+            _write_fleet(tmpdir, 3)
+            with open(os.path.join(FIXTURES_DIR, "checkout-profile.json"), "r") as f:
+                bad = json.load(f)
+            bad["service"] = "bad"
+            bad["slo"]["latency_ms"]["p95"] = "fast"
+            with open(os.path.join(tmpdir, "bad.json"), "w") as f:
+                json.dump(bad, f)
+
+            report = plan_batch(discover_profiles(tmpdir), out_dir, workers=2)
+
+            assert len(report.planned) == 3
+            failures = {os.path.basename(f.profile): f.error for f in report.failures}
+            assert failures["bad.json"].startswith("ValueError:")
+            assert "broken.json" in failures
+
+    def test_duplicate_services_are_failures(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_dir = os.path.join(tmpdir, "plans")
+            with open(os.path.join(FIXTURES_DIR, "checkout-profile.json"), "r") as f:
+                base = json.load(f)
+            for name in ("a.json", "b.json"):
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    json.dump(base, f)
+
+            report = plan_batch(discover_profiles(tmpdir), out_dir, workers=2)
+
+            assert [os.path.basename(i.profile) for i in report.planned] == ["a.json"]
+            assert len(report.failures) == 1
+            assert report.failures[0].profile.endswith("b.json")
+            assert "already planned from" in report.failures[0].error
+            assert os.listdir(out_dir) == [f"{base['service']}.json"]
+            with open(report.planned[0].plan_path, "r") as f:
+                assert json.load(f)["profile_path"].endswith("a.json")
+
+
+class TestPlanBundle:
+    def test_plans_each_document(self):
+        bundle = os.path.join(FIXTURES_DIR, "fleet-bundle.yaml")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = plan_bundle(bundle, tmpdir)
+            assert [i.service for i in report.planned] == ["checkout-api", "inventory-api"]
+            assert len(report.failures) == 1
+            assert report.failures[0].profile.endswith("fleet-bundle.yaml#1")
+            assert sorted(os.listdir(tmpdir)) == ["checkout-api.json", "inventory-api.json"]
+
+    def test_duplicate_and_unplannable_documents(self):
+        with open(os.path.join(FIXTURES_DIR, "fleet-bundle.yaml"), "r") as f:
+            first = f.read().split("---")[0]
+        bad = first.replace("service: checkout-api", "service: bad").replace("p95: 400", "p95: fast")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bundle = os.path.join(tmpdir, "bundle.yaml")
+            with open(bundle, "w") as f:
+                f.write("---\n".join([first, first, bad]))
+            report = plan_bundle(bundle, os.path.join(tmpdir, "plans"))
+        assert [i.service for i in report.planned] == ["checkout-api"]
+        assert [f.profile[len(bundle):] for f in report.failures] == ["[checkout-api]", "[bad]"]
+        assert "already planned" in report.failures[0].error
+        assert report.failures[1].error.startswith("ValueError:")
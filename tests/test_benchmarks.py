@@ -0,0 +1,52 @@
+"""Tests for the benchmark suite harness."""
+
+import json
+import os
+import tempfile
+
+from click.testing import CliRunner
+
+from benchmarks.bench import BENCHMARKS, Datasets, bench, compare, run_suite
+
+
+def _results(**best):
+    return {"meta": {}, "benchmarks": {name: {"best_s": s} for name, s in best.items()}}
+
+
+class TestCompare:
+    def test_verdicts(self):
+        baseline = _results(a=1.0, b=1.0, c=1.0, gone=1.0)
+        current = _results(a=1.05, b=1.5, c=0.5, added=1.0)
+        verdicts = {row[0]: row[4] for row in compare(baseline, current, tolerance=0.1)}
+        assert verdicts == {
+            "a": "ok", "b": "regressed", "c": "improved", "gone": "missing", "added": "new",
+        }
+
+    def test_compare_command_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = os.path.join(tmpdir, "base.json")
+            cur = os.path.join(tmpdir, "cur.json")
+            for path, doc in ((base, _results(a=1.0)), (cur, _results(a=2.0))):
+                with open(path, "w") as f:
+                    json.dump(doc, f)
+            runner = CliRunner()
+            result = runner.invoke(bench, ["compare", base, cur])
+            assert result.exit_code == 1
+            assert "REGRESSED" in result.output
+            result = runner.invoke(bench, ["compare", base, base])
+            assert result.exit_code == 0
+
+
+class TestRunSuite:
+    def test_every_benchmark_runs_on_tiny_data(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = Datasets(tmpdir, scale=0.0005)
+            results = run_suite(data, repeat=1)
+            assert list(results["benchmarks"]) == list(BENCHMARKS)
+            for result in results["benchmarks"].values():
+                assert result["best_s"] >= 0 and result["items"] >= 1
+            assert results["meta"]["sizes"]["evidence_lines"] == 2500
+            json.dumps(results)
+            # Generated data sets are reused, not regenerated.
+            before = os.path.getmtime(data.samples())
+            assert os.path.getmtime(Datasets(tmpdir, scale=0.0005).samples()) == before
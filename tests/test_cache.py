@@ -0,0 +1,71 @@
+"""Tests for the parsed-profile cache."""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from src.cache import ProfileCache
+from src.loader import load_profile
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+class TestProfileCache:
+    def test_hit_skips_yaml_parsing(self):
+        path = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ProfileCache(tmpdir)
+            first = load_profile(path, cache=cache)
+            with mock.patch("yaml.load") as yaml_load:
+                second = load_profile(path, cache=cache)
+                yaml_load.assert_not_called()
+            assert second == first
+            assert len(os.listdir(tmpdir)) == 1
+
+    def test_edited_profile_misses(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "profile.yaml")
+            shutil.copy(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"), path)
+            cache = ProfileCache(os.path.join(tmpdir, "cache"))
+            assert load_profile(path, cache=cache).service == "checkout-api"
+
+            with open(path, "r") as f:
+                content = f.read()
+            with open(path, "w") as f:
+                f.write(content.replace("checkout-api", "checkout-v2"))
+            assert load_profile(path, cache=cache).service == "checkout-v2"
+
+    def test_corrupt_entry_is_discarded(self):
+        path = os.path.join(FIXTURES_DIR, "checkout-profile.json")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ProfileCache(tmpdir)
+            load_profile(path, cache=cache)
+            (entry,) = os.listdir(tmpdir)
+            with open(os.path.join(tmpdir, entry), "wb") as f:
+                f.write(b"garbage")
+            assert load_profile(path, cache=cache).service == "checkout-api"
+
+    def test_lru_eviction(self):
+        profile = load_profile(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ProfileCache(tmpdir, max_bytes=10**9)
+            for i in range(3):
+                cache.put(f"k{i}", profile)
+                os.utime(os.path.join(tmpdir, f"k{i}.bin"), (i, i))
+            assert cache.get("k0") is not None  # refreshes k0's recency
+
+            entry_size = os.path.getsize(os.path.join(tmpdir, "k0.bin"))
+            cache.max_bytes = entry_size * 2
+            assert cache.evict() == 1
+            assert sorted(os.listdir(tmpdir)) == ["k0.bin", "k2.bin"]
+
+    def test_clear(self):
+        profile = load_profile(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ProfileCache(tmpdir)
+            cache.put("a", profile)
+            cache.put("b", profile)
+            assert cache.clear() == 2
+            assert cache.get("a") is None
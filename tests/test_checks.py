@@ -0,0 +1,77 @@
+"""Tests for the compiled check engine."""
+
+import numpy as np
+import pytest
+
+from src.checks import SUMMARY_COLUMNS, compile_checks, metric_column
+from src.interpreter import interpret
+from src.models import Check, MetricsSummary, SLO
+
+
+def _summary(**kwargs):
+    values = {name: None for name in SUMMARY_COLUMNS}
+    values.update(kwargs)
+    return MetricsSummary(**values)
+
+
+CHECKS = [
+    Check(metric="latency_p95", operator="<=", threshold=400),
+    Check(metric="error_rate", operator="<", threshold=0.01),
+    Check(metric="throughput_rps", operator=">=", threshold=100),
+]
+
+
+class TestCompiledChecks:
+    def test_metric_column(self):
+        assert metric_column("latency_p99") == "p99_ms"
+        assert metric_column("error_rate") == "error_rate"
+
+    def test_evaluate_summary(self):
+        engine = compile_checks(CHECKS)
+        results = engine.evaluate_summary(
+            _summary(p95_ms=350.0, error_rate=0.02, throughput_rps=None)
+        )
+        assert [r["result"] for r in results] == ["pass", "fail", "skip"]
+        assert results[0]["detail"] == "p95 latency: 350.0 ms (threshold: 400 ms)"
+        assert results[1]["detail"] == "error rate: 2.00% (threshold: < 1.0%)"
+
+    def test_evaluate_matrix_matches_per_row(self):
+        rng = np.random.default_rng(3)
+        matrix = rng.uniform(0, 800, size=(500, len(SUMMARY_COLUMNS)))
+        matrix[rng.random(matrix.shape) < 0.1] = np.nan
+        engine = compile_checks(CHECKS)
+        passed, present, picked = engine.evaluate(matrix)
+        assert passed.shape == (500, len(CHECKS))
+        for row in range(0, 500, 37):
+            single = engine.evaluate(matrix[row])
+            np.testing.assert_array_equal(single[0], passed[row])
+            np.testing.assert_array_equal(single[1], present[row])
+
+    def test_custom_columns_and_unknown_metric(self):
+        engine = compile_checks(
+            CHECKS + [Check(metric="queue_depth", operator="<=", threshold=5)],
+            columns=["throughput_rps", "p95_ms"],
+        )
+        passed, present, _ = engine.evaluate(np.array([[150.0, 500.0]]))
+        assert present.tolist() == [[True, False, True, False]]
+        assert passed.tolist() == [[False, False, True, False]]
+
+    def test_unsupported_operator(self):
+        with pytest.raises(ValueError, match="unsupported check operator"):
+            compile_checks([Check(metric="error_rate", operator="==", threshold=0)])
+
+    def test_missing_threshold(self):
+        with pytest.raises(ValueError, match="latency_p95 has no threshold"):
+            compile_checks([Check(metric="latency_p95", operator="<=", threshold=None)])
+
+
+class TestInterpretWithChecks:
+    def test_plan_checks_replace_slo_checks(self):
+        slo = SLO(latency_ms={"p95": 400}, error_rate=0.01)
+        metrics = _summary(p95_ms=350.0, error_rate=0.005, throughput_rps=50.0)
+        assert interpret(metrics, slo).status == "pass"
+        result = interpret(metrics, slo, checks=CHECKS)
+        assert result.status == "fail"
+        assert [c["metric"] for c in result.checks] == [
+            "latency_p95", "error_rate", "throughput_rps",
+        ]
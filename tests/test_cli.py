@@ -2,6 +2,7 @@
 
 import json
 import os
+import shutil
 import tempfile
 
 from click.testing import CliRunner
@@ -22,6 +23,14 @@ class TestPlanCommand:
         assert parsed["service"] == "checkout-api"
         assert len(parsed["scenarios"]) == 3
 
+    def test_plan_compact(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner()
+        result = runner.invoke(main, ["plan", "--profile", profile, "--compact"])
+        assert result.exit_code == 0
+        assert result.output.count("\n") == 1
+        assert json.loads(result.output)["service"] == "checkout-api"
+
     def test_plan_to_file(self):
         profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -117,6 +126,154 @@ class TestInterpretCommand:
         assert result.exit_code == 0
         assert "PASS" in result.output
 
+    def test_interpret_raw_samples(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        samples = os.path.join(FIXTURES_DIR, "samples-raw.csv")
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["interpret-cmd", "--profile", profile, "--samples", samples]
+        )
+        assert result.exit_code == 0
+        assert "error rate: 4.76%" in result.output
+
+    def test_interpret_k6_output(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "k6-results.json")
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["interpret-cmd", "--profile", profile, "--metrics", metrics]
+        )
+        assert result.exit_code == 0
+        assert "error rate: 10.00%" in result.output
+
+    def test_interpret_timeseries_windows(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-timeseries.csv")
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(
+            main,
+            ["interpret-cmd", "--profile", profile, "--metrics", metrics, "--window", "60"],
+        )
+        assert result.exit_code == 0
+        assert "Windows: 10 x 60s evaluated" in result.output
+        output = json.loads(result.output[result.output.index("\n{") :])
+        assert len(output["windows"]) == 10
+        assert output["windows"][4] == {"start_s": 240.0, "status": "fail"}
+
+    def test_interpret_scenario_stages(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-timeseries.csv")
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            [
+                "interpret-cmd", "--profile", profile, "--metrics", metrics,
+                "--scenario", "burst",
+            ],
+        )
+        assert result.exit_code == 0
+        output = json.loads(result.output[result.output.index("\n{") :])
+        stages = [s["stage"] for s in output["stages"]]
+        assert stages == ["hold-baseline", "spike", "hold-burst", "recover"]
+
+    def test_interpret_window_and_scenario_are_exclusive(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-timeseries.csv")
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(
+            main,
+            [
+                "interpret-cmd", "--profile", profile, "--metrics", metrics,
+                "--window", "60", "--scenario", "burst",
+            ],
+        )
+        assert result.exit_code == 1
+        assert "--window and --scenario are mutually exclusive" in result.stderr
+
+    def test_interpret_metrics_glob(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(
+            main,
+            [
+                "interpret-cmd", "--profile", profile,
+                "--metrics-glob", os.path.join(FIXTURES_DIR, "metrics-*ing.json"),
+                "--workers", "2",
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.output.startswith("Status: FAIL (2 file(s): 1 pass, 0 warning, 1 fail)")
+        assert "metrics-failing.json: missing field: gc_pause_ms" in result.stderr
+        output = json.loads(result.output[result.output.index("\n{") :])
+        assert [os.path.basename(f["path"]) for f in output["files"]] == [
+            "metrics-failing.json", "metrics-passing.json",
+        ]
+        assert [f["status"] for f in output["files"]] == ["fail", "pass"]
+
+    def test_interpret_metrics_glob_no_match(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(
+            main, ["interpret-cmd", "--profile", profile, "--metrics-glob", "nothing-*.json"]
+        )
+        assert result.exit_code == 1
+        assert "no metrics files match" in result.stderr
+
+    def test_interpret_merged_histograms(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        samples = os.path.join(FIXTURES_DIR, "samples-raw.csv")
+        runner = CliRunner(mix_stderr=False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for node in ("a", "b"):
+                result = runner.invoke(
+                    main,
+                    [
+                        "interpret-cmd", "--profile", profile, "--samples", samples,
+                        "--save-histogram", os.path.join(tmpdir, f"{node}.hist.json"),
+                    ],
+                )
+                assert result.exit_code == 0
+            result = runner.invoke(
+                main,
+                [
+                    "interpret-cmd", "--profile", profile,
+                    "--histograms", os.path.join(tmpdir, "*.hist.json"),
+                ],
+            )
+        assert result.exit_code == 0
+        # Two copies of the same samples: same percentiles and error rate.
+        assert "error rate: 4.76%" in result.output
+
+    def test_save_histogram_requires_samples(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-passing.json")
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(
+            main,
+            [
+                "interpret-cmd", "--profile", profile, "--metrics", metrics,
+                "--save-histogram", "out.json",
+            ],
+        )
+        assert result.exit_code == 1
+        assert "--save-histogram requires --samples" in result.stderr
+
+    def test_interpret_window_requires_csv(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-passing.json")
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            ["interpret-cmd", "--profile", profile, "--metrics", metrics, "--window", "60"],
+        )
+        assert result.exit_code == 1
+
+    def test_interpret_requires_one_input(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner()
+        result = runner.invoke(main, ["interpret-cmd", "--profile", profile])
+        assert result.exit_code == 1
+
     def test_interpret_failing(self):
         profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
         metrics = os.path.join(FIXTURES_DIR, "metrics-failing.json")
@@ -126,3 +283,283 @@ class TestInterpretCommand:
         )
         assert result.exit_code == 0
         assert "FAIL" in result.output
+
+
+class TestPlanBatchCommand:
+    def test_plan_batch_writes_plans_and_reports_failures(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shutil.copy(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"), tmpdir)
+            with open(os.path.join(tmpdir, "broken.json"), "w") as f:
+                json.dump({"not": "a profile"}, f)
+            out_dir = os.path.join(tmpdir, "plans")
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            runner = CliRunner(mix_stderr=False)
+            result = runner.invoke(
+                main,
+                [
+                    "plan-batch",
+                    "--profiles", tmpdir,
+                    "--out-dir", out_dir,
+                    "--workers", "1",
+                    "--log", log_path,
+                ],
+            )
+            assert result.exit_code == 1
+            assert "Planned 1 profile(s), 1 failed" in result.output
+            assert "profiles/sec" in result.output
+            assert "broken.json" in result.stderr
+            assert os.path.isfile(os.path.join(out_dir, "checkout-api.json"))
+            with open(log_path, "r") as f:
+                assert len(f.readlines()) == 1
+
+    def test_plan_batch_no_matches(self):
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["plan-batch", "--profiles", "/nonexistent/*.yaml", "--out-dir", "x"]
+        )
+        assert result.exit_code == 1
+
+    def test_bundle_rejects_pool_and_cache_options(self):
+        bundle = os.path.join(FIXTURES_DIR, "fleet-bundle.yaml")
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            args = ["plan-batch", "--bundle", bundle, "--out-dir", tmpdir]
+            result = runner.invoke(main, args + ["--workers", "4", "--no-cache"])
+            assert result.exit_code == 1
+            assert "--workers, --no-cache cannot be used with --bundle" in result.output
+            assert not os.listdir(tmpdir)
+            result = runner.invoke(main, args)
+            assert "Planned 2 profile(s), 1 failed" in result.output
+
+
+class TestCacheCommands:
+    def test_plan_populates_cache_and_clear_empties_it(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        cache_dir = os.environ["PERF_ASSISTANT_CACHE_DIR"]
+        runner = CliRunner()
+        assert runner.invoke(main, ["plan", "--profile", profile]).exit_code == 0
+        assert len(os.listdir(cache_dir)) == 1
+
+        result = runner.invoke(main, ["cache", "clear"])
+        assert result.exit_code == 0
+        assert "Removed 1" in result.output
+        assert os.listdir(cache_dir) == []
+
+    def test_no_cache_skips_cache(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        cache_dir = os.environ["PERF_ASSISTANT_CACHE_DIR"]
+        runner = CliRunner()
+        result = runner.invoke(main, ["plan", "--profile", profile, "--no-cache"])
+        assert result.exit_code == 0
+        assert not os.path.exists(cache_dir)
+
+
+class TestLoaderInfo:
+    def test_loader_info_flag(self):
+        runner = CliRunner()
+        result = runner.invoke(main, ["--loader-info"])
+        assert result.exit_code == 0
+        assert "yaml_backend:" in result.output
+
+
+class TestScheduleCommand:
+    def test_schedule_writes_npy(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "steady.npy")
+            runner = CliRunner()
+            result = runner.invoke(
+                main,
+                [
+                    "schedule",
+                    "--profile", profile,
+                    "--scenario", "steady",
+                    "--arrival", "constant",
+                    "--out", out,
+                ],
+            )
+            assert result.exit_code == 0
+            assert os.path.isfile(out)
+            # 60s ramp to 50 rps, 600s hold, 30s ramp down
+            assert "32250 request offsets" in result.output
+
+    def test_schedule_rejects_zero_weights(self):
+        with open(os.path.join(FIXTURES_DIR, "checkout-profile.json"), "r") as f:
+            data = json.load(f)
+        for endpoint in data["endpoints"]:
+            endpoint["weight"] = 0
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profile = os.path.join(tmpdir, "zero.json")
+            with open(profile, "w") as f:
+                json.dump(data, f)
+            result = CliRunner().invoke(
+                main,
+                [
+                    "schedule",
+                    "--profile", profile,
+                    "--scenario", "steady",
+                    "--out", os.path.join(tmpdir, "steady.npy"),
+                    "--no-cache",
+                ],
+            )
+        assert result.exit_code == 1
+        assert "Error:" in result.output and "all be 0" in result.output
+
+
+class TestExportCommand:
+    def test_export_k6_to_stdout(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner()
+        result = runner.invoke(main, ["export", "--profile", profile, "--format", "k6"])
+        assert result.exit_code == 0
+        assert "ramping-arrival-rate" in result.output
+
+    def test_registered_exporters_are_selectable(self):
+        from src.exporters import EXPORTERS, register_exporter
+
+        @register_exporter("echo", ".txt")
+        def export_echo(plan, endpoints):
+            return f"{plan.service}: {len(plan.scenarios)} scenarios"
+
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        try:
+            result = CliRunner().invoke(main, ["export", "--profile", profile, "--format", "echo"])
+            unknown = CliRunner().invoke(main, ["export", "--profile", profile, "--format", "nope"])
+        finally:
+            del EXPORTERS["echo"]
+        assert result.exit_code == 0
+        assert "checkout-api: 3 scenarios" in result.output
+        assert unknown.exit_code == 2
+        assert "'nope' is not one of 'echo', 'jmeter', 'k6', 'locust'" in unknown.output
+
+    def test_plan_batch_exports_scripts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shutil.copy(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"), tmpdir)
+            out_dir = os.path.join(tmpdir, "plans")
+            runner = CliRunner()
+            result = runner.invoke(
+                main,
+                [
+                    "plan-batch", "--profiles", tmpdir, "--out-dir", out_dir,
+                    "--workers", "1", "--export", "k6", "--export", "jmeter",
+                ],
+            )
+            assert result.exit_code == 0
+            assert sorted(os.listdir(out_dir)) == [
+                "checkout-api.jmx", "checkout-api.json", "checkout-api.k6.js",
+            ]
+
+
+class TestEvidenceCommands:
+    def test_query_by_service(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            for _ in range(2):
+                runner.invoke(main, ["plan", "--profile", profile, "--log", log_path])
+            result = runner.invoke(
+                main, ["evidence", "query", "--log", log_path, "--service", "checkout-api"]
+            )
+            assert result.exit_code == 0
+            lines = result.output.strip().splitlines()
+            assert len(lines) == 2
+            assert json.loads(lines[0])["service"] == "checkout-api"
+
+            result = runner.invoke(
+                main, ["evidence", "query", "--log", log_path, "--service", "other"]
+            )
+            assert result.exit_code == 0
+            assert result.output == ""
+
+    def test_bad_timestamp(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            open(log_path, "w").close()
+            result = runner.invoke(
+                main, ["evidence", "query", "--log", log_path, "--since", "yesterday"]
+            )
+            assert result.exit_code == 1
+            assert "unrecognised timestamp" in result.output
+
+    def test_rotate_then_query(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            runner.invoke(main, ["plan", "--profile", profile, "--log", log_path])
+            result = runner.invoke(main, ["evidence", "rotate", "--log", log_path])
+            assert result.exit_code == 0
+            assert "evidence.jsonl.000001.gz" in result.output
+            result = runner.invoke(main, ["evidence", "rotate", "--log", log_path])
+            assert "Nothing to rotate" in result.output
+            runner.invoke(main, ["plan", "--profile", profile, "--log", log_path])
+            result = runner.invoke(main, ["evidence", "query", "--log", log_path])
+            assert len(result.output.strip().splitlines()) == 2
+
+    def test_migrate_and_failures(self):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        failing = os.path.join(FIXTURES_DIR, "metrics-failing.json")
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            db_path = os.path.join(tmpdir, "evidence.db")
+            runner.invoke(main, ["plan", "--profile", profile, "--log", log_path])
+            runner.invoke(
+                main, ["plan", "--profile", profile, "--metrics", failing, "--log", log_path]
+            )
+            result = runner.invoke(
+                main, ["evidence", "migrate", "--from", log_path, "--to", db_path]
+            )
+            assert result.exit_code == 0
+            assert "Migrated 2 event(s)" in result.output
+            result = runner.invoke(
+                main, ["evidence", "migrate", "--from", log_path, "--to", db_path]
+            )
+            assert result.exit_code == 1
+            assert "already holds 2 event(s)" in result.output
+
+            result = runner.invoke(
+                main, ["evidence", "migrate", "--from", log_path + ".old", "--to", db_path]
+            )
+            assert result.exit_code == 1
+            assert "Error: evidence log not found" in result.output
+
+            result = runner.invoke(main, ["evidence", "failures", "--log", db_path])
+            assert result.exit_code == 0
+            lines = result.output.strip().splitlines()
+            assert lines[0] == "week,service,failures"
+            assert lines[1].endswith(",checkout-api,1")
+
+            runner.invoke(main, ["plan", "--profile", profile, "--log", db_path])
+            result = runner.invoke(
+                main, ["evidence", "query", "--log", db_path, "--service", "checkout-api"]
+            )
+            assert len(result.output.strip().splitlines()) == 3
+
+
+class TestStartup:
+    def test_import_within_budget(self):
+        from benchmarks.bench_import_time import IMPORT_BUDGET_MS, best_startup_ms
+
+        assert best_startup_ms(repeat=3) <= IMPORT_BUDGET_MS
+
+    def test_heavy_modules_are_deferred(self):
+        from benchmarks.bench_import_time import DEFERRED_MODULES, measure_imports
+
+        times = measure_imports("import src.cli")
+        assert [m for m in DEFERRED_MODULES if m in times] == []
+
+    def test_json_profile_does_not_import_yaml(self):
+        from benchmarks.bench_import_time import measure_imports
+
+        path = os.path.join(FIXTURES_DIR, "checkout-profile.json")
+        times = measure_imports(f"from src.loader import load_profile; load_profile({path!r})")
+        assert "yaml" not in times
+
+    def test_static_choices_match_registries(self):
+        from src.cli import DURABILITY_CHOICES
+        from src.evidence import DURABILITY_MODES
+
+        assert DURABILITY_CHOICES == DURABILITY_MODES
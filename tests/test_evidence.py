@@ -1,10 +1,25 @@
 """Tests for evidence logging."""
 
 import json
+import multiprocessing
 import os
 import tempfile
+from unittest import mock
 
-from src.evidence import append_event, create_event, read_events
+import pytest
+
+from src.evidence import (
+    EvidenceWriter,
+    append_event,
+    compress_segments,
+    create_event,
+    event_to_dict,
+    query_events,
+    read_events,
+    rotate_log,
+    sync_index,
+)
+from src.models import EvidenceEvent
 
 
 class TestCreateEvent:
@@ -100,3 +115,275 @@ class TestAppendAndRead:
             assert len(events) == 2
             assert events[0].service == "good"
             assert events[1].service == "also-good"
+
+
+def _event(service, ts):
+    return EvidenceEvent(
+        ts=ts,
+        service=service,
+        profile="p.yaml",
+        scenarios=["steady"],
+        interpretation=False,
+        outcome="plan-generated",
+    )
+
+
+class TestQueryEvents:
+    def _log(self, tmpdir):
+        log_path = os.path.join(tmpdir, "evidence.jsonl")
+        for day in range(1, 7):
+            service = "checkout" if day % 2 else "search"
+            append_event(_event(service, f"2024-05-0{day}T12:00:00Z"), log_path)
+        return log_path
+
+    def test_append_maintains_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = self._log(tmpdir)
+            assert os.path.isdir(log_path + ".idx")
+            assert sync_index(log_path) == 0
+
+    def test_query_by_service(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = self._log(tmpdir)
+            events = query_events(log_path, service="search")
+            assert [e.ts[:10] for e in events] == ["2024-05-02", "2024-05-04", "2024-05-06"]
+            assert query_events(log_path, service="missing") == []
+
+    def test_query_by_time_range(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = self._log(tmpdir)
+            events = query_events(log_path, since="2024-05-02", until="2024-05-04T12:00:00Z")
+            assert [e.ts[:10] for e in events] == ["2024-05-02", "2024-05-03"]
+            events = query_events(log_path, service="checkout", since="2024-05-04")
+            assert [e.ts[:10] for e in events] == ["2024-05-05"]
+
+    def test_unindexed_log_is_caught_up(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with open(log_path, "w") as f:
+                f.write(json.dumps(event_to_dict(_event("a", "2024-05-01T00:00:00Z"))) + "\n")
+                f.write("not json\n")
+            # The index lags the log, so this append leaves it alone ...
+            append_event(_event("b", "2024-05-02T00:00:00Z"), log_path)
+            assert not os.path.exists(log_path + ".idx")
+            # ... and the first query indexes everything.
+            assert [e.service for e in query_events(log_path)] == ["a", "b"]
+            append_event(_event("a", "2024-05-03T00:00:00Z"), log_path)
+            assert sync_index(log_path) == 0
+            assert len(query_events(log_path, service="a")) == 2
+
+    def test_mistyped_fields_do_not_break_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with open(log_path, "w") as f:
+                f.write(json.dumps(event_to_dict(_event("a", "2024-05-01T00:00:00Z"))) + "\n")
+                f.write('{"ts": "2024-05-01T00:00:01Z", "service": 5, "profile": "p"}\n')
+                f.write('{"ts": 5, "service": "a", "profile": "p"}\n')
+            assert len(query_events(log_path, service="a")) == 2
+            events = query_events(log_path, service="a", since="2024-05-01")
+            assert [e.ts for e in events] == ["2024-05-01T00:00:00Z"]
+            assert query_events(log_path, service="b") == []
+
+    def test_replaced_log_rebuilds_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = self._log(tmpdir)
+            with open(log_path, "w") as f:
+                f.write(json.dumps(event_to_dict(_event("new", "2024-06-01T00:00:00Z"))) + "\n")
+            assert [e.service for e in query_events(log_path)] == ["new"]
+            assert query_events(log_path, service="checkout") == []
+
+    def test_invalid_bound(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = self._log(tmpdir)
+            with pytest.raises(ValueError):
+                query_events(log_path, since="last week")
+
+
+class TestEvidenceWriter:
+    def test_buffers_until_flush_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with EvidenceWriter(log_path, flush_size=3, flush_interval=60) as writer:
+                writer.append(_event("a", "2024-05-01T00:00:00Z"))
+                writer.append(_event("b", "2024-05-01T00:00:01Z"))
+                assert not os.path.exists(log_path)
+                writer.append(_event("c", "2024-05-01T00:00:02Z"))
+                assert len(read_events(log_path)) == 3
+                writer.append(_event("d", "2024-05-01T00:00:03Z"))
+            assert [e.service for e in read_events(log_path)] == ["a", "b", "c", "d"]
+            assert [e.service for e in query_events(log_path, service="d")] == ["d"]
+
+    def test_one_write_per_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            writer = EvidenceWriter(log_path, flush_size=1000)
+            for i in range(250):
+                writer.append(_event(f"svc-{i % 7}", "2024-05-01T00:00:00Z"))
+            with mock.patch("src.evidence.os.write", wraps=os.write) as write:
+                writer.close()
+            assert write.call_count == 1
+            assert len(read_events(log_path)) == 250
+            assert len(query_events(log_path, service="svc-3")) == 36
+
+    def test_none_durability_ignores_interval(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with EvidenceWriter(
+                log_path, flush_size=100, flush_interval=0, durability="none"
+            ) as writer:
+                writer.append(_event("a", "2024-05-01T00:00:00Z"))
+                assert not os.path.exists(log_path) or os.path.getsize(log_path) == 0
+            assert len(read_events(log_path)) == 1
+
+    def test_stale_buffer_is_flushed_on_append(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with EvidenceWriter(log_path, flush_size=100, flush_interval=0) as writer:
+                writer.append(_event("a", "2024-05-01T00:00:00Z"))
+                assert len(read_events(log_path)) == 1
+
+    def test_fsync_durability(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with mock.patch("src.evidence.os.fsync") as fsync:
+                with EvidenceWriter(log_path, flush_size=2, durability="fsync") as writer:
+                    for _ in range(4):
+                        writer.append(_event("a", "2024-05-01T00:00:00Z"))
+            assert fsync.call_count >= 2
+
+    def test_appends_to_existing_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            append_event(_event("first", "2024-05-01T00:00:00Z"), log_path)
+            with EvidenceWriter(log_path, durability="none") as writer:
+                writer.append(_event("second", "2024-05-02T00:00:00Z"))
+            assert [e.service for e in read_events(log_path)] == ["first", "second"]
+
+    def test_invalid_durability(self):
+        with pytest.raises(ValueError, match="durability"):
+            EvidenceWriter("unused.jsonl", durability="sometimes")
+
+
+def _stress_writer(args):
+    log_path, worker, events, flush_size, max_bytes = args
+    profile = "p" * 6000  # lines longer than PIPE_BUF, so only the lock keeps them whole
+    with EvidenceWriter(
+        log_path, flush_size=flush_size, flush_interval=0, max_bytes=max_bytes
+    ) as writer:
+        for i in range(events):
+            writer.append(EvidenceEvent(
+                ts="2024-05-01T00:00:00Z",
+                service=f"svc-{worker}",
+                profile=profile,
+                scenarios=[str(i)],
+                interpretation=False,
+                outcome="plan-generated",
+            ))
+    for i in range(events // 10):
+        append_event(_event(f"single-{worker}", "2024-05-02T00:00:00Z"), log_path)
+    return worker
+
+
+class TestConcurrentAppends:
+    def test_many_writer_processes(self):
+        workers, events = 8, 300
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            jobs = [(log_path, w, events, 1 + w % 4, None) for w in range(workers)]
+            with multiprocessing.Pool(workers) as pool:
+                assert sorted(pool.map(_stress_writer, jobs)) == list(range(workers))
+
+            with open(log_path, "rb") as f:
+                lines = f.read().split(b"\n")
+            assert lines.pop() == b""
+            assert len(lines) == workers * (events + events // 10)
+            for line in lines:
+                json.loads(line)  # no torn or interleaved lines
+
+            for w in range(workers):
+                batch = query_events(log_path, service=f"svc-{w}")
+                assert [e.scenarios[0] for e in batch] == [str(i) for i in range(events)]
+                assert len(query_events(log_path, service=f"single-{w}")) == events // 10
+            assert sync_index(log_path) == 0
+
+    def test_many_writer_processes_with_rotation(self):
+        workers, events = 6, 200
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            jobs = [(log_path, w, events, 1 + w % 3, 256 * 1024) for w in range(workers)]
+            with multiprocessing.Pool(workers) as pool:
+                pool.map(_stress_writer, jobs)
+            compress_segments(log_path)
+
+            assert len(read_events(log_path)) == workers * (events + events // 10)
+            assert len([n for n in os.listdir(tmpdir) if n.endswith(".gz")]) > 5
+            for w in range(workers):
+                batch = query_events(log_path, service=f"svc-{w}")
+                assert [e.scenarios[0] for e in batch] == [str(i) for i in range(events)]
+
+
+class TestRotation:
+    def _write(self, log_path, services, day, **kwargs):
+        with EvidenceWriter(log_path, flush_size=1, **kwargs) as writer:
+            for service in services:
+                writer.append(_event(service, f"2024-05-{day:02d}T00:00:00Z"))
+
+    def test_size_rotation_and_compression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            for day in range(1, 11):
+                self._write(log_path, [f"svc-{day % 3}"], day, max_bytes=400)
+            names = sorted(os.listdir(tmpdir))
+            segments = [n for n in names if n.endswith(".gz")]
+            assert segments[0] == "evidence.jsonl.000001.gz"
+            assert len(segments) >= 3
+            assert not [n for n in names if n.endswith(".tmp")]
+            assert [e.ts[8:10] for e in read_events(log_path)] == [
+                f"{day:02d}" for day in range(1, 11)
+            ]
+            events = query_events(log_path, service="svc-1", since="2024-05-02")
+            assert [e.ts[8:10] for e in events] == ["04", "07", "10"]
+
+    def test_query_skips_segments_by_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            self._write(log_path, ["old"], 1)
+            rotate_log(log_path)
+            self._write(log_path, ["new"], 20)
+            with mock.patch("src.evidence.gzip.open") as gzip_open:
+                assert [e.service for e in query_events(log_path, service="new")] == ["new"]
+                assert query_events(log_path, since="2024-05-10")[0].service == "new"
+                gzip_open.assert_not_called()
+            assert [e.service for e in query_events(log_path, service="old")] == ["old"]
+
+    def test_compress_skips_segment_removed_by_another_process(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            self._write(log_path, ["a"], 1)
+            rotate_log(log_path, compress=False)
+            os.remove(log_path + ".000001")
+            open_fds = len(os.listdir("/proc/self/fd"))
+            with mock.patch("src.evidence.os.path.isfile", return_value=True):
+                assert compress_segments(log_path) == 0
+            assert len(os.listdir("/proc/self/fd")) == open_fds
+            assert not [n for n in os.listdir(tmpdir) if n.endswith(".tmp")]
+
+    def test_age_rotation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            self._write(log_path, ["a"], 1, max_age=3600, compress=False)
+            self._write(log_path, ["b"], 2, max_age=3600, compress=False)
+            assert os.path.isfile(log_path + ".000001")
+            assert [e.service for e in read_events(log_path)] == ["a", "b"]
+
+    def test_rotate_log_thresholds(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            assert rotate_log(log_path) is None
+            self._write(log_path, ["a"], 1)
+            assert rotate_log(log_path, max_bytes=1_000_000) is None
+            assert rotate_log(log_path, max_bytes=10) == log_path + ".000001"
+            assert os.path.isfile(log_path + ".000001.gz")
+            assert not os.path.exists(log_path)
+            assert rotate_log(log_path) is None
+            assert [e.service for e in query_events(log_path)] == ["a"]
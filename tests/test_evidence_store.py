@@ -0,0 +1,161 @@
+"""Tests for the evidence store backends."""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.evidence import append_event, rotate_log
+from src.evidence_store import (
+    JsonlEvidenceStore,
+    SqliteEvidenceStore,
+    migrate,
+    open_store,
+)
+from src.models import EvidenceEvent
+
+
+def _event(service, ts, outcome="plan-generated"):
+    return EvidenceEvent(
+        ts=ts,
+        service=service,
+        profile=f"profiles/{service}.yaml",
+        scenarios=["steady", "burst"],
+        interpretation=outcome != "plan-generated",
+        outcome=outcome,
+    )
+
+
+EVENTS = [
+    _event("checkout", "2024-05-06T09:00:00Z", "issues-detected"),  # Monday
+    _event("search", "2024-05-07T09:00:00Z"),
+    _event("checkout", "2024-05-12T23:59:59Z", "issues-detected"),  # Sunday
+    _event("checkout", "2024-05-13T00:00:00Z", "issues-detected"),  # next Monday
+    _event("search", "2024-05-14T09:00:00Z", "issues-detected"),
+]
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def store_path(request):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        suffix = ".jsonl" if request.param == "jsonl" else ".db"
+        yield os.path.join(tmpdir, "evidence" + suffix)
+
+
+class TestEvidenceStores:
+    def test_open_store_picks_backend(self, store_path):
+        with open_store(store_path) as store:
+            expected = JsonlEvidenceStore if store_path.endswith(".jsonl") else SqliteEvidenceStore
+            assert isinstance(store, expected)
+
+    def test_round_trip(self, store_path):
+        with open_store(store_path) as store:
+            assert store.append_many(EVENTS) == len(EVENTS)
+        with open_store(store_path) as store:
+            assert store.read() == EVENTS
+
+    def test_query(self, store_path):
+        with open_store(store_path) as store:
+            store.append_many(EVENTS)
+            assert store.query(service="search") == [EVENTS[1], EVENTS[4]]
+            assert store.query(since="2024-05-12", until="2024-05-14") == EVENTS[2:4]
+            assert store.query(service="checkout", since="2024-05-13") == [EVENTS[3]]
+
+    def test_failures_per_week(self, store_path):
+        with open_store(store_path) as store:
+            store.append_many(EVENTS)
+            assert store.failures_per_week() == [
+                ("checkout", "2024-05-06", 2),
+                ("checkout", "2024-05-13", 1),
+                ("search", "2024-05-13", 1),
+            ]
+
+    def test_buffered_appends_are_visible_to_queries(self, store_path):
+        with open_store(store_path) as store:
+            store.append(EVENTS[0])
+            assert store.read() == [EVENTS[0]]
+
+
+class TestSqliteEvidenceStore:
+    def test_wal_mode_and_indexes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "evidence.db")
+            SqliteEvidenceStore(path).close()
+            conn = sqlite3.connect(path)
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(events)")}
+            assert {"events_service_ts", "events_outcome"} <= indexes
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM events WHERE service = 'x' AND ts_epoch >= 0"
+            ).fetchall()
+            assert "events_service_ts" in str(plan)
+            conn.close()
+
+    def test_inserts_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "evidence.db")
+            with SqliteEvidenceStore(path, batch_size=2) as store:
+                for event in EVENTS[:3]:
+                    store.append(event)
+                reader = sqlite3.connect(path)
+                assert reader.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 2
+                reader.close()
+            assert len(SqliteEvidenceStore(path).read()) == 3
+
+    def test_invalid_durability(self):
+        with pytest.raises(ValueError, match="durability"):
+            SqliteEvidenceStore(":memory:", durability="sometimes")
+
+
+class TestMigrate:
+    def test_migrate_jsonl_with_segments(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            for event in EVENTS[:2]:
+                append_event(event, log_path)
+            rotate_log(log_path)
+            for event in EVENTS[2:]:
+                append_event(event, log_path)
+            with SqliteEvidenceStore(os.path.join(tmpdir, "evidence.db")) as store:
+                assert migrate(log_path, store) == len(EVENTS)
+                assert store.read() == EVENTS
+
+    def test_missing_source(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            with SqliteEvidenceStore(os.path.join(tmpdir, "evidence.db")) as store:
+                with pytest.raises(FileNotFoundError, match="evidence log not found"):
+                    migrate(log_path, store)
+            # Rotated segments alone are enough.
+            append_event(EVENTS[0], log_path)
+            rotate_log(log_path)
+            assert not os.path.exists(log_path)
+            with SqliteEvidenceStore(os.path.join(tmpdir, "rotated.db")) as store:
+                assert migrate(log_path, store) == 1
+
+    def test_refuses_non_empty_target(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            append_event(EVENTS[0], log_path)
+            with SqliteEvidenceStore(os.path.join(tmpdir, "evidence.db")) as store:
+                assert migrate(log_path, store) == 1
+                with pytest.raises(ValueError, match="already holds 1 event"):
+                    migrate(log_path, store)
+                assert store.count() == 1
+
+    def test_invalid_events(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "evidence.jsonl")
+            append_event(EVENTS[0], log_path)
+            with open(log_path, "a") as f:
+                f.write('{"ts": "2024-05-06T10:00:00Z", "service": null, "profile": "p.yaml"}\n')
+            append_event(EVENTS[1], log_path)
+            with SqliteEvidenceStore(os.path.join(tmpdir, "strict.db")) as store:
+                with pytest.raises(ValueError, match="event 2: 'service' must be a string"):
+                    migrate(log_path, store)
+            rejected = []
+            with SqliteEvidenceStore(os.path.join(tmpdir, "evidence.db")) as store:
+                assert migrate(log_path, store, rejected=rejected) == 2
+                assert store.read() == EVENTS[:2]
+            assert rejected == ["event 2: 'service' must be a string"]
@@ -0,0 +1,136 @@
+"""Tests for plan exporters."""
+
+import ast
+import dataclasses
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.exporters import EXPORTERS, ExportError, export_plan, register_exporter
+from src.generator import generate_plan
+from src.loader import load_profile
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+def _plan_and_endpoints():
+    path = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+    profile = load_profile(path)
+    return generate_plan(profile, path), profile.endpoints
+
+
+def _hostile_plan():
+    plan, endpoints = _plan_and_endpoints()
+    plan = dataclasses.replace(
+        plan,
+        service='evil"""\nimport sys; sys.exit(1)',
+        profile_path="C:\\Users\\perf\nprofile\\",
+    )
+    return plan, endpoints
+
+
+def _k6_options(script):
+    match = re.search(r"export const options = (\{.*?\n\});", script, re.S)
+    return json.loads(match.group(1))
+
+
+class TestK6Exporter:
+    def test_ramping_arrival_rate_scenarios(self):
+        plan, endpoints = _plan_and_endpoints()
+        options = _k6_options(export_plan(plan, "k6", endpoints))
+        assert list(options["scenarios"]) == ["steady", "burst", "soak"]
+        steady = options["scenarios"]["steady"]
+        assert steady["executor"] == "ramping-arrival-rate"
+        assert steady["stages"][1] == {"duration": "600s", "target": 50}
+        # Scenarios run back to back.
+        assert options["scenarios"]["burst"]["startTime"] == "690s"
+
+    def test_checks_become_thresholds(self):
+        plan, endpoints = _plan_and_endpoints()
+        script = export_plan(plan, "k6", endpoints)
+        thresholds = _k6_options(script)["thresholds"]
+        assert thresholds["http_req_duration{scenario:steady}"] == ["p(95)<=400", "p(99)<=800"]
+        assert thresholds["http_req_duration{scenario:burst}"] == ["p(95)<=600", "p(99)<=1200"]
+        assert thresholds["http_req_failed{scenario:soak}"] == ["rate<=0.01"]
+        assert "soak: cpu_percent <= 80" in script
+
+    def test_endpoints_embedded(self):
+        plan, endpoints = _plan_and_endpoints()
+        script = export_plan(plan, "k6", endpoints)
+        assert '"path": "/cart/submit"' in script
+        assert '"method": "POST"' in script
+
+    def test_header_cannot_escape_comment(self):
+        plan, endpoints = _hostile_plan()
+        script = export_plan(plan, "k6", endpoints)
+        header = script.split("import http")[0]
+        assert all(line.startswith("//") for line in header.splitlines())
+        assert "// Source profile: C:\\Users\\perf profile\\" in header
+
+
+class TestLocustExporter:
+    def test_generates_valid_python_with_shape(self):
+        plan, endpoints = _plan_and_endpoints()
+        script = export_plan(plan, "locust", endpoints)
+        tree = ast.parse(script)
+        classes = {n.name for n in tree.body if isinstance(n, ast.ClassDef)}
+        assert classes == {"PlanUser", "PlanShape"}
+
+    def test_stages_and_checks(self):
+        plan, endpoints = _plan_and_endpoints()
+        script = export_plan(plan, "locust", endpoints)
+        scenarios = ast.literal_eval(re.search(r"^SCENARIOS = (.*)$", script, re.M).group(1))
+        assert scenarios["steady"]["stages"][0] == (0, 60, 0, 50)
+        assert ("percentile", 0.95, "<=", 400.0) in scenarios["steady"]["checks"]
+        assert ("fail_ratio", None, "<=", 0.01) in scenarios["burst"]["checks"]
+
+    def test_docstring_cannot_be_escaped(self):
+        plan, endpoints = _hostile_plan()
+        tree = ast.parse(export_plan(plan, "locust", endpoints))
+        docstring = ast.get_docstring(tree)
+        assert 'evil""" import sys; sys.exit(1) load test plan' in docstring
+        assert "Source profile: C:\\Users\\perf profile\\" in docstring
+        assert {n.names[0].name for n in tree.body if isinstance(n, ast.Import)} == {"os"}
+
+
+class TestJMeterExporter:
+    def test_thread_group_per_scenario(self):
+        plan, endpoints = _plan_and_endpoints()
+        root = ET.fromstring(export_plan(plan, "jmeter", endpoints).split("\n", 1)[1])
+        groups = [g.get("testname") for g in root.iter("ThreadGroup")]
+        assert groups == ["steady", "burst", "soak"]
+        timers = list(root.iter("kg.apc.jmeter.timers.VariableThroughputTimer"))
+        assert len(timers) == 3
+        samplers = [s.get("testname") for s in root.iter("HTTPSamplerProxy")]
+        assert "POST /cart/submit" in samplers
+
+    def test_latency_check_becomes_duration_assertion(self):
+        plan, endpoints = _plan_and_endpoints()
+        root = ET.fromstring(export_plan(plan, "jmeter", endpoints).split("\n", 1)[1])
+        durations = [
+            p.text for a in root.iter("DurationAssertion") for p in a
+            if p.get("name") == "DurationAssertion.duration"
+        ]
+        assert durations == ["800", "1200", "800"]
+
+
+class TestRegistry:
+    def test_unknown_format(self):
+        plan, _ = _plan_and_endpoints()
+        with pytest.raises(ExportError, match="unknown export format"):
+            export_plan(plan, "gatling")
+
+    def test_register_custom_exporter(self):
+        @register_exporter("names-only", ".txt")
+        def _names(plan, endpoints):
+            return ",".join(s.name for s in plan.scenarios)
+
+        try:
+            plan, _ = _plan_and_endpoints()
+            assert export_plan(plan, "names-only") == "steady,burst,soak"
+        finally:
+            del EXPORTERS["names-only"]
@@ -0,0 +1,131 @@
+"""Tests for the log-bucketed latency histogram."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from src.histogram import LatencyHistogram, merge_histograms
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_precision(self):
+        rng = np.random.default_rng(1)
+        values = rng.lognormal(mean=5.0, sigma=0.6, size=200_000)
+        hist = LatencyHistogram(precision=0.01)
+        for chunk in np.array_split(values, 7):
+            hist.record(chunk)
+        assert hist.count == len(values)
+        for q in (50, 90, 95, 99, 99.9):
+            exact = np.percentile(values, q, method="inverted_cdf")
+            assert hist.percentile(q) == pytest.approx(exact, rel=0.01)
+
+    def test_extremes_are_exact(self):
+        hist = LatencyHistogram()
+        hist.record([3.0, 7.5, 12.25])
+        assert hist.percentile(0) == 3.0
+        assert hist.percentile(100) == 12.25
+        assert hist.mean() == pytest.approx(22.75 / 3)
+
+    def test_out_of_range_values_are_clamped(self):
+        hist = LatencyHistogram(lowest_ms=1.0, highest_ms=1000.0)
+        hist.record([0.0, 0.5, 5000.0, float("nan")])
+        assert hist.count == 3
+        assert hist.percentile(99) == 5000.0
+
+    def test_empty(self):
+        hist = LatencyHistogram()
+        assert hist.count == 0
+        assert hist.percentile(95) is None
+        assert hist.mean() is None
+
+    def test_fixed_memory(self):
+        hist = LatencyHistogram()
+        size = hist.counts.size
+        hist.record(np.random.default_rng(0).uniform(0, 10_000, 100_000))
+        assert hist.counts.size == size < 3000
+
+    def test_invalid_layout(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram(lowest_ms=10, highest_ms=1)
+        with pytest.raises(ValueError):
+            LatencyHistogram(precision=0)
+
+
+class TestMergeAndDump:
+    def _node_histograms(self, nodes=6, size=20_000):
+        rng = np.random.default_rng(3)
+        values = [rng.lognormal(mean=5.0 + 0.2 * i, sigma=0.5, size=size) for i in range(nodes)]
+        hists = []
+        for v in values:
+            hist = LatencyHistogram()
+            hist.record(v)
+            hists.append(hist)
+        return values, hists
+
+    def test_merge_equals_recording_everything(self):
+        values, hists = self._node_histograms()
+        whole = LatencyHistogram()
+        whole.record(np.concatenate(values))
+        merged = merge_histograms(hists)
+        assert np.array_equal(merged.counts, whole.counts)
+        assert merged.min_ms == whole.min_ms and merged.max_ms == whole.max_ms
+        assert merged.mean() == pytest.approx(whole.mean())
+        for q in (50, 95, 99):
+            assert merged.percentile(q) == whole.percentile(q)
+        # Inputs are left untouched.
+        assert hists[0].count == 20_000
+
+    def test_merge_is_associative(self):
+        _, hists = self._node_histograms()
+        flat = merge_histograms(hists)
+        grouped = merge_histograms([merge_histograms(hists[:2]), merge_histograms(hists[2:])])
+        in_place = LatencyHistogram().merge(hists[5]).merge(merge_histograms(hists[:5]))
+        for other in (grouped, in_place):
+            assert np.array_equal(other.counts, flat.counts)
+            assert (other.min_ms, other.max_ms) == (flat.min_ms, flat.max_ms)
+
+    def test_merge_rejects_mismatched_layouts(self):
+        with pytest.raises(ValueError, match="different layouts"):
+            merge_histograms([LatencyHistogram(), LatencyHistogram(precision=0.02)])
+        with pytest.raises(ValueError, match="different layouts"):
+            LatencyHistogram().merge(LatencyHistogram(lowest_ms=0.01))
+        with pytest.raises(ValueError, match="nothing to merge"):
+            merge_histograms([])
+
+    def test_dump_round_trip(self):
+        _, hists = self._node_histograms(nodes=1)
+        doc = json.loads(json.dumps(hists[0].to_dict()))
+        assert doc["format"] == "latency-histogram"
+        assert len(doc["counts"]) < hists[0].counts.size
+        restored = LatencyHistogram.from_dict(doc)
+        assert np.array_equal(restored.counts, hists[0].counts)
+        assert restored.percentile(99) == hists[0].percentile(99)
+        assert restored.max_ms == hists[0].max_ms
+
+        empty = LatencyHistogram.from_dict(json.loads(json.dumps(LatencyHistogram().to_dict())))
+        assert empty.count == 0 and empty.percentile(50) is None
+
+    def test_from_dict_rejects_bad_documents(self):
+        good = LatencyHistogram().to_dict()
+        for bad in (
+            {"format": "other"},
+            dict(good, version=99),
+            dict(good, offset=10**6, counts=[1]),
+            {k: v for k, v in good.items() if k != "layout"},
+        ):
+            with pytest.raises(ValueError):
+                LatencyHistogram.from_dict(bad)
+
+    def test_merging_a_thousand_nodes_is_fast(self):
+        rng = np.random.default_rng(5)
+        hists = []
+        for _ in range(1000):
+            hist = LatencyHistogram()
+            hist.counts[:] = rng.integers(0, 3, hist.counts.size)
+            hists.append(hist)
+        start = time.perf_counter()
+        merged = merge_histograms(hists)
+        assert time.perf_counter() - start < 0.5
+        assert merged.count == sum(h.count for h in hists)
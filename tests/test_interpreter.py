@@ -6,7 +6,7 @@ import tempfile
 
 import pytest
 
-from src.interpreter import MetricsParseError, interpret, load_metrics
+from src.interpreter import MetricsParseError, interpret, load_metrics, load_metrics_many
 from src.models import MetricsSummary, SLO
 
 
@@ -83,6 +83,41 @@ class TestLoadMetrics:
                 os.unlink(f.name)
 
 
+class TestLoadMetricsMany:
+    def _paths(self, tmpdir, count):
+        """Alternate the JSON and CSV fixtures across ``count`` node files."""
+        paths = []
+        for i in range(count):
+            name = ("metrics-passing.json", "metrics-failing.json", "metrics-partial.csv")[i % 3]
+            path = os.path.join(tmpdir, f"node-{i:02d}{os.path.splitext(name)[1]}")
+            with open(os.path.join(FIXTURES_DIR, name)) as src, open(path, "w") as dst:
+                dst.write(src.read())
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_results_in_input_order(self, workers):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._paths(tmpdir, 12)
+            # large_file_bytes=0 sends every file to the process pool.
+            results = load_metrics_many(paths, workers=workers, large_file_bytes=0)
+            assert results == [load_metrics(p) for p in paths]
+
+    def test_error_names_first_bad_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._paths(tmpdir, 6)
+            bad = os.path.join(tmpdir, "node-bad.json")
+            with open(bad, "w") as f:
+                f.write("{not json")
+            paths.insert(3, bad)
+            paths.append(os.path.join(tmpdir, "missing.csv"))
+            with pytest.raises(MetricsParseError, match="node-bad.json: failed to parse JSON"):
+                load_metrics_many(paths, workers=3)
+
+    def test_empty(self):
+        assert load_metrics_many([]) == []
+
+
 class TestInterpret:
     def _default_slo(self):
         return SLO(latency_ms={"p95": 400, "p99": 800}, error_rate=0.01)
@@ -97,6 +132,12 @@ class TestInterpret:
         assert all(c["result"] == "pass" for c in result.checks)
         assert len(result.risks) == 0
 
+    def test_null_percentile_threshold_is_skipped(self):
+        metrics = MetricsSummary(p95_ms=950, p99_ms=700, error_rate=0.005)
+        result = interpret(metrics, SLO(latency_ms={"p95": None, "p99": 800}, error_rate=0.01))
+        assert result.status == "pass"
+        assert [c["metric"] for c in result.checks] == ["latency_p99", "error_rate"]
+
     def test_failing_latency(self):
         metrics = MetricsSummary(
             p95_ms=900, p99_ms=1500, error_rate=0.005,
@@ -0,0 +1,117 @@
+"""Tests for streaming k6 JSON output ingestion."""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.interpreter import MetricsParseError, load_metrics
+from src.k6 import ingest_k6, is_k6_output, load_k6
+from src.models import Check, Scenario, Stage
+from src.timeseries import evaluate_stages
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+K6_FIXTURE = os.path.join(FIXTURES_DIR, "k6-results.json")
+
+# 2024-05-09T14:34:45+02:00
+FIRST_SECOND = 1715258085
+
+
+def _write(tmpdir, name, lines):
+    path = os.path.join(tmpdir, name)
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+    return path
+
+
+class TestIngestK6:
+    def test_fixture_summary(self):
+        metrics, warnings = load_k6(K6_FIXTURE)
+        assert metrics.p50_ms == pytest.approx(200, rel=0.01)
+        assert metrics.p99_ms == pytest.approx(900, rel=0.01)
+        assert metrics.error_rate == pytest.approx(0.1)
+        assert metrics.throughput_rps == pytest.approx(5.0)
+        assert any("cpu_percent" in w for w in warnings)
+
+    def test_per_second_counters(self):
+        result = ingest_k6(K6_FIXTURE)
+        assert result.ts.tolist() == [FIRST_SECOND + i for i in range(4)]
+        assert result.requests.tolist() == [5, 5, 5, 5]
+        assert result.failed.tolist() == [0, 0, 0, 2]
+        assert result.iterations.tolist() == [5, 5, 5, 5]
+
+        series = result.series()
+        assert series.columns["error_rate"].tolist() == [0, 0, 0, 0.4]
+        assert series.columns["throughput_rps"].tolist() == [5, 5, 5, 5]
+
+    def test_series_feeds_stage_evaluation(self):
+        scenario = Scenario(
+            name="steady",
+            description="",
+            stages=[Stage("hold", 3), Stage("spike", 1)],
+            checks=[Check("error_rate", "<=", 0.01)],
+        )
+        stages = evaluate_stages(scenario, ingest_k6(K6_FIXTURE).series())
+        assert [(s.stage, s.result.status) for s in stages] == [("hold", "pass"), ("spike", "fail")]
+
+    def test_small_chunks_match_single_pass(self):
+        whole = ingest_k6(K6_FIXTURE)
+        chunked = ingest_k6(K6_FIXTURE, chunk_bytes=700)
+        np.testing.assert_array_equal(chunked.stats.histogram.counts, whole.stats.histogram.counts)
+        np.testing.assert_array_equal(chunked.requests, whole.requests)
+        np.testing.assert_array_equal(chunked.failed, whole.failed)
+
+    def test_other_key_orders_and_malformed_lines(self):
+        with open(K6_FIXTURE) as f:
+            lines = f.read().splitlines()
+        reordered = []
+        for line in lines:
+            doc = json.loads(line)
+            reordered.append(json.dumps({"metric": doc["metric"], **doc}, separators=(",", ":")))
+        reordered.append('{"type":"Point","data":{"time":"2024-05-09T14:3')  # truncated write
+        reordered.append('{"type":"Point","data":{"time":"later","value":1},"metric":"iterations"}')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "reordered.ndjson", reordered)
+            result = ingest_k6(path)
+        expected = ingest_k6(K6_FIXTURE)
+        np.testing.assert_array_equal(result.stats.histogram.counts, expected.stats.histogram.counts)
+        np.testing.assert_array_equal(result.failed, expected.failed)
+        assert result.skipped_lines == 1
+        assert "skipped 1 malformed line(s)" in result.to_summary()[1]
+
+    def test_utc_timestamps_and_no_failed_metric(self):
+        lines = [
+            '{"type":"Point","data":{"time":"2024-05-09T12:34:45.5Z","value":100,"tags":{}},'
+            '"metric":"http_req_duration"}',
+            '{"type":"Point","data":{"time":"2024-05-09T12:34:46Z","value":300,"tags":{}},'
+            '"metric":"http_req_duration"}',
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = ingest_k6(_write(tmpdir, "utc.ndjson", lines))
+        assert result.ts.tolist() == [FIRST_SECOND, FIRST_SECOND + 1]
+        metrics, warnings = result.to_summary()
+        assert metrics.error_rate is None
+        assert any("error_rate" in w for w in warnings)
+
+    def test_no_duration_points(self):
+        lines = [
+            '{"type":"Point","data":{"time":"2024-05-09T12:34:45Z","value":1,"tags":{}},'
+            '"metric":"iterations"}',
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(MetricsParseError, match="no http_req_duration points"):
+                ingest_k6(_write(tmpdir, "empty.ndjson", lines))
+
+
+class TestDetection:
+    def test_sniffs_json_files(self):
+        assert is_k6_output(K6_FIXTURE)
+        assert not is_k6_output(os.path.join(FIXTURES_DIR, "metrics-passing.json"))
+        assert not is_k6_output(os.path.join(FIXTURES_DIR, "missing.json"))
+
+    def test_load_metrics_dispatches_to_k6(self):
+        assert load_metrics(K6_FIXTURE) == load_k6(K6_FIXTURE)
+        metrics, _ = load_metrics(os.path.join(FIXTURES_DIR, "metrics-passing.json"))
+        assert metrics.p95_ms == 350.0
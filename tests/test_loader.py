@@ -7,7 +7,14 @@ import tempfile
 import pytest
 import yaml
 
-from src.loader import ProfileValidationError, load_profile
+from src.loader import (
+    ProfileDocumentError,
+    ProfileValidationError,
+    _select_yaml_loader,
+    load_profile,
+    load_profiles_stream,
+    loader_info,
+)
 
 
 FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
@@ -140,6 +147,32 @@ class TestProfileValidation:
             finally:
                 os.unlink(f.name)
 
+    @pytest.mark.parametrize(
+        "endpoints, message",
+        [
+            ([{"path": "/a", "weight": -1}], r"endpoints\[0\]\.weight"),
+            ([{"path": "/a", "weight": True}], r"endpoints\[0\]\.weight"),
+            ([{"path": "/a", "weight": 0}, {"path": "/b", "weight": 0.0}], "all be 0"),
+        ],
+    )
+    def test_invalid_endpoint_weight(self, endpoints, message):
+        data = {
+            "service": "svc",
+            "traffic": {"baseline_rps": 10, "peak_rps": 100},
+            "slo": {"latency_ms": {"p95": 500}},
+            "endpoints": endpoints,
+        }
+        with tempfile.NamedTemporaryFile(
+            suffix=".json", mode="w", delete=False
+        ) as f:
+            json.dump(data, f)
+            f.flush()
+            try:
+                with pytest.raises(ProfileValidationError, match=message):
+                    load_profile(f.name)
+            finally:
+                os.unlink(f.name)
+
     def test_minimal_valid_profile(self):
         data = {
             "service": "minimal-svc",
@@ -160,3 +193,58 @@ class TestProfileValidation:
                 assert profile.data.uses_production_data is False
             finally:
                 os.unlink(f.name)
+
+
+class TestYamlBackend:
+    def test_prefers_libyaml_when_available(self):
+        loader, backend = _select_yaml_loader("auto")
+        if getattr(yaml, "CSafeLoader", None) is not None:
+            assert (loader, backend) == (yaml.CSafeLoader, "libyaml")
+        else:
+            assert (loader, backend) == (yaml.SafeLoader, "python")
+
+    def test_python_backend_can_be_forced(self):
+        loader, backend = _select_yaml_loader("python")
+        assert loader is yaml.SafeLoader
+        assert backend == "python"
+
+    def test_loader_info(self):
+        info = loader_info()
+        assert info["yaml_backend"] in ("libyaml", "python")
+        assert info["pyyaml_version"] == yaml.__version__
+
+
+class TestLoadProfilesStream:
+    BUNDLE = os.path.join(FIXTURES_DIR, "fleet-bundle.yaml")
+
+    def test_collects_errors_and_continues(self):
+        errors = []
+        services = [p.service for p in load_profiles_stream(self.BUNDLE, errors=errors)]
+        assert services == ["checkout-api", "inventory-api"]
+        assert len(errors) == 1
+        assert errors[0].document_index == 1
+        assert errors[0].line == 16
+        assert "peak_rps" in str(errors[0])
+
+    def test_raises_on_first_invalid_document(self):
+        stream = load_profiles_stream(self.BUNDLE)
+        assert next(stream).service == "checkout-api"
+        with pytest.raises(ProfileDocumentError, match="document 1"):
+            next(stream)
+
+    def test_yaml_syntax_error_carries_location(self):
+        with tempfile.NamedTemporaryFile(suffix=".yaml", mode="w", delete=False) as f:
+            f.write("service: a\n---\nservice: [unclosed\n")
+            f.flush()
+            try:
+                with pytest.raises(ProfileDocumentError) as info:
+                    list(load_profiles_stream(f.name, errors=[]))
+                assert info.value.document_index == 1
+                assert info.value.line is not None
+            finally:
+                os.unlink(f.name)
+
+    def test_rejects_json_bundle(self):
+        path = os.path.join(FIXTURES_DIR, "checkout-profile.json")
+        with pytest.raises(ProfileValidationError, match="unsupported"):
+            list(load_profiles_stream(path))
@@ -0,0 +1,90 @@
+"""Tests for columnar batch interpretation."""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from src.interpreter import METRIC_FIELDS, interpret, load_metrics
+from src.metrics_batch import MetricsBatch, interpret_batch
+from src.models import Check, MetricsSummary, SLO
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+SLO_FIXTURE = SLO(latency_ms={"p95": 400, "p99": 800}, error_rate=0.01)
+
+
+def _random_summaries(count, seed=7):
+    rng = random.Random(seed)
+    ranges = {
+        "p50_ms": 300, "p90_ms": 600, "p95_ms": 700, "p99_ms": 1500,
+        "error_rate": 0.03, "throughput_rps": 2000,
+        "cpu_percent": 100, "memory_percent": 100, "gc_pause_ms": 200,
+    }
+    return [
+        MetricsSummary(**{
+            name: None if rng.random() < 0.15 else rng.uniform(0, top)
+            for name, top in ranges.items()
+        })
+        for _ in range(count)
+    ]
+
+
+class TestMetricsBatch:
+    def test_round_trips_summaries(self):
+        summaries = _random_summaries(50)
+        batch = MetricsBatch.from_summaries(summaries, labels=[f"run-{i}" for i in range(50)])
+        assert len(batch) == 50
+        assert tuple(batch.columns) == METRIC_FIELDS
+        assert [batch.summary(i) for i in range(50)] == summaries
+        assert np.isnan(batch.columns["p95_ms"]).sum() == sum(s.p95_ms is None for s in summaries)
+
+    def test_missing_columns_are_nan(self):
+        batch = MetricsBatch(columns={"p95_ms": [100.0, 900.0]})
+        assert len(batch) == 2
+        assert np.isnan(batch.columns["error_rate"]).all()
+        assert batch.summary(1) == MetricsSummary(p95_ms=900.0)
+
+    def test_rejects_ragged_input(self):
+        with pytest.raises(ValueError, match="same length"):
+            MetricsBatch(columns={"p95_ms": [1.0], "p99_ms": [1.0, 2.0]})
+        with pytest.raises(ValueError, match="labels"):
+            MetricsBatch(columns={"p95_ms": [1.0]}, labels=["a", "b"])
+        with pytest.raises(ValueError, match="matrix"):
+            MetricsBatch.from_matrix(np.zeros((3, 2)))
+
+    def test_empty_batch(self):
+        result = interpret_batch(MetricsBatch.from_summaries([]), SLO_FIXTURE)
+        assert len(result) == 0
+        assert result.status_counts() == {"pass": 0, "warning": 0, "fail": 0}
+
+
+class TestInterpretBatch:
+    def test_matches_interpret_row_by_row(self):
+        summaries = _random_summaries(300)
+        for name in ("metrics-passing.json", "metrics-failing.json", "metrics-partial.csv"):
+            summaries.append(load_metrics(os.path.join(FIXTURES_DIR, name))[0])
+        result = interpret_batch(MetricsBatch.from_summaries(summaries), SLO_FIXTURE)
+        expected = [interpret(m, SLO_FIXTURE) for m in summaries]
+        assert result.status.tolist() == [r.status for r in expected]
+        for i in range(len(summaries)):
+            assert result.result(i) == expected[i]
+            assert result.narrative(i) == expected[i].narrative
+        counts = result.status_counts()
+        assert sum(counts.values()) == len(summaries)
+        assert counts["fail"] and counts["warning"] and counts["pass"]
+
+    def test_arrays_and_custom_checks(self):
+        batch = MetricsBatch(columns={
+            "p95_ms": [100.0, 500.0, np.nan],
+            "cpu_percent": [95.0, 10.0, 10.0],
+        })
+        checks = [Check("latency_p95", "<=", 400), Check("throughput_rps", ">=", 10)]
+        result = interpret_batch(batch, SLO_FIXTURE, checks=checks)
+        assert result.status.tolist() == ["warning", "fail", "pass"]
+        assert result.present.tolist() == [[True, False], [True, False], [False, False]]
+        assert result.failed.tolist() == [[False, False], [True, False], [False, False]]
+        assert result.risk_flags[:, 0].tolist() == [True, False, False]
+        assert result.risks(0) == ["High CPU usage: 95%"]
+        assert [c["result"] for c in result.checks(1)] == ["fail", "skip"]
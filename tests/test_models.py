@@ -0,0 +1,75 @@
+"""Tests for the slotted (and optionally frozen) model dataclasses."""
+
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from src import models
+from src.models import BatchReport, EvidenceEvent, Stage, model
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+slots_only = pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10")
+
+
+class TestSlots:
+    @slots_only
+    def test_instances_have_no_dict(self):
+        stage = Stage("hold", 300, target_rps=50)
+        assert not hasattr(stage, "__dict__")
+        with pytest.raises((AttributeError, TypeError)):
+            stage.not_a_field = 1
+
+    def test_equality_repr_and_pickle(self):
+        event = EvidenceEvent("2026-01-01T00:00:00", "checkout", "p.yaml", scenarios=["steady"])
+        assert event == EvidenceEvent("2026-01-01T00:00:00", "checkout", "p.yaml", ["steady"])
+        assert "service='checkout'" in repr(event)
+        assert pickle.loads(pickle.dumps(event)) == event
+
+    def test_model_decorator_options(self):
+        @model(frozen=True)
+        class Point:
+            x: int
+            y: int = 0
+
+        point = Point(1)
+        assert point == Point(1, 0)
+        with pytest.raises(AttributeError):
+            point.x = 2
+
+
+class TestFrozenMode:
+    def test_default_is_mutable(self):
+        if models.FROZEN_MODELS:
+            pytest.skip("suite is running with frozen models")
+        stage = Stage("hold", 300)
+        stage.target_rps = 10
+        assert stage.target_rps == 10
+
+    def test_env_freezes_models_except_batch_report(self):
+        script = (
+            "import dataclasses\n"
+            "from src.models import BatchReport, Stage\n"
+            "stage = Stage('hold', 300)\n"
+            "try:\n"
+            "    stage.target_rps = 10\n"
+            "except dataclasses.FrozenInstanceError:\n"
+            "    print('frozen')\n"
+            "report = BatchReport()\n"
+            "report.elapsed_seconds = 1.5\n"
+            "print(report.elapsed_seconds)\n"
+        )
+        env = dict(os.environ, **{models.FROZEN_MODELS_ENV: "1"})
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.split() == ["frozen", "1.5"]
+
+    def test_batch_report_stays_mutable(self):
+        report = BatchReport()
+        report.elapsed_seconds = 2.0
+        assert report.throughput == 0.0
@@ -0,0 +1,107 @@
+"""Tests for per-phase timings and the profiling session."""
+
+import json
+import os
+import pstats
+import tempfile
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from src import profiling
+from src.cli import main
+from src.profiling import ProfileSession, phase
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+class TestPhase:
+    def test_noop_without_session(self):
+        with phase("load"):
+            pass
+        assert profiling._active is None
+
+    def test_phases_accumulate_in_order(self):
+        session = ProfileSession("test", timings="json")
+        session.start()
+        with phase("generate"):
+            time.sleep(0.01)
+        with phase("load"):
+            pass
+        with phase("generate"):
+            time.sleep(0.01)
+        with phase("custom"):
+            pass
+        report = json.loads(session.finish()[-1])
+        assert list(report["phases"]) == ["load", "generate", "custom"]
+        assert report["phases"]["generate"] >= 0.02
+        assert report["total_s"] >= sum(report["phases"].values())
+        assert profiling._active is None
+
+    def test_nested_phases_are_not_double_counted(self):
+        session = ProfileSession("test", timings="json")
+        session.start()
+        with phase("generate"):
+            with phase("load"):
+                time.sleep(0.02)
+            time.sleep(0.01)
+        report = json.loads(session.finish()[-1])
+        assert report["phases"]["load"] >= 0.02
+        assert 0.01 <= report["phases"]["generate"] < 0.02
+        assert report["total_s"] - sum(report["phases"].values()) >= 0
+        assert profiling._nested == []
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError, match="timings format"):
+            ProfileSession("test", timings="xml")
+
+
+class TestProfilingOptions:
+    def _plan(self, *options):
+        profile = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+        metrics = os.path.join(FIXTURES_DIR, "metrics-passing.json")
+        runner = CliRunner(mix_stderr=False)
+        return runner.invoke(
+            main, [*options, "plan", "--profile", profile, "--metrics", metrics, "--no-cache"]
+        )
+
+    def test_timings_text(self):
+        result = self._plan("--timings")
+        assert result.exit_code == 0
+        assert "Timings for plan" in result.stderr
+        for name in ("load", "validate", "generate", "serialize", "interpret"):
+            assert f"  {name} " in result.stderr
+        # stdout still holds only the plan and interpretation.
+        assert "Timings" not in result.stdout
+
+    def test_timings_json_with_memory(self):
+        result = self._plan("--timings", "--timings-format", "json", "--trace-memory",
+                            "--trace-memory-top", "3")
+        assert result.exit_code == 0
+        report = json.loads(result.stderr.strip().splitlines()[-1])
+        assert report["command"] == "plan"
+        assert {"load", "validate", "generate", "serialize", "interpret"} <= set(report["phases"])
+        assert report["memory"]["peak_bytes"] > 0
+        assert len(report["memory"]["top"]) == 3
+
+    def test_batch_phases_fit_in_wall_time(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner = CliRunner(mix_stderr=False)
+            result = runner.invoke(main, [
+                "--timings", "--timings-format", "json", "plan-batch",
+                "--profiles", os.path.join(FIXTURES_DIR, "checkout-profile.yaml"),
+                "--out-dir", tmpdir, "--workers", "1", "--no-cache",
+            ])
+            assert result.exit_code == 0, result.stderr
+            report = json.loads(result.stderr.strip().splitlines()[-1])
+            assert {"load", "validate", "generate"} <= set(report["phases"])
+            assert sum(report["phases"].values()) <= report["total_s"]
+
+    def test_profile_cpu_writes_stats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "plan.prof")
+            result = self._plan("--profile-cpu", out)
+            assert result.exit_code == 0
+            stats = pstats.Stats(out)
+            assert any(func[2] == "generate_plan" for func in stats.stats)
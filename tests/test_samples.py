@@ -0,0 +1,136 @@
+"""Tests for raw latency sample ingestion."""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.interpreter import MetricsParseError
+from src.samples import (
+    ingest_samples,
+    load_histogram_dumps,
+    load_merged_histograms,
+    load_raw_samples,
+)
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+class TestIngestSamples:
+    def test_fixture_summary(self):
+        metrics, warnings = load_raw_samples(os.path.join(FIXTURES_DIR, "samples-raw.csv"))
+        assert metrics.p50_ms == pytest.approx(140, rel=0.01)
+        assert metrics.p99_ms == pytest.approx(620, rel=0.01)
+        assert metrics.error_rate == pytest.approx(1 / 21)
+        assert metrics.throughput_rps == pytest.approx(21 / 4.0)
+        assert any("cpu_percent" in w for w in warnings)
+
+    def test_small_chunks_match_single_pass(self):
+        rng = np.random.default_rng(3)
+        latencies = rng.gamma(2.0, 50.0, 5000)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "samples.csv")
+            with open(path, "w") as f:
+                f.write("latency_ms\n")
+                f.write("\n".join(f"{v:.3f}" for v in latencies))  # no trailing newline
+            chunked = ingest_samples(path, chunk_bytes=1000)
+            whole = ingest_samples(path)
+            assert chunked.count == whole.count == 5000
+            np.testing.assert_array_equal(chunked.histogram.counts, whole.histogram.counts)
+            assert chunked.percentile(95) == pytest.approx(
+                np.percentile(latencies, 95), rel=0.01
+            )
+            metrics, warnings = chunked.to_summary()
+            assert metrics.error_rate is None
+            assert any("error_rate" in w for w in warnings)
+
+    def test_missing_latency_column(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", mode="w", delete=False) as f:
+            f.write("duration,error\n1,0\n")
+            f.flush()
+            try:
+                with pytest.raises(MetricsParseError, match="latency_ms"):
+                    ingest_samples(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_non_numeric_value(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", mode="w", delete=False) as f:
+            f.write("latency_ms\n12\nslow\n")
+            f.flush()
+            try:
+                with pytest.raises(MetricsParseError, match="parse"):
+                    ingest_samples(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_empty_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", mode="w", delete=False) as f:
+            f.write("latency_ms\n")
+            f.flush()
+            try:
+                with pytest.raises(MetricsParseError, match="no data"):
+                    load_raw_samples(f.name)
+            finally:
+                os.unlink(f.name)
+
+
+def _write_node(path, seed, start_ts, errors=True, rows=4000):
+    rng = np.random.default_rng(seed)
+    latency = rng.lognormal(5.0 + seed * 0.1, 0.5, rows)
+    ts = start_ts + np.arange(rows) * 0.01
+    error = (rng.random(rows) < 0.01).astype(int)
+    columns = [ts, latency] + ([error] if errors else [])
+    with open(path, "w") as f:
+        f.write("ts,latency_ms" + (",error" if errors else "") + "\n")
+        np.savetxt(f, np.column_stack(columns), fmt="%.3f", delimiter=",")
+    return latency, error
+
+
+class TestHistogramDumps:
+    def test_merged_dumps_match_pooled_samples(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dumps, latencies, errors = [], [], []
+            for node in range(4):
+                csv_path = os.path.join(tmpdir, f"node-{node}.csv")
+                latency, error = _write_node(csv_path, node, 1_700_000_000 + node * 5)
+                dumps.append(os.path.join(tmpdir, f"node-{node}.hist.json"))
+                load_raw_samples(csv_path, histogram_out=dumps[-1])
+                latencies.append(latency)
+                errors.append(error)
+
+            metrics, _ = load_merged_histograms(dumps)
+            pooled = np.concatenate(latencies)
+            for field, q in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+                exact = np.percentile(pooled, q, method="inverted_cdf")
+                assert getattr(metrics, field) == pytest.approx(exact, rel=0.01)
+            assert metrics.error_rate == pytest.approx(np.concatenate(errors).mean())
+            # 16,000 requests from the first node's start to the last node's end.
+            assert metrics.throughput_rps == pytest.approx(16000 / (15 + 39.99))
+
+            stats = load_histogram_dumps(dumps[:1])[0]
+            assert stats.count == 4000 and stats.has_errors
+
+    def test_error_rate_needs_every_node(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dumps = []
+            for node, errors in enumerate((True, False)):
+                csv_path = os.path.join(tmpdir, f"node-{node}.csv")
+                _write_node(csv_path, node, 1_700_000_000, errors=errors)
+                dumps.append(os.path.join(tmpdir, f"node-{node}.hist.json"))
+                load_raw_samples(csv_path, histogram_out=dumps[-1])
+            metrics, warnings = load_merged_histograms(dumps)
+            assert metrics.error_rate is None
+            assert any("error_rate" in w for w in warnings)
+
+    def test_bad_dumps(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bad = os.path.join(tmpdir, "bad.json")
+            with open(bad, "w") as f:
+                f.write('{"format": "something-else"}')
+            with pytest.raises(MetricsParseError, match="bad.json: not a latency-histogram"):
+                load_merged_histograms([bad])
+            with pytest.raises(MetricsParseError, match="no histogram files"):
+                load_merged_histograms([])
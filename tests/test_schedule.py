@@ -0,0 +1,82 @@
+"""Tests for the arrival schedule compiler."""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.models import Endpoint, Scenario, Stage
+from src.schedule import SCHEDULE_DTYPE, compile_schedule
+
+
+def _scenario(*stages):
+    return Scenario(name="test", description="", stages=list(stages))
+
+
+class TestCompileSchedule:
+    def test_constant_hold_is_evenly_spaced(self):
+        sc = _scenario(
+            Stage(name="ramp-up", duration_seconds=0, target_rps=10),
+            Stage(name="hold", duration_seconds=10, target_rps=10),
+        )
+        sched = compile_schedule(sc, arrival="constant")
+        assert sched.dtype == SCHEDULE_DTYPE
+        assert len(sched) == 100
+        np.testing.assert_allclose(np.diff(sched["offset_s"]), 0.1)
+        assert sched["offset_s"][0] == pytest.approx(0.05)
+
+    def test_linear_ramp_follows_quadratic_cumulative(self):
+        # 0 -> 100 rps over 10s: 500 requests, a quarter of them in the first 5s.
+        sc = _scenario(Stage(name="ramp-up", duration_seconds=10, target_rps=100))
+        sched = compile_schedule(sc, arrival="constant")
+        assert len(sched) == 500
+        assert np.sum(sched["offset_s"] < 5.0) == 125
+        assert sched["offset_s"].max() <= 10.0
+
+    def test_poisson_is_sorted_seeded_and_near_expected_count(self):
+        sc = _scenario(
+            Stage(name="ramp-up", duration_seconds=30, target_rps=200),
+            Stage(name="hold", duration_seconds=60, target_rps=200),
+            Stage(name="ramp-down", duration_seconds=30, target_rps=0),
+        )
+        a = compile_schedule(sc, arrival="poisson", seed=7)
+        b = compile_schedule(sc, arrival="poisson", seed=7)
+        expected = 200 * 90
+        assert abs(len(a) - expected) < 5 * np.sqrt(expected)
+        assert np.all(np.diff(a["offset_s"]) >= 0)
+        assert a["offset_s"].max() <= 120.0
+        np.testing.assert_array_equal(a, b)
+
+    def test_endpoints_split_by_weight(self):
+        sc = _scenario(
+            Stage(name="ramp-up", duration_seconds=0, target_rps=1000),
+            Stage(name="hold", duration_seconds=20, target_rps=1000),
+        )
+        endpoints = [
+            Endpoint(path="/a", method="GET", weight=3),
+            Endpoint(path="/b", method="GET", weight=0),
+            Endpoint(path="/c", method="POST", weight=1),
+        ]
+        sched = compile_schedule(sc, endpoints, arrival="constant")
+        counts = np.bincount(sched["endpoint"], minlength=3) / len(sched)
+        assert counts[0] == pytest.approx(0.75, abs=0.02)
+        assert counts[1] == 0
+        assert counts[2] == pytest.approx(0.25, abs=0.02)
+
+    def test_writes_memory_mapped_npy(self):
+        sc = _scenario(Stage(name="hold", duration_seconds=5, target_rps=50))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "schedule.npy")
+            sched = compile_schedule(sc, arrival="constant", out_path=out)
+            loaded = np.load(out, mmap_mode="r")
+            np.testing.assert_array_equal(loaded, sched)
+            del sched, loaded
+
+    def test_vu_only_stages_produce_no_requests(self):
+        sc = _scenario(Stage(name="hold", duration_seconds=60, target_vus=10))
+        assert len(compile_schedule(sc)) == 0
+
+    def test_unknown_arrival_process(self):
+        with pytest.raises(ValueError, match="arrival"):
+            compile_schedule(_scenario(), arrival="bursty")
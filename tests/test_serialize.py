@@ -0,0 +1,112 @@
+"""Tests for the dataclass JSON serializer."""
+
+import dataclasses
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+
+from src import serialize
+from src.generator import generate_plan, plan_to_dict, plan_to_json, write_plan_json
+from src.loader import load_profile
+from src.models import Check, SLO, Stage
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+@pytest.fixture
+def plan():
+    profile = load_profile(os.path.join(FIXTURES_DIR, "checkout-profile.yaml"))
+    plan = generate_plan(profile, "fixtures/checkout-profile.yaml")
+    steady, burst, soak = plan.scenarios
+    steady = dataclasses.replace(
+        steady,
+        stages=steady.stages + [Stage(name=f"step-{i}", duration_seconds=i) for i in range(50)],
+        checks=steady.checks + [Check("latency_p95", "<=", 1e-7, "tiny é threshold")],
+    )
+    burst = dataclasses.replace(burst, metrics_to_watch=[])
+    return dataclasses.replace(plan, scenarios=[steady, burst, soak])
+
+
+@pytest.fixture
+def stdlib(monkeypatch):
+    monkeypatch.setattr(serialize, "_orjson", None)
+
+
+class TestStdlibEncoder:
+    def test_to_dict_matches_asdict(self, plan):
+        assert plan_to_dict(plan) == dataclasses.asdict(plan)
+
+    def test_indented_output_matches_json_dumps(self, plan, stdlib):
+        expected = json.dumps(dataclasses.asdict(plan), indent=2)
+        assert plan_to_json(plan) == expected
+        assert serialize.dumps(plan, indent=4) == json.dumps(dataclasses.asdict(plan), indent=4)
+
+    def test_compact_output(self, plan, stdlib):
+        compact = plan_to_json(plan, indent=None)
+        assert compact == json.dumps(dataclasses.asdict(plan), separators=(",", ":"))
+        assert "\n" not in compact
+
+    def test_streaming_dump_matches_dumps(self, plan, stdlib, monkeypatch):
+        monkeypatch.setattr(serialize, "_FLUSH_CHUNKS", 8)
+        writes = []
+
+        class Recorder(io.StringIO):
+            def write(self, s):
+                writes.append(s)
+                return super().write(s)
+
+        for indent in (2, None):
+            writes.clear()
+            buf = Recorder()
+            write_plan_json(plan, buf, indent=indent)
+            expected = json.dumps(
+                dataclasses.asdict(plan),
+                indent=indent,
+                separators=None if indent else (",", ":"),
+            )
+            assert buf.getvalue() == expected
+            assert len(writes) > 1
+
+    def test_special_values_and_keys(self, stdlib):
+        slo = SLO(latency_ms={"p95": 400, 1: 2.5, None: True}, error_rate=math.inf)
+        expected = json.dumps(dataclasses.asdict(slo), indent=2)
+        assert serialize.dumps(slo) == expected
+        assert serialize.dumps({"x": math.nan, "t": (1, 2)}, indent=2) == json.dumps(
+            {"x": math.nan, "t": (1, 2)}, indent=2
+        )
+
+    def test_numpy_scalars(self, stdlib):
+        data = {"p95": np.float64(412.5), "count": np.int64(3), "ok": np.bool_(True)}
+        expected = json.dumps({"p95": 412.5, "count": 3, "ok": True}, indent=2)
+        assert serialize.dumps(data) == expected
+        assert json.loads(serialize.dumps(data, indent=None)) == json.loads(expected)
+
+    def test_rejects_unknown_types(self, stdlib):
+        with pytest.raises(TypeError, match="not JSON serializable"):
+            serialize.dumps({"when": object()}, indent=2)
+
+
+class TestOrjsonBackend:
+    def test_same_json(self, plan):
+        pytest.importorskip("orjson")
+        module, name = serialize._select_backend("auto")
+        assert name == "orjson"
+        expected = dataclasses.asdict(plan)
+        assert json.loads(serialize.dumps(plan)) == expected
+        assert json.loads(serialize.dumps(plan, indent=None)) == expected
+        buf = io.StringIO()
+        serialize.dump(plan, buf)
+        assert json.loads(buf.getvalue()) == expected
+
+    def test_numpy_scalars(self):
+        pytest.importorskip("orjson")
+        data = {"p95": np.float64(412.5), "count": np.int64(3)}
+        assert json.loads(serialize.dumps(data)) == {"p95": 412.5, "count": 3}
+
+    def test_env_forces_stdlib(self, monkeypatch):
+        monkeypatch.setenv(serialize.JSON_BACKEND_ENV, "stdlib")
+        assert serialize._select_backend() == (None, "stdlib")
@@ -0,0 +1,211 @@
+"""Tests for the plan server."""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from src import server as server_module
+from src.server import PlanServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+PROFILE = os.path.join(FIXTURES_DIR, "checkout-profile.yaml")
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _serve(scenario, workers=0, unix=False):
+    """Run ``scenario(send, server)`` against a started server."""
+
+    async def _main():
+        server = PlanServer(workers=workers)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if unix:
+                sock = os.path.join(tmpdir, "perf.sock")
+                await server.start(unix_path=sock)
+                reader, writer = await asyncio.open_unix_connection(sock)
+            else:
+                address = await server.start(port=0)
+                host, port = address[len("http://"):].rsplit(":", 1)
+                reader, writer = await asyncio.open_connection(host, int(port))
+            try:
+                async def send(method, path, payload=None):
+                    return await _request(reader, writer, method, path, payload)
+
+                return await scenario(send, server)
+            finally:
+                writer.close()
+                await server.close()
+
+    return asyncio.run(_main())
+
+
+def _raw(data):
+    """Send ``data`` on a fresh connection and return everything read back."""
+
+    async def _main():
+        server = PlanServer(workers=0)
+        address = await server.start(port=0)
+        host, port = address[len("http://"):].rsplit(":", 1)
+        reader, writer = await asyncio.open_connection(host, int(port))
+        try:
+            writer.write(data)
+            await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+            await server.close()
+
+    return asyncio.run(_main())
+
+
+class TestPlanServer:
+    def test_health(self):
+        async def scenario(send, server):
+            return await send("GET", "/health")
+
+        assert _serve(scenario) == (200, {"status": "ok", "profiles_cached": 0})
+
+    def test_plan_matches_cli_plan(self):
+        async def scenario(send, server):
+            return await send("POST", "/plan", {"profile": PROFILE})
+
+        status, plan = _serve(scenario)
+        assert status == 200
+        assert plan["service"] == "checkout-api"
+        assert [s["name"] for s in plan["scenarios"]] == ["steady", "burst", "soak"]
+
+    def test_profile_is_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profile = os.path.join(tmpdir, "checkout.yaml")
+            shutil.copy(PROFILE, profile)
+
+            async def scenario(send, server):
+                first = await send("POST", "/profile", {"profile": profile})
+                warm = server._warm[os.path.abspath(profile)]
+                await send("POST", "/plan", {"profile": profile})
+                assert server._warm[os.path.abspath(profile)] is warm
+
+                with open(profile) as f:
+                    text = f.read().replace("checkout-api", "checkout-v2")
+                with open(profile, "w") as f:
+                    f.write(text)
+                os.utime(profile, ns=(time.time_ns(), time.time_ns() + 10**9))
+                second = await send("POST", "/profile", {"profile": profile})
+                return first, second
+
+            (_, first), (_, second) = _serve(scenario)
+            assert first["service"] == "checkout-api"
+            assert second["service"] == "checkout-v2"
+
+    def test_cold_load_does_not_block_the_loop(self):
+        def slow_load(path, cache=None):
+            time.sleep(0.3)
+            return load_profile(path, cache=cache)
+
+        load_profile = server_module.load_profile
+        finished = []
+
+        async def main():
+            server = PlanServer(workers=0)
+
+            async def call(method, path, body):
+                status, _ = await server.dispatch(method, path, body)
+                finished.append((path, status))
+
+            await asyncio.gather(
+                call("POST", "/plan", json.dumps({"profile": PROFILE}).encode()),
+                call("GET", "/health", b""),
+            )
+
+        with mock.patch.object(server_module, "load_profile", slow_load):
+            asyncio.run(main())
+        assert finished == [("/health", 200), ("/plan", 200)]
+
+    def test_interpret_inline_metrics(self):
+        with open(os.path.join(FIXTURES_DIR, "metrics-failing.json")) as f:
+            metrics = json.load(f)
+
+        async def scenario(send, server):
+            return await send("POST", "/interpret", {"profile": PROFILE, "metrics": metrics})
+
+        status, result = _serve(scenario)
+        assert status == 200
+        assert result["service"] == "checkout-api"
+        assert result["status"] == "fail"
+        assert any(c["result"] == "fail" for c in result["checks"])
+
+    def test_interpret_in_worker_pool(self):
+        async def scenario(send, server):
+            return await send("POST", "/interpret", {
+                "profile": PROFILE,
+                "metrics_path": os.path.join(FIXTURES_DIR, "metrics-passing.json"),
+            })
+
+        status, result = _serve(scenario, workers=1)
+        assert status == 200
+        assert result["status"] == "pass"
+
+    def test_inline_profile_over_unix_socket(self):
+        with open(os.path.join(FIXTURES_DIR, "checkout-profile.json")) as f:
+            raw = json.load(f)
+
+        async def scenario(send, server):
+            return await send("POST", "/plan", {"profile_data": raw})
+
+        status, plan = _serve(scenario, unix=True)
+        assert status == 200
+        assert plan["service"] == raw["service"]
+
+    def test_errors(self):
+        async def scenario(send, server):
+            return [
+                await send("GET", "/nope"),
+                await send("GET", "/plan"),
+                await send("POST", "/plan", {}),
+                await send("POST", "/plan", {"profile": "missing.yaml"}),
+                await send("POST", "/plan", {"profile_data": {"service": "x"}}),
+                await send("POST", "/interpret", {"profile": PROFILE}),
+                await send("POST", "/interpret", {
+                    "profile": PROFILE, "metrics_path": "missing.json",
+                }),
+                await send("GET", "/health"),
+            ]
+
+        statuses = [status for status, _ in _serve(scenario)]
+        assert statuses == [404, 405, 400, 422, 422, 400, 422, 200]
+
+    def test_malformed_request_line(self):
+        response = _raw(b"GARBAGE\r\n\r\n")
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"malformed request line" in response
+
+    def test_too_many_headers(self):
+        def request(count):
+            pad = b"".join(b"X-Pad-%d: 1\r\n" % i for i in range(count - 1))
+            return _raw(b"GET /health HTTP/1.1\r\nConnection: close\r\n" + pad + b"\r\n")
+
+        assert request(server_module.MAX_HEADERS).startswith(b"HTTP/1.1 200 OK\r\n")
+        assert request(server_module.MAX_HEADERS + 1).startswith(
+            b"HTTP/1.1 431 Request Header Fields Too Large\r\n"
+        )
@@ -0,0 +1,184 @@
+"""Tests for windowed time-series metrics ingestion."""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.interpreter import MetricsParseError
+from src.models import Check, SLO, Scenario, Stage
+from src.timeseries import (
+    MetricsSeries,
+    evaluate_stages,
+    interpret_windows,
+    load_metrics_series,
+    load_metrics_timeseries,
+)
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+TIMESERIES = os.path.join(FIXTURES_DIR, "metrics-timeseries.csv")
+
+
+def _write(tmpdir, text):
+    path = os.path.join(tmpdir, "series.csv")
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+class TestLoadMetricsTimeseries:
+    def test_uses_every_row(self):
+        windowed = load_metrics_timeseries(TIMESERIES, window_seconds=60)
+        assert len(windowed) == 10
+        assert windowed.rows.sum() == 60
+        # The latency spike sits in the middle of the run, not in row 0.
+        assert windowed.overall.p99_ms == 1100.0
+        assert windowed.columns["p99_ms"][4] == 1100.0
+        assert windowed.overall.memory_percent == pytest.approx(89.5)
+
+    def test_aggregation_rules(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(
+                tmpdir,
+                "ts,p99_ms,cpu_percent,memory_percent\n"
+                "0,100,10,50\n"
+                "1,300,30,70\n"
+                "2,200,,60\n"
+                "7,50,90,40\n",
+            )
+            windowed = load_metrics_timeseries(path, window_seconds=5)
+            np.testing.assert_array_equal(windowed.rows, [3, 1])
+            np.testing.assert_allclose(windowed.columns["p99_ms"], [300, 50])
+            np.testing.assert_allclose(windowed.columns["cpu_percent"], [20, 90])
+            np.testing.assert_allclose(windowed.columns["memory_percent"], [70, 40])
+            assert windowed.overall.cpu_percent == pytest.approx(130 / 3)
+
+    def test_chunked_matches_single_pass_without_ts(self):
+        rng = np.random.default_rng(2)
+        values = rng.normal(500, 50, 3000)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "p95_ms\n" + "\n".join(f"{v:.2f}" for v in values))
+            small = load_metrics_timeseries(path, window_seconds=100, chunk_bytes=512)
+            whole = load_metrics_timeseries(path, window_seconds=100)
+            assert len(small) == 30
+            np.testing.assert_allclose(small.columns["p95_ms"], whole.columns["p95_ms"])
+            assert small.overall.p95_ms == pytest.approx(values.max(), abs=0.01)
+
+    def test_rows_before_the_first_row_get_windows_in_front(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,p95_ms\n100,100\n111,300\n85,900\n,50\n")
+            windowed = load_metrics_timeseries(path, window_seconds=10, chunk_bytes=16)
+            assert windowed.start_ts == 80.0
+            np.testing.assert_array_equal(windowed.rows, [1, 0, 1, 1])
+            assert windowed.columns["p95_ms"][0] == 900.0
+            assert windowed.overall.p95_ms == 900.0
+            assert "skipped 1 row(s) without a ts" in windowed.warnings
+
+    def test_outlier_timestamp_is_rejected_not_allocated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,p95_ms\n1715258085,100\n1715258086,200\n0,300\n")
+            with pytest.raises(MetricsParseError, match="check the ts column"):
+                load_metrics_timeseries(path, window_seconds=1)
+            path = _write(tmpdir, "ts,p95_ms\n0,100\n50,200\n")
+            with pytest.raises(MetricsParseError, match="span 6 windows"):
+                load_metrics_timeseries(path, window_seconds=10, max_windows=5)
+
+    def test_empty_windows_are_nan(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,p95_ms\n0,100\n25,200\n")
+            windowed = load_metrics_timeseries(path, window_seconds=10)
+            assert len(windowed) == 3
+            assert np.isnan(windowed.columns["p95_ms"][1])
+            assert windowed.summary(1).p95_ms is None
+
+    def test_no_metric_columns(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,foo\n0,1\n")
+            with pytest.raises(MetricsParseError, match="metric columns"):
+                load_metrics_timeseries(path)
+
+    def test_no_rows(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,p95_ms\n")
+            with pytest.raises(MetricsParseError, match="no data"):
+                load_metrics_timeseries(path)
+
+
+class TestInterpretWindows:
+    def test_flags_only_bad_windows(self):
+        slo = SLO(latency_ms={"p95": 400, "p99": 800}, error_rate=0.01)
+        windowed = load_metrics_timeseries(TIMESERIES, window_seconds=60)
+        overall, per_window = interpret_windows(windowed, slo)
+        assert overall.status == "fail"
+        statuses = [r.status for r in per_window]
+        assert statuses[4] == "fail"
+        assert statuses[:4] == ["pass"] * 4
+
+
+def _burst_like_scenario():
+    return Scenario(
+        name="burst",
+        description="",
+        stages=[
+            Stage(name="ramp-up", duration_seconds=10, target_rps=10),
+            Stage(name="hold-burst", duration_seconds=20, target_rps=50),
+            Stage(name="recover", duration_seconds=10, target_rps=10),
+            Stage(name="ramp-down", duration_seconds=10, target_rps=0),
+        ],
+        checks=[
+            Check(metric="latency_p95", operator="<=", threshold=400),
+            Check(metric="error_rate", operator="<=", threshold=0.01),
+            Check(metric="memory_percent", operator="<=", threshold=85),
+        ],
+    )
+
+
+def _series():
+    ts = 1000.0 + np.arange(50)
+    p95 = np.full(50, 300.0)
+    p95[0:10] = 2000.0    # cold start during ramp-up
+    p95[15] = 450.0       # one slow second during hold-burst
+    err = np.full(50, 0.001)
+    err[35] = np.nan      # missing sample during recover
+    return MetricsSeries(ts=ts, columns={"p95_ms": p95, "error_rate": err})
+
+
+class TestLoadMetricsSeries:
+    def test_rows_sorted_by_ts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write(tmpdir, "ts,p95_ms\n5,50\n1,10\n3,30\n")
+            series = load_metrics_series(path)
+            np.testing.assert_array_equal(series.ts, [1, 3, 5])
+            np.testing.assert_array_equal(series.columns["p95_ms"], [10, 30, 50])
+
+
+class TestEvaluateStages:
+    def test_each_stage_judged_separately_and_ramps_skipped(self):
+        results = evaluate_stages(_burst_like_scenario(), _series())
+        assert [r.stage for r in results] == ["hold-burst", "recover"]
+        hold, recover = results
+        assert (hold.start_s, hold.end_s, hold.samples) == (10, 30, 20)
+        assert hold.result.status == "fail"
+        p95 = [c for c in hold.result.checks if c["metric"] == "latency_p95"][0]
+        assert p95["result"] == "fail"
+        assert recover.result.status == "pass"
+
+    def test_include_ramps(self):
+        results = evaluate_stages(_burst_like_scenario(), _series(), include_ramps=True)
+        assert [r.stage for r in results] == ["ramp-up", "hold-burst", "recover", "ramp-down"]
+        assert results[0].result.status == "fail"
+
+    def test_missing_metric_is_skipped(self):
+        results = evaluate_stages(_burst_like_scenario(), _series())
+        memory = [c for c in results[0].result.checks if c["metric"] == "memory_percent"]
+        assert memory[0]["result"] == "skip"
+
+    def test_start_ts_and_empty_stage(self):
+        # Starting the clock 45s late leaves only 5 rows, all in ramp-up.
+        results = evaluate_stages(
+            _burst_like_scenario(), _series(), start_ts=1045.0, include_ramps=True
+        )
+        assert [r.samples for r in results] == [5, 0, 0, 0]
+        assert all(c["result"] == "skip" for c in results[1].result.checks)